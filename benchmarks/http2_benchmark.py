@@ -0,0 +1,154 @@
+"""
+Benchmark del pipeline asíncrono con HTTP/1.1 vs HTTP/2 contra un servidor local.
+
+Levanta un servidor de reemplazo que habla HTTP/1.1 (keep-alive) y HTTP/2 sin
+TLS (h2c con prior knowledge) y sirve una página Nivel4 sintética en cualquier
+ruta. Simula la latencia de red con una demora por petición y otra por
+conexión nueva (handshake TCP + TLS), y reporta tiempo total, páginas por
+segundo y conexiones abiertas por cada protocolo.
+
+Uso (requiere: uv sync --extra http2):
+    uv run python benchmarks/http2_benchmark.py --pages 300 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import time
+
+import h2.config
+import h2.connection
+import h2.events
+
+from indec_catalog.catalog import _afetch_pages
+from indec_catalog.http import create_async_client
+
+PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+PAGE = ("""<html><head><meta charset="utf-8"><title>INDEC</title></head><body>
+<div class="ruta-texto mb-3"><a href="/">Inicio</a>> <a href="#">Sociedad</a> >
+<a href="#">Trabajo e ingresos</a> >Empleo y desempleo</div>
+""" + "".join(
+    f'<a href="/ftp/cuadros/sociedad/cuadro_{i}.xls">Cuadro {i}</a>\n' for i in range(20)
+) + "<p>" + "Texto de relleno. " * 200 + "</p><footer>Pie</footer></body></html>").encode("utf-8")
+
+
+class StandInServer:
+    """Servidor local HTTP/1.1 + h2c con latencia simulada."""
+
+    def __init__(self, latency: float, handshake: float):
+        self.latency = latency
+        self.handshake = handshake
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        await asyncio.sleep(self.handshake)
+        try:
+            head = await reader.readexactly(len(PREFACE))
+            if head == PREFACE:
+                await self._serve_h2(head, reader, writer)
+            else:
+                await self._serve_http1(head, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_http1(self, head: bytes, reader, writer):
+        buffer = head
+        while True:
+            while b"\r\n\r\n" not in buffer:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    return
+                buffer += chunk
+            _, buffer = buffer.split(b"\r\n\r\n", 1)
+            await asyncio.sleep(self.latency)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                + f"Content-Length: {len(PAGE)}\r\n\r\n".encode() + PAGE
+            )
+            await writer.drain()
+
+    async def _serve_h2(self, head: bytes, reader, writer):
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        window_open = asyncio.Event()
+        tasks = set()
+
+        async def respond(stream_id: int):
+            await asyncio.sleep(self.latency)
+            conn.send_headers(stream_id, [
+                (":status", "200"),
+                ("content-type", "text/html; charset=utf-8"),
+                ("content-length", str(len(PAGE))),
+            ])
+            data = PAGE
+            while data:
+                size = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size, len(data))
+                if size <= 0:
+                    window_open.clear()
+                    writer.write(conn.data_to_send())
+                    await window_open.wait()
+                    continue
+                conn.send_data(stream_id, data[:size], end_stream=size == len(data))
+                data = data[size:]
+            writer.write(conn.data_to_send())
+
+        data = head
+        while data:
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    task = asyncio.create_task(respond(event.stream_id))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                elif isinstance(event, h2.events.WindowUpdated):
+                    window_open.set()
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(conn.data_to_send())
+            await writer.drain()
+            data = await reader.read(65536)
+
+
+async def run_mode(name: str, client, urls, concurrency: int, server: StandInServer):
+    server.connections = 0
+    async with client:
+        start = time.perf_counter()
+        records, errors = await _afetch_pages(urls, client, concurrency, show_progress=False)
+        elapsed = time.perf_counter() - start
+    print(
+        f"{name:<9} {elapsed:8.2f}s {len(urls) / elapsed:10.1f} pág/s "
+        f"{server.connections:6d} conexiones {len(errors):5d} errores"
+    )
+    return records
+
+
+async def main(args):
+    server = StandInServer(args.latency_ms / 1000, args.handshake_ms / 1000)
+    tcp = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = tcp.sockets[0].getsockname()[1]
+    urls = [f"http://127.0.0.1:{port}/Nivel4/Tema/{i}" for i in range(args.pages)]
+
+    print(
+        f"{args.pages} páginas de {len(PAGE)} bytes, concurrencia {args.concurrency}, "
+        f"latencia {args.latency_ms} ms, handshake {args.handshake_ms} ms\n"
+    )
+    print(f"{'Protocolo':<9} {'Tiempo':>9} {'Velocidad':>15} {'Conexiones':>17} {'Errores':>13}")
+    async with tcp:
+        http1 = await run_mode(
+            "HTTP/1.1", create_async_client(args.concurrency, http2=False), urls, args.concurrency, server
+        )
+        http2 = await run_mode(
+            "HTTP/2", create_async_client(args.concurrency, prior_knowledge=True), urls, args.concurrency, server
+        )
+    assert http1 == http2, "Los resultados difieren entre protocolos"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Demora por petición")
+    parser.add_argument("--handshake-ms", type=float, default=60.0, help="Demora por conexión nueva")
+    asyncio.run(main(parser.parse_args()))
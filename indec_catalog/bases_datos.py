@@ -1,55 +1,70 @@
 """Scraper y parser para la página Institucional Bases de datos del INDEC."""
 
+import asyncio
+import hashlib
+import multiprocessing
+import os
 import re
-from typing import Dict, List, Tuple
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup, Tag
-
-from indec_catalog.config import BASES_DATOS_URL, BASE_URL, DATA_EXTENSIONS, HTTP_TIMEOUT
+from lxml import etree
+
+from indec_catalog.cache import load_json, save_json
+from indec_catalog.config import (
+    BASES_DATOS_LEVELS,
+    BASES_DATOS_TAB_RULES,
+    BASES_DATOS_URL,
+    BASE_URL,
+    DATA_EXTENSIONS,
+    HTTP_TIMEOUT,
+)
+from indec_catalog.http import response_charset
 from indec_catalog.models import Catalog
 from indec_catalog.parser import _normalize_url
+from indec_catalog.scraper import _text
 
 FALLBACK_TITLE = "Bases de datos"
 
+TABS_XPATH = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' tabContent ')]")
 
-def _is_level1_title(el: Tag) -> bool:
-    """
-    Título de nivel 1 (subtema): sección principal dentro del tab.
-    Incluye h3–h6 y <p> con clase fontsize20/fontsize24/font-color-violeta o style font-size:20px.
-    """
-    if not el.get_text(strip=True):
-        return False
-    if el.name in ("h3", "h4", "h5", "h6"):
-        return True
-    if el.name != "p":
-        return False
-    classes = el.get("class") or []
-    if isinstance(classes, str):
-        classes = [classes]
-    if (
-        any("fontsize20" in c for c in classes)
-        or any("fontsize24" in c for c in classes)
-        or any("font-color-violeta" in c for c in classes)
-    ):
-        return True
-    style = (el.get("style") or "").lower()
-    if "font-size" in style and "20px" in style:
-        return True
-    return False
-
-
-def _is_level2_title(el: Tag) -> bool:
+# Apertura de cada tab en el HTML crudo, para enviar a los procesos hijos sus bytes sin re-serializar
+TAB_START = re.compile(rb"<div\b[^>]*\bclass\s*=\s*[\"']?[^\"'>]*(?<![\w-])tabContent(?![\w-])", re.IGNORECASE)
+META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.-]+)", re.IGNORECASE)
+# <p> se parsea con otro nombre: libxml2 lo cierra al encontrar un bloque (<div>, <table>, ...)
+# y el HTML del INDEC tiene títulos como <p>EPH<div>Bases</div></p>
+P_TAG = re.compile(r"<(/?)p(?=[\s/>])", re.IGNORECASE)
+OPEN_P_TAG = "p-indec"
+
+
+def compile_rules(
+    levels: Dict[str, str] = BASES_DATOS_LEVELS,
+    tab_rules: Dict[str, Dict[str, str]] = BASES_DATOS_TAB_RULES,
+) -> Tuple[Dict[str, etree.XPath], Dict[str, Dict[str, etree.XPath]]]:
     """
-    Título de nivel 2 (agrupamiento): subsección dentro del tab.
-    Ej.: div.sub_enc_salud_tit ("Documentos metodológicos", "Bases de microdatos", etc.).
+    Compila las reglas declarativas de jerarquía (ver BASES_DATOS_LEVELS y
+    BASES_DATOS_TAB_RULES en config).
+
+    Returns:
+        Tupla con (XPath por nivel, XPath por regla de cada id de tab).
+
+    Raises:
+        lxml.etree.XPathSyntaxError: Si alguna expresión es inválida.
     """
-    return (
-        el.name == "div"
-        and el.get("class") is not None
-        and "sub_enc_salud_tit" in (el.get("class") or [])
-        and bool(el.get_text(strip=True))
-    )
+    compiled_levels = {name: etree.XPath(expr) for name, expr in levels.items()}
+    compiled_tabs = {
+        tab_id: {name: etree.XPath(expr) for name, expr in rules.items()}
+        for tab_id, rules in tab_rules.items()
+    }
+    return compiled_levels, compiled_tabs
+
+
+# Compiladas una vez por proceso (también en los procesos hijos de _extract_tabs)
+LEVELS, TAB_RULES = compile_rules()
 
 
 def _normalize_section_text(text: str) -> str:
@@ -59,207 +74,204 @@ def _normalize_section_text(text: str) -> str:
     return re.sub(r"\s*▾\s*$", "", text).strip()
 
 
-def _first_level1_text_in_tab(tab: Tag) -> str:
-    """Devuelve el texto del primer título L1 en el tab (p. ej. 'Encuesta Permanente de Hogares (EPH)')."""
-    for tag in tab.find_all(_is_level1_title):
-        return _normalize_section_text(tag.get_text(strip=True))
-    return FALLBACK_TITLE
+def _titles(xpath: etree.XPath, tab) -> Dict:
+    """Elementos del tab que selecciona `xpath` y tienen texto, con su texto normalizado."""
+    titles = {}
+    for el in xpath(tab):
+        text = _normalize_section_text(_text(el))
+        if text:
+            titles[el] = text
+    return titles
 
 
-def _link_inside_any(link: Tag, candidates: List[Tag]) -> bool:
-    """True si link es descendiente de alguno de los tags en candidates."""
-    for c in candidates:
-        if link in c.descendants or link == c:
-            return True
-    return False
+def _text_before_list(container) -> str:
+    """Texto de `container` anterior a su primera <ul> (p. ej. 'Bases del tercer trimestre 2024')."""
+    parts = [(container.text or "").strip()]
+    for child in container:
+        if child.tag == "ul":
+            break
+        if isinstance(child.tag, str):
+            parts.append(_text(child))
+        parts.append((child.tail or "").strip())
+    return " ".join(filter(None, parts)).strip()
 
 
-def _agrupamiento_enlace_li(link: Tag) -> str:
+def _chain(a, chain_titles: Dict, containers: Set) -> str:
     """
-    Para enlaces dentro de la estructura ul/li.enlaces_li con div.enlace_li_tit:
-    devuelve la cadena de títulos (enlace_li_tit) desde el enlace hacia arriba,
-    más el texto del li.a-color2 que agrupa el enlace (p. ej. 'Bases del tercer trimestre 2024').
+    Agrupamiento por cadena: títulos ancestros del enlace (del más externo al
+    más interno) y, antes, el texto del contenedor de la <ul> que lo incluye.
     """
-    parts: List[str] = []
-    parent = link.parent
-    while parent and parent.name:
-        if parent.name == "div" and parent.get("class") and "enlace_li_tit" in (parent.get("class") or []):
-            t = _normalize_section_text(parent.get_text(strip=True))
-            if t:
-                parts.append(t)
-        parent = parent.parent if hasattr(parent, "parent") else None
-
-    # li.a-color2 que es padre del ul que contiene el enlace: texto antes del <ul>
-    a_parent = link.parent
-    while a_parent and getattr(a_parent, "name", None) != "ul":
-        a_parent = a_parent.parent if hasattr(a_parent, "parent") else None
-    if a_parent and getattr(a_parent, "parent", None):
-        li_cont = a_parent.parent
-        if li_cont and getattr(li_cont, "get", None) and (li_cont.get("class") or []) and "a-color2" in (li_cont.get("class") or []):
-            # texto directo antes del primer <ul>
-            before_ul: List[str] = []
-            for child in getattr(li_cont, "children", []):
-                if getattr(child, "name", None) == "ul":
-                    break
-                if hasattr(child, "get_text"):
-                    before_ul.append(child.get_text(strip=True))
-                else:
-                    before_ul.append(str(child).strip() if hasattr(child, "strip") else "")
-            text_before = " ".join(filter(None, before_ul)).strip()
-            if text_before:
-                parts.append(_normalize_section_text(text_before))
+    parts = [chain_titles[el] for el in a.iterancestors() if el in chain_titles]
+    ul = next(a.iterancestors("ul"), None)
+    if ul is not None and ul.getparent() in containers:
+        text = _text_before_list(ul.getparent())
+        if text:
+            parts.append(_normalize_section_text(text))
     parts.reverse()
-    return " | ".join(parts) if parts else ""
+    return " | ".join(parts)
 
 
-def _get_preceding_strong(a: Tag, tab: Tag) -> str | None:
-    """
-    Devuelve el texto del último <strong> que precede al enlace dentro del mismo tab,
-    o None si no hay. Se usa como nivel 3 para enriquecer agrupamiento (p. ej. tab1 EPH:
-    "Tercer trimestre 2025.", "Base individual y hogar...").
-    """
-    def inside_tab(tag: Tag) -> bool:
-        return tag == tab or tab in list(tag.parents)
-
-    prev_strong = [
-        t
-        for t in a.find_all_previous("strong")
-        if inside_tab(t) and t.get_text(strip=True)
-    ]
-    if not prev_strong:
-        return None
-    return _normalize_section_text(prev_strong[0].get_text(strip=True))
-
-
-def _get_hierarchy_for_link(a: Tag, tab: Tag) -> Tuple[str, str]:
-    """
-    Para un enlace dentro de tab, devuelve (subtema, agrupamiento) según la jerarquía
-    del DOM:
-    - L1 (subtema): p/h con título principal (fontsize20, font-color-violeta, h3–h6).
-    - L2/L3 (agrupamiento): div.sub_enc_salud_tit y, si existe, el último <strong>
-      precedente (p. ej. "Bases de microdatos | Tercer trimestre 2025.").
-    """
-    def inside_tab(tag: Tag) -> bool:
-        return tag == tab or tab in list(tag.parents)
-
-    prev_l1 = [
-        t
-        for t in a.find_all_previous(_is_level1_title)
-        if inside_tab(t)
-    ]
-    prev_l2 = [
-        t
-        for t in a.find_all_previous(_is_level2_title)
-        if inside_tab(t)
-    ]
-    strong_text = _get_preceding_strong(a, tab)
-
-    subtema = _normalize_section_text(prev_l1[0].get_text(strip=True)) if prev_l1 else FALLBACK_TITLE
-    if prev_l2:
-        agrupamiento = _normalize_section_text(prev_l2[0].get_text(strip=True))
-        if strong_text:
-            agrupamiento = agrupamiento + " | " + strong_text
-    elif strong_text:
-        agrupamiento = strong_text
-    else:
-        agrupamiento = subtema
-    return subtema, agrupamiento
-
-
-def _get_hierarchy_for_link_tab1(
-    a: Tag,
-    tab: Tag,
-    first_5_enlaces_li: List[Tag],
-    first_l1_text: str,
-) -> Tuple[str, str]:
-    """
-    Jerarquía específica para el div id=tab1 (Mercado laboral).
-    - Enlaces dentro de los primeros 5 li.enlaces_li → subtema = primer L1 del tab (EPH).
-    - Resto → subtema = último p fontsize20/fontsize24 font-color-violeta precedente;
-      agrupamiento = cadena div.enlace_li_tit + texto li.a-color2 cuando aplica.
-    """
-    def inside_tab(tag: Tag) -> bool:
-        return tag == tab or tab in list(tag.parents)
-
-    if _link_inside_any(a, first_5_enlaces_li):
-        subtema = first_l1_text
-        prev_l2 = [t for t in a.find_all_previous(_is_level2_title) if inside_tab(t)]
-        strong_text = _get_preceding_strong(a, tab)
-        if prev_l2:
-            agrupamiento = _normalize_section_text(prev_l2[0].get_text(strip=True))
-            if strong_text:
-                agrupamiento = agrupamiento + " | " + strong_text
-        elif strong_text:
-            agrupamiento = strong_text
-        else:
-            agrupamiento = subtema
-        return subtema, agrupamiento
-
-    # 6.º li.enlaces_li en adelante: L1 = último p fontsize20/24 font-color-violeta
-    prev_l1 = [t for t in a.find_all_previous(_is_level1_title) if inside_tab(t)]
-    subtema = _normalize_section_text(prev_l1[0].get_text(strip=True)) if prev_l1 else FALLBACK_TITLE
-    agrup = _agrupamiento_enlace_li(a)
-    if agrup:
-        agrupamiento = agrup
-    else:
-        prev_l2 = [t for t in a.find_all_previous(_is_level2_title) if inside_tab(t)]
-        strong_text = _get_preceding_strong(a, tab)
-        if prev_l2:
-            agrupamiento = _normalize_section_text(prev_l2[0].get_text(strip=True))
-            if strong_text:
-                agrupamiento = agrupamiento + " | " + strong_text
-        elif strong_text:
-            agrupamiento = strong_text
-        else:
-            agrupamiento = subtema
-    return subtema, agrupamiento
-
-
-def _extract_sections_with_links(tab: Tag, base_url: str) -> List[Tuple[str, str, List[Dict[str, str]]]]:
+def _extract_sections_with_links(tab, base_url: str) -> List[Tuple[str, str, List[Dict[str, str]]]]:
     """
     Dentro de un tabContent, extrae enlaces de datos y para cada uno determina
     subtema y agrupamiento según la jerarquía del DOM (L1=subtema, L2/L3=agrupamiento).
-    L3 es el texto del <strong> precedente cuando existe (p. ej. tab1 EPH).
+
+    Cada regla de LEVELS (y de TAB_RULES para el id del tab) se evalúa una sola
+    vez sobre el tab; luego un único recorrido en orden de documento mantiene
+    el último título visto de cada nivel, que es el que precede a cada enlace.
     Devuelve lista de (subtema, agrupamiento, archivos) para agrupar después.
     """
+    levels = {name: _titles(xpath, tab) for name, xpath in LEVELS.items()}
+    rules = TAB_RULES.get(tab.get("id"), {})
+    principal = set(rules["principal"](tab)) if "principal" in rules else set()
+    chain_titles = _titles(rules["cadena"], tab) if "cadena" in rules else {}
+    containers = set(rules["contenedor"](tab)) if "contenedor" in rules else set()
+    first_subtema = next(iter(levels["subtema"].values()), FALLBACK_TITLE)
+
     # Agrupar por (subtema, agrupamiento) para juntar enlaces del mismo bloque
     groups: Dict[Tuple[str, str], List[Dict[str, str]]] = {}
+    current: Dict[str, str | None] = {name: None for name in levels}
 
-    is_tab1 = tab.get("id") == "tab1"
-    first_5_enlaces_li: List[Tag] = []
-    first_l1_tab1 = FALLBACK_TITLE
-    if is_tab1:
-        all_li = tab.find_all("li", class_="enlaces_li")
-        first_5_enlaces_li = all_li[:5]
-        first_l1_tab1 = _first_level1_text_in_tab(tab)
-
-    for a in tab.find_all("a", href=True):
-        href = a.get("href", "").strip()
-        if not href:
+    for el in tab.iter(etree.Element):
+        for name, titles in levels.items():
+            if el in titles:
+                current[name] = titles[el]
+        if el.tag != "a":
             continue
-        href_lower = href.lower()
-        if not any(href_lower.endswith(ext) for ext in DATA_EXTENSIONS):
+        href = (el.get("href") or "").strip()
+        if not href or not href.lower().endswith(DATA_EXTENSIONS):
             continue
 
-        if is_tab1:
-            subtema, agrupamiento = _get_hierarchy_for_link_tab1(
-                a, tab, first_5_enlaces_li, first_l1_tab1
-            )
-        else:
-            subtema, agrupamiento = _get_hierarchy_for_link(a, tab)
-        key = (subtema, agrupamiento)
+        in_principal = bool(principal) and any(p in principal for p in (el, *el.iterancestors()))
+        subtema = first_subtema if in_principal else (current["subtema"] or FALLBACK_TITLE)
+        agrupamiento = "" if in_principal or not (chain_titles or containers) else _chain(
+            el, chain_titles, containers
+        )
+        if not agrupamiento:
+            agrupamiento = " | ".join(filter(None, (current["agrupamiento"], current["detalle"]))) or subtema
+
         archivo = {
-            "nombre_archivo": a.get_text(strip=True),
+            "nombre_archivo": _text(el),
             "url": _normalize_url(href, base_url),
         }
-        groups.setdefault(key, []).append(archivo)
+        groups.setdefault((subtema, agrupamiento), []).append(archivo)
 
     return [(st, ag, archs) for (st, ag), archs in groups.items()]
 
 
+def _tab_fingerprint(tab_html: bytes, base_url: str) -> str:
+    """
+    Hash SHA-256 del HTML crudo de un tab. Incluye base_url porque afecta
+    las URLs normalizadas que se guardan en caché.
+    """
+    h = hashlib.sha256()
+    h.update(base_url.encode("utf-8"))
+    h.update(b"\0")
+    h.update(tab_html)
+    return h.hexdigest()
+
+
+def _declared_charset(content: bytes, content_type: str | None = None) -> str:
+    """
+    Encoding del documento: el de su <meta charset> o, si no declara uno, el del
+    header Content-Type (utf-8 si tampoco lo informa).
+    """
+    match = META_CHARSET.search(content, 0, 4096)
+    return match.group(1).decode("ascii") if match else response_charset(content_type)
+
+
+def _parse_html(markup: bytes, encoding: str = "utf-8"):
+    """
+    Árbol lxml.html de `markup` decodificado con `encoding`.
+
+    Los <p> se anidan como en html.parser (el parser usado originalmente), no
+    como en libxml2: un <div> dentro de un <p> queda dentro, y el texto del
+    título incluye el del div.
+    """
+    try:
+        text = markup.decode(encoding, errors="replace")
+    except LookupError:  # charset declarado desconocido
+        text = markup.decode("utf-8", errors="replace")
+    root = lxml.html.fromstring(P_TAG.sub(rf"<\1{OPEN_P_TAG}", text))
+    for el in root.iter(OPEN_P_TAG):
+        el.tag = "p"
+    return root
+
+
+def _tab_sources(content: bytes, encoding: str, tabs: List) -> Tuple[List[bytes], str]:
+    """
+    HTML crudo de cada tab: desde su apertura hasta la del siguiente (o el fin
+    del documento). Re-parseado, el primer tabContent del fragmento es el tab.
+    Si las aperturas no coinciden con los tabs del árbol (p. ej. un tab dentro
+    de un comentario), se serializa cada tab en utf-8.
+
+    Returns:
+        Tupla con (HTML de cada tab, encoding de ese HTML).
+    """
+    starts = [m.start() for m in TAB_START.finditer(content)]
+    if len(starts) != len(tabs):
+        return [etree.tostring(tab, encoding="utf-8", with_tail=False) for tab in tabs], "utf-8"
+    return [content[start:end] for start, end in zip(starts, starts[1:] + [len(content)])], encoding
+
+
+def _process_tab_html(
+    tab_html: bytes, encoding: str, base_url: str
+) -> List[Tuple[str, str, List[Dict[str, str]]]]:
+    """
+    Parsea el HTML crudo de un tab y extrae sus secciones.
+    Se ejecuta en procesos hijos, por eso recibe y devuelve solo tipos serializables.
+    """
+    return _extract_sections_with_links(TABS_XPATH(_parse_html(tab_html, encoding))[0], base_url)
+
+
+def _extract_tabs(
+    tabs: List,
+    content: bytes,
+    encoding: str,
+    base_url: str,
+    cache: Dict[str, List],
+    max_workers: int | None,
+) -> List[List[Tuple[str, str, List[Dict[str, str]]]]]:
+    """
+    Extrae las secciones de cada tab reutilizando resultados cacheados por huella.
+    Los tabs cambiados se procesan en paralelo (procesos) cuando hay más de uno.
+    Los procesos se crean con "spawn": run_sources llama a esta función desde un
+    thread, y hacer fork con otros threads corriendo puede dejar locks tomados
+    en el hijo. Cada proceso recibe los bytes crudos de su tab (ver _tab_sources).
+
+    Returns:
+        Secciones por tab, en el mismo orden que `tabs` (orden del documento).
+    """
+    htmls, tab_encoding = _tab_sources(content, encoding, tabs)
+    fingerprints = [_tab_fingerprint(html, base_url) for html in htmls]
+    sections: List = [cache.get(fp) for fp in fingerprints]
+    pending = [i for i, cached in enumerate(sections) if cached is None]
+
+    workers = max_workers if max_workers is not None else min(len(pending), os.cpu_count() or 1)
+    if len(pending) > 1 and workers > 1:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = {i: executor.submit(_process_tab_html, htmls[i], tab_encoding, base_url) for i in pending}
+            for i, future in futures.items():
+                sections[i] = future.result()
+    else:
+        for i in pending:
+            sections[i] = _extract_sections_with_links(tabs[i], base_url)
+
+    # Solo se conservan las huellas vigentes para que la caché no crezca sin límite
+    cache.clear()
+    for fp, tab_sections in zip(fingerprints, sections):
+        cache[fp] = [list(s) for s in tab_sections]
+    return sections
+
+
 def scrape_bases_datos(
     url: str = BASES_DATOS_URL,
     base_url: str = BASE_URL,
+    cache_path: str | Path | None = None,
+    max_workers: int | None = None,
+    stats: Dict | None = None,
+    session: requests.Session | None = None,
 ) -> List[Catalog]:
     """
     Descarga la página Bases de datos, parsea secciones y extrae enlaces de datos.
@@ -269,9 +281,18 @@ def scrape_bases_datos(
     "Bases de microdatos | Tercer trimestre 2025."). Así cada archivo queda con
     metadata completa (incl. texto de strong en tab1 EPH).
 
+    Cada div.tabContent se identifica por el hash de su HTML crudo: si se
+    indica `cache_path`, los tabs sin cambios desde la corrida anterior reutilizan
+    el resultado guardado y solo se procesan (en paralelo) los que cambiaron.
+
     Args:
         url: URL de la página Bases de datos.
         base_url: URL base para normalizar enlaces.
+        cache_path: Archivo JSON con los resultados por tab (default: sin caché).
+        max_workers: Procesos para los tabs cambiados (default: uno por tab, hasta os.cpu_count()).
+        stats: Diccionario opcional donde se registran 'fetch_time', 'parse_time',
+            'bytes' y 'links', como en fetch_tema_data.
+        session: Sesión HTTP compartida (default: una petición sin sesión).
 
     Returns:
         Lista de Catalog con tema "Bases de datos", subtema/agrupamiento por subsección.
@@ -279,18 +300,93 @@ def scrape_bases_datos(
     Raises:
         requests.RequestException: Si falla la petición HTTP.
     """
-    response = requests.get(url, timeout=HTTP_TIMEOUT)
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+    response = (session or requests).get(url, timeout=HTTP_TIMEOUT)
+    stats["fetch_time"] = time.perf_counter() - start
+    response.raise_for_status()
+    stats["bytes"] = len(response.content)
+
+    start = time.perf_counter()
+    results = parse_bases_datos(
+        response.content, base_url, cache_path, max_workers, response.headers.get("Content-Type")
+    )
+    stats["parse_time"] = time.perf_counter() - start
+    stats["links"] = sum(len(c.archivos) for c in results)
+    stats["outcome"] = "ok"
+    return results
+
+
+async def ascrape_bases_datos(
+    client,
+    url: str = BASES_DATOS_URL,
+    base_url: str = BASE_URL,
+    cache_path: str | Path | None = None,
+    max_workers: int | None = None,
+) -> List[Catalog]:
+    """
+    Versión asíncrona de scrape_bases_datos.
+
+    El parseo (y la resolución de jerarquía por tab) se ejecuta en un thread
+    aparte para no bloquear el event loop.
+
+    Args:
+        client: httpx.AsyncClient compartido.
+        url: URL de la página Bases de datos.
+        base_url: URL base para normalizar enlaces.
+        cache_path: Archivo JSON con los resultados por tab (default: sin caché).
+        max_workers: Procesos para los tabs cambiados.
+
+    Returns:
+        Lista de Catalog con tema "Bases de datos".
+
+    Raises:
+        httpx.HTTPError: Si falla la petición HTTP.
+    """
+    response = await client.get(url, timeout=HTTP_TIMEOUT)
     response.raise_for_status()
-    response.encoding = response.encoding or "utf-8"
+    return await asyncio.to_thread(
+        parse_bases_datos,
+        response.content,
+        base_url,
+        cache_path,
+        max_workers,
+        response.headers.get("Content-Type"),
+    )
+
+
+def parse_bases_datos(
+    content: bytes,
+    base_url: str = BASE_URL,
+    cache_path: str | Path | None = None,
+    max_workers: int | None = None,
+    content_type: str | None = None,
+) -> List[Catalog]:
+    """
+    Parsea el HTML ya descargado de la página Bases de datos.
+
+    Args:
+        content: Cuerpo de la respuesta HTTP.
+        base_url: URL base para normalizar enlaces.
+        cache_path: Archivo JSON con los resultados por tab (default: sin caché).
+        max_workers: Procesos para los tabs cambiados.
+        content_type: Header Content-Type de la respuesta; su charset se usa si
+            el documento no declara uno en <meta charset>.
 
-    soup = BeautifulSoup(response.content, "html.parser")
+    Returns:
+        Lista de Catalog con tema "Bases de datos", subtema/agrupamiento por subsección.
+    """
     tema = "Bases de datos"
 
-    tabs = soup.find_all("div", class_="tabContent")
-    results: List[Catalog] = []
+    encoding = _declared_charset(content, content_type)
+    tabs = TABS_XPATH(_parse_html(content, encoding)) if content.strip() else []
+    cache: Dict[str, List] = (load_json(cache_path, {}) if cache_path else None) or {}
+    tab_sections = _extract_tabs(tabs, content, encoding, base_url, cache, max_workers)
+    if cache_path:
+        save_json(cache_path, cache)
 
-    for tab in tabs:
-        sections = _extract_sections_with_links(tab, base_url)
+    results: List[Catalog] = []
+    for sections in tab_sections:
         for subtema, agrupamiento, archivos in sections:
             if not archivos:
                 continue
@@ -304,4 +400,3 @@ def scrape_bases_datos(
             )
 
     return results
-
@@ -0,0 +1,240 @@
+"""Snapshot binario compacto del catálogo, legible con mmap sin parsear JSON."""
+
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from indec_catalog.models import Archivo, Catalog
+
+MAGIC = b"INDCAT\0\1"
+# magic, cantidad de strings, registros y archivos, offsets de cada sección
+HEADER = struct.Struct("<8s3I4Q")
+STRING_OFFSET = struct.Struct("<I")
+# tema, subtema, agrupamiento, primer archivo, cantidad de archivos
+RECORD = struct.Struct("<5I")
+# nombre, prefijo de la URL (hasta la última "/"), resto de la URL
+FILE = struct.Struct("<3I")
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def add(self, value: str) -> int:
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def _split_url(url: str) -> tuple[str, str]:
+    cut = url.rfind("/") + 1
+    return url[:cut], url[cut:]
+
+
+def write_snapshot(path: str | Path, catalog: List[Catalog]) -> None:
+    """
+    Guarda el catálogo en formato binario de forma atómica.
+
+    Estructura: cabecera, índice de offsets de strings, tabla de strings UTF-8
+    deduplicados (tema, subtema, agrupamiento, nombres y prefijos de URL
+    compartidos por carpeta), registros de ancho fijo y archivos de ancho fijo.
+
+    Args:
+        path: Archivo de salida.
+        catalog: Lista de Catalog.
+    """
+    strings = _StringTable()
+    records = bytearray()
+    files = bytearray()
+    n_files = 0
+    for record in catalog:
+        records += RECORD.pack(
+            strings.add(record.tema),
+            strings.add(record.subtema),
+            strings.add(record.agrupamiento),
+            n_files,
+            len(record.archivos),
+        )
+        for archivo in record.archivos:
+            prefix, rest = _split_url(archivo.url)
+            files += FILE.pack(strings.add(archivo.nombre_archivo), strings.add(prefix), strings.add(rest))
+            n_files += 1
+
+    data = bytearray()
+    index = bytearray()
+    for value in strings.strings:
+        index += STRING_OFFSET.pack(len(data))
+        data += value.encode("utf-8")
+    index += STRING_OFFSET.pack(len(data))
+
+    index_off = HEADER.size
+    data_off = index_off + len(index)
+    records_off = data_off + len(data)
+    files_off = records_off + len(records)
+    header = HEADER.pack(
+        MAGIC, len(strings.strings), len(catalog), n_files, index_off, data_off, records_off, files_off
+    )
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for part in (header, index, data, records, files):
+                f.write(part)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class ArchivoView:
+    """Archivo leído bajo demanda desde el snapshot."""
+
+    __slots__ = ("_snapshot", "_offset")
+
+    def __init__(self, snapshot: "CatalogSnapshot", offset: int):
+        self._snapshot = snapshot
+        self._offset = offset
+
+    @property
+    def nombre_archivo(self) -> str:
+        return self._snapshot.string(FILE.unpack_from(self._snapshot.buffer, self._offset)[0])
+
+    @property
+    def url(self) -> str:
+        _, prefix, rest = FILE.unpack_from(self._snapshot.buffer, self._offset)
+        return self._snapshot.string(prefix) + self._snapshot.string(rest)
+
+    def model(self) -> Archivo:
+        return Archivo(nombre_archivo=self.nombre_archivo, url=self.url)
+
+
+class CatalogView:
+    """Registro del catálogo leído bajo demanda desde el snapshot."""
+
+    __slots__ = ("_snapshot", "_fields")
+
+    def __init__(self, snapshot: "CatalogSnapshot", index: int):
+        self._snapshot = snapshot
+        self._fields = RECORD.unpack_from(snapshot.buffer, snapshot.records_off + index * RECORD.size)
+
+    @property
+    def tema(self) -> str:
+        return self._snapshot.string(self._fields[0])
+
+    @property
+    def subtema(self) -> str:
+        return self._snapshot.string(self._fields[1])
+
+    @property
+    def agrupamiento(self) -> str:
+        return self._snapshot.string(self._fields[2])
+
+    @property
+    def archivos(self) -> List[ArchivoView]:
+        first, count = self._fields[3], self._fields[4]
+        base = self._snapshot.files_off
+        return [ArchivoView(self._snapshot, base + (first + i) * FILE.size) for i in range(count)]
+
+    def model(self) -> Catalog:
+        return Catalog(
+            tema=self.tema,
+            subtema=self.subtema,
+            agrupamiento=self.agrupamiento,
+            archivos=[a.model() for a in self.archivos],
+        )
+
+
+class CatalogSnapshot:
+    """
+    Lector de un snapshot binario mapeado en memoria.
+
+    Abrir el archivo solo lee la cabecera; los registros y strings se
+    decodifican al accederlos (los strings quedan cacheados), así un proceso
+    puede responder su primera consulta sin cargar el catálogo entero.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path: Archivo escrito con write_snapshot.
+
+        Raises:
+            ValueError: Si el archivo no es un snapshot del catálogo o está
+                truncado (el tamaño no coincide con la cabecera).
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path} no es un snapshot del catálogo")
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header(path)
+        except BaseException:
+            self.buffer.close()
+            raise
+        self._strings: Dict[int, str] = {}
+
+    def _read_header(self, path: str | Path) -> None:
+        """Lee la cabecera y verifica que las secciones que declara ocupen exactamente el archivo."""
+        (
+            magic, self.n_strings, self.n_records, self.n_files,
+            self.index_off, self.data_off, self.records_off, self.files_off,
+        ) = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} no es un snapshot del catálogo")
+        size = len(self.buffer)
+        valid = (
+            self.index_off == HEADER.size
+            and self.data_off == self.index_off + (self.n_strings + 1) * STRING_OFFSET.size
+            and self.data_off <= self.records_off
+            and self.files_off == self.records_off + self.n_records * RECORD.size
+            and self.files_off + self.n_files * FILE.size == size
+        )
+        if valid:
+            # El último offset del índice marca el fin de la tabla de strings
+            (strings_end,) = STRING_OFFSET.unpack_from(self.buffer, self.data_off - STRING_OFFSET.size)
+            valid = self.data_off + strings_end == self.records_off
+        if not valid:
+            raise ValueError(f"{path}: snapshot truncado o dañado ({size} bytes)")
+
+    def string(self, index: int) -> str:
+        """String `index` de la tabla, decodificado una sola vez."""
+        value = self._strings.get(index)
+        if value is None:
+            start, end = struct.unpack_from("<2I", self.buffer, self.index_off + index * STRING_OFFSET.size)
+            value = self._strings[index] = self.buffer[self.data_off + start:self.data_off + end].decode("utf-8")
+        return value
+
+    def __len__(self) -> int:
+        return self.n_records
+
+    def __getitem__(self, index: int) -> CatalogView:
+        if index < 0:
+            index += self.n_records
+        if not 0 <= index < self.n_records:
+            raise IndexError(index)
+        return CatalogView(self, index)
+
+    def __iter__(self) -> Iterator[CatalogView]:
+        return (CatalogView(self, i) for i in range(self.n_records))
+
+    def catalog(self) -> List[Catalog]:
+        """Materializa el catálogo completo como lista de Catalog."""
+        return [view.model() for view in self]
+
+    def close(self) -> None:
+        self.buffer.close()
+
+    def __enter__(self) -> "CatalogSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
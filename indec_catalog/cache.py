@@ -0,0 +1,66 @@
+"""Utilidades de persistencia en disco para cachés y estado entre corridas."""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def load_json(path: str | Path, default: Any = None) -> Any:
+    """
+    Lee un archivo JSON de caché.
+
+    Args:
+        path: Ruta del archivo.
+        default: Valor a retornar si el archivo no existe o está corrupto.
+
+    Returns:
+        Contenido del archivo o `default`.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def save_json(path: str | Path, data: Any, indent: int | None = None) -> None:
+    """
+    Escribe un archivo JSON de forma atómica (archivo temporal + os.replace).
+
+    Un proceso interrumpido nunca deja el archivo a medio escribir: o queda la
+    versión anterior o la nueva completa.
+
+    Args:
+        path: Ruta del archivo.
+        data: Objeto serializable a JSON.
+        indent: Indentación del JSON (default: compacto).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def content_fingerprint(data: Any) -> str:
+    """
+    Hash estable de un valor serializable a JSON (p. ej. el contenido extraído
+    de una página), independiente del orden de las claves.
+
+    Args:
+        data: Objeto serializable a JSON.
+
+    Returns:
+        Hash SHA-256 en hexadecimal.
+    """
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
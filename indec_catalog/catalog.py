@@ -1,47 +1,438 @@
 """Módulo principal para generar el catálogo de datos del INDEC."""
 
-from indec_catalog.config import BASE_URL
-from indec_catalog.sitemap import extract_sitemap_urls, build_url
-from indec_catalog.scraper import fetch_tema_data
-from indec_catalog.bases_datos import scrape_bases_datos
-from indec_catalog.models import Catalog
-from typing import List, Dict
+import asyncio
+import json
+import queue
+import threading
+import time
+import xml.etree.ElementTree as ET
+from functools import partial
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, List, Dict, Tuple
+
+import requests
 from tqdm import tqdm
 
+from indec_catalog.cache import load_json, save_json
+from indec_catalog.config import (
+    ASYNC_CONCURRENCY,
+    BASE_URL,
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF,
+    SITEMAP_PREFETCH_SIZE,
+    SITEMAP_URL,
+)
+from indec_catalog.failures import classify_exception, is_retryable
+from indec_catalog.negative import NegativeCache
+from indec_catalog.redirects import RedirectMap
+from indec_catalog.timings import PageTimings
+from indec_catalog.http import create_async_client
+from indec_catalog.sitemap import (
+    aextract_sitemap_urls,
+    aiter_sitemap_urls,
+    build_url,
+    extract_sitemap_lastmod,
+    extract_sitemap_urls,
+    iter_sitemap_urls,
+    SitemapFilter,
+)
+from indec_catalog.scraper import afetch_tema_data, fetch_tema_data, fetch_tema_data_streaming
+from indec_catalog.bases_datos import ascrape_bases_datos, scrape_bases_datos
+from indec_catalog.models import Catalog
+
+# sitemap.xml suele informar solo la fecha en <lastmod>: una página modificada el
+# mismo día de la última corrida se vuelve a descargar para no perder cambios.
+LASTMOD_GRACE = timedelta(days=1)
+
 
 def generate_catalog_with_errors(
     show_progress: bool = True,
+    on_page: Callable[[str, Dict], None] | None = None,
+    on_stats: Callable[[str, Dict], None] | None = None,
+    streaming: bool = False,
+    done: Dict[str, Dict] | None = None,
+    redirects: RedirectMap | None = None,
+    negative: NegativeCache | None = None,
+    sitemap_filter: SitemapFilter | None = None,
+    session: requests.Session | None = None,
 ):
     """
     Genera el catálogo y retorna también las URLs que fallaron.
     
     Args:
         show_progress: Si mostrar barra de progreso (default: True).
+        on_page: Función llamada con (url, datos del tema) por cada página
+            procesada, p. ej. para escribir resultados a medida que llegan.
+        on_stats: Función llamada con (url, métricas) por cada página, con los
+            tiempos de descarga/parseo de fetch_tema_data.
+        streaming: Usar fetch_tema_data_streaming (parseo incremental durante
+            la descarga, cortando al terminar el contenido).
+        done: Resultados ya obtenidos por URL (p. ej. de un CrawlJournal al
+            reanudar); esas páginas no se vuelven a descargar.
+        redirects: Mapa de redirecciones entre corridas, para no descargar dos
+            veces la misma página final (ver RedirectMap).
+        negative: Caché de páginas sin datos, que se saltean hasta su
+            re-verificación (ver NegativeCache).
+        sitemap_filter: Procesar solo las páginas del MapaSitio que lo cumplen
+            (ver SitemapFilter); las demás no se descargan.
+        session: Sesión HTTP compartida para el MapaSitio y las páginas
+            (default: una petición sin sesión cada vez).
         
     Returns:
-        Tupla con (lista de objetos Catalog, lista de URLs con errores).
+        Tupla con (lista de objetos Catalog, lista de URLs con errores). Si la
+        descarga del MapaSitio se corta después de listar alguna página, se
+        devuelven las páginas listadas hasta ahí y SITEMAP_URL figura entre los
+        errores; si falla antes, se relanza la excepción.
     """
-    links = extract_sitemap_urls()
+    if sitemap_filter is not None:
+        links: Iterable[str] = extract_sitemap_urls(sitemap_filter=sitemap_filter, session=session)
+    else:
+        # El MapaSitio se descarga en paralelo y las páginas se procesan a
+        # medida que aparecen, sin esperar al sitemap completo
+        links = _prefetched(iter_sitemap_urls(session=session))
+    urls: List[str] = []
+    done = done or {}
+    sitemap_failed = False
+
+    def pending() -> Iterator[str]:
+        nonlocal sitemap_failed
+        try:
+            for link in links:
+                url = build_url(link, BASE_URL)
+                urls.append(url)
+                if url not in done:
+                    yield url
+        except Exception:
+            if not urls:
+                raise
+            sitemap_failed = True
+
+    pages, errors = _fetch_pages(
+        pending(),
+        show_progress,
+        on_page,
+        on_stats,
+        streaming,
+        redirects,
+        negative=negative,
+        session=session,
+    )
+
+    # Intercala resultados previos y nuevos en el orden del sitemap
     result: List[Dict] = []
+    fetched = iter(pages)
+    current = next(fetched, None)
+    for url in urls:
+        if url in done:
+            result.append(done[url])
+        elif current is not None and current[0] == url:
+            result.append(current[1])
+            current = next(fetched, None)
+    if sitemap_failed:
+        errors.append(SITEMAP_URL)
+    return result, errors
+
+
+def _prefetched(items: Iterable[str], maxsize: int = SITEMAP_PREFETCH_SIZE) -> Iterator[str]:
+    """
+    Recorre `items` en un thread aparte y entrega cada elemento apenas se produce.
+
+    Permite solapar un productor lento (p. ej. la descarga del MapaSitio) con
+    el procesamiento de lo que ya produjo. El productor se adelanta como mucho
+    `maxsize` elementos y se detiene si quien consume deja de iterar. Si el
+    productor falla, la excepción se relanza en quien consume, después de los
+    elementos ya producidos.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    stopped = threading.Event()
+    end = object()
+
+    def put(entry: Tuple) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((end, None))
+        except BaseException as e:
+            put((end, e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is end:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+def _fetch_pages(
+    urls: Iterable[str],
+    show_progress: bool = True,
+    on_page: Callable[[str, Dict], None] | None = None,
+    on_stats: Callable[[str, Dict], None] | None = None,
+    streaming: bool = False,
+    redirects: RedirectMap | None = None,
+    stop: Callable[[], bool] | None = None,
+    negative: NegativeCache | None = None,
+    session: requests.Session | None = None,
+) -> Tuple[List[Tuple[str, Dict]], List[str]]:
+    """
+    Descarga y parsea una lista de páginas Nivel4.
+
+    Las páginas que terminan en la misma URL final se procesan una sola vez: si
+    el mapa de redirecciones ya sabe que una URL equivale a una página
+    procesada en esta corrida no se descarga, y si se descubre al descargarla,
+    su registro se descarta. En ambos casos no figura ni como página ni como error,
+    igual que las páginas que la caché negativa indica saltear.
+
+    Args:
+        urls: URLs completas a procesar. Puede ser un generador (p. ej. el
+            MapaSitio mientras se descarga): la barra de progreso muestra
+            entonces las páginas procesadas sin un total.
+        show_progress: Si mostrar barra de progreso.
+        on_page: Función llamada con (url, datos del tema) por cada página exitosa.
+        on_stats: Función llamada con (url, métricas de fetch_tema_data) por cada
+            página. Si la descarga lanzó una excepción, las métricas incluyen su
+            clasificación (ver failures.classify_exception); 'elapsed' es el
+            tiempo total hasta el resultado o el fallo.
+        streaming: Usar fetch_tema_data_streaming en lugar de fetch_tema_data.
+        redirects: Mapa de redirecciones entre corridas (default: solo en memoria).
+        stop: Función consultada antes de cada URL; si retorna True no se
+            procesan más páginas (las restantes no figuran en el resultado).
+        negative: Caché negativa, consultada antes de cada descarga y
+            actualizada con su resultado.
+        session: Sesión HTTP compartida (default: una petición sin sesión).
+
+    Returns:
+        Tupla con (lista de pares (url, datos del tema), lista de URLs con errores).
+    """
+    pages: List[Tuple[str, Dict]] = []
     errors: List[str] = []
-    
-    iterable = tqdm(links, desc="Procesando links") if show_progress else links
-    
-    for link in iterable:
-        url = build_url(link, BASE_URL)
-        
+    redirects = redirects if redirects is not None else RedirectMap()
+    seen: set = set()  # URLs finales ya procesadas con éxito en esta corrida
+
+    fetch = fetch_tema_data_streaming if streaming else fetch_tema_data
+    if session is not None:
+        fetch = partial(fetch, session=session)
+    iterable = tqdm(urls, desc="Procesando links") if show_progress else urls
+
+    for url in iterable:
+        if stop is not None and stop():
+            break
+        if redirects.resolve(url) in seen or (negative is not None and negative.skip(url)):
+            continue
+        stats: Dict = {}
+        start = time.perf_counter()
         try:
-            tema_data = fetch_tema_data(url)
-            if tema_data is not None:
-                result.append(tema_data)
-            else:
+            tema_data = fetch(url, stats=stats)
+            final_url = stats.get("final_url")
+            if tema_data is None:
+                redirects.record(url, None)
                 errors.append(url)
-        except Exception:
+            elif final_url is not None and final_url in seen:
+                redirects.record(url, final_url)
+                stats["duplicate_of"] = final_url
+            else:
+                if final_url is not None:
+                    redirects.record(url, final_url)
+                    seen.add(final_url)
+                pages.append((url, tema_data))
+                if on_page is not None:
+                    on_page(url, tema_data)
+        except Exception as e:
+            stats.update(classify_exception(e))
             errors.append(url)
-    
+        stats["elapsed"] = time.perf_counter() - start
+        if negative is not None:
+            negative.record(url, stats)
+        if on_stats is not None:
+            on_stats(url, stats)
+
+    return pages, errors
+
+
+def generate_catalog_incremental(
+    state_path: str | Path,
+    show_progress: bool = True,
+    on_page: Callable[[str, Dict], None] | None = None,
+    on_stats: Callable[[str, Dict], None] | None = None,
+    streaming: bool = False,
+    redirects: RedirectMap | None = None,
+    negative: NegativeCache | None = None,
+    session: requests.Session | None = None,
+):
+    """
+    Genera el catálogo descargando solo las páginas modificadas desde la última corrida.
+
+    Usa <lastmod> de sitemap.xml para decidir qué páginas volver a descargar; el
+    resto se toma del estado guardado en `state_path`, igual que las páginas
+    que fallan (figuran en los errores pero conservan sus datos previos). Si
+    sitemap.xml no está disponible se usa el MapaSitio HTML y se descargan
+    todas las páginas.
+
+    Args:
+        state_path: Archivo JSON con la fecha de la última corrida sin errores
+            y los datos de cada página.
+        show_progress: Si mostrar barra de progreso (default: True).
+        on_page: Función llamada con (url, datos del tema) por cada página descargada.
+        on_stats: Función llamada con (url, métricas) por cada página descargada.
+        streaming: Usar fetch_tema_data_streaming en lugar de fetch_tema_data.
+        redirects: Mapa de redirecciones entre corridas (ver RedirectMap).
+        negative: Caché de páginas sin datos (ver NegativeCache).
+        session: Sesión HTTP compartida (default: una petición sin sesión).
+
+    Returns:
+        Tupla con (lista de diccionarios de temas, lista de URLs con errores),
+        igual que generate_catalog_with_errors.
+    """
+    started = datetime.now(timezone.utc)
+    state = load_json(state_path, {})
+    previous: Dict[str, Dict] = state.get("pages", {})
+    last_run = datetime.fromisoformat(state["last_run"]) if state.get("last_run") else None
+
+    try:
+        lastmods = extract_sitemap_lastmod(session=session)
+        links = list(lastmods)
+    except (requests.RequestException, ET.ParseError):
+        lastmods = {}
+        links = extract_sitemap_urls(session=session)
+
+    urls = [build_url(link, BASE_URL) for link in links]
+    to_fetch = []
+    for link, url in zip(links, urls):
+        lastmod = lastmods.get(link)
+        unchanged = last_run is not None and lastmod is not None and lastmod + LASTMOD_GRACE <= last_run
+        if not (unchanged and url in previous):
+            to_fetch.append(url)
+
+    fetched, errors = _fetch_pages(
+        to_fetch, show_progress, on_page, on_stats, streaming, redirects, negative=negative, session=session
+    )
+    fetched_by_url = dict(fetched)
+    # Una página que falló conserva los datos de la corrida anterior
+    refreshed = set(to_fetch) - set(errors)
+
+    result: List[Dict] = []
+    pages: Dict[str, Dict] = {}
+    for url in urls:
+        record = fetched_by_url.get(url) if url in refreshed else previous.get(url)
+        if record is not None:
+            result.append(record)
+            pages[url] = record
+
+    # Con páginas fallidas no se avanza la fecha: la próxima corrida vuelve a
+    # comparar <lastmod> contra la última corrida completa
+    last_run_value = state.get("last_run") if errors else started.isoformat()
+    save_json(state_path, {"last_run": last_run_value, "pages": pages})
     return result, errors
 
 
+def retry_failed_pages(
+    urls: List[str],
+    max_attempts: int = RETRY_ATTEMPTS,
+    backoff: float = RETRY_BACKOFF,
+    show_progress: bool = True,
+    on_page: Callable[[str, Dict], None] | None = None,
+    on_stats: Callable[[str, Dict], None] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Tuple[List[Tuple[str, Dict]], List[str]]:
+    """
+    Vuelve a descargar solo las páginas dadas (p. ej. las de una FailureQueue).
+
+    Cada página se intenta una vez; las que fallan con un error transitorio
+    (timeout, conexión, 429 o 5xx) se reintentan hasta `max_attempts` veces,
+    esperando `backoff`, 2 * `backoff`, 4 * `backoff`... segundos entre rondas.
+
+    Args:
+        urls: URLs completas a reintentar.
+        max_attempts: Máximo de intentos por página.
+        backoff: Espera base en segundos antes de la segunda ronda.
+        show_progress: Si mostrar barra de progreso.
+        on_page: Función llamada con (url, datos del tema) por cada página exitosa.
+        on_stats: Función llamada con (url, métricas) por cada intento.
+        sleep: Función de espera (inyectable para tests).
+
+    Returns:
+        Tupla con (lista de pares (url, datos del tema), lista de URLs que
+        siguen fallando), en el orden de `urls`.
+    """
+    recovered: Dict[str, Dict] = {}
+    pending = list(urls)
+    for attempt in range(max_attempts):
+        if attempt:
+            sleep(backoff * 2 ** (attempt - 1))
+        transient: List[str] = []
+
+        def collect(url: str, stats: Dict) -> None:
+            if on_stats is not None:
+                on_stats(url, stats)
+            if stats.get("outcome") != "ok" and is_retryable(stats.get("outcome"), stats.get("status")):
+                transient.append(url)
+
+        fetched, _ = _fetch_pages(pending, show_progress, on_page, collect)
+        recovered.update(fetched)
+        pending = transient
+        if not pending:
+            break
+
+    pages = [(url, recovered[url]) for url in urls if url in recovered]
+    return pages, [url for url in urls if url not in recovered]
+
+
+def merge_catalogs(base: List[Catalog], updates: List[Catalog]) -> List[Catalog]:
+    """
+    Incorpora registros a un catálogo existente sin re-crawlear el resto.
+
+    Un registro con el mismo tema/subtema/agrupamiento reemplaza al existente en
+    su lugar. Uno nuevo se ubica después del último registro de su mismo
+    tema y subtema (o, si no hay, de su mismo tema), que es donde lo pondría el
+    orden del MapaSitio; si el tema es nuevo, va al final.
+
+    Args:
+        base: Catálogo existente, en su orden.
+        updates: Registros nuevos o actualizados.
+
+    Returns:
+        Nuevo catálogo combinado.
+    """
+    merged = list(base)
+    positions = {(r.tema, r.subtema, r.agrupamiento): i for i, r in enumerate(merged)}
+    for record in updates:
+        key = (record.tema, record.subtema, record.agrupamiento)
+        if key in positions:
+            merged[positions[key]] = record
+            continue
+
+        index = len(merged)
+        for match in (lambda r: (r.tema, r.subtema) == key[:2], lambda r: r.tema == key[0]):
+            found = [i for i, r in enumerate(merged) if match(r)]
+            if found:
+                index = found[-1] + 1
+                break
+        merged.insert(index, record)
+        positions = {(r.tema, r.subtema, r.agrupamiento): i for i, r in enumerate(merged)}
+    return merged
+
+
 def generate_catalog(
     show_progress: bool = True,
 ) -> List[Catalog]:
@@ -66,14 +457,350 @@ def generate_catalog(
     ]
 
 
-def generate_catalog_bases_datos() -> List[Catalog]:
+def generate_catalog_bases_datos(
+    cache_path: str | Path | None = None,
+    max_workers: int | None = None,
+    stats: Dict | None = None,
+    session: requests.Session | None = None,
+) -> List[Catalog]:
     """
     Genera el catálogo a partir de la página Institucional Bases de datos.
 
+    Args:
+        cache_path: Archivo JSON con resultados por tab para reutilizar entre corridas.
+        max_workers: Procesos para los tabs que cambiaron (default: automático).
+        stats: Diccionario opcional donde se registran tiempos y cantidad de enlaces.
+        session: Sesión HTTP compartida (default: una petición sin sesión).
+
     Returns:
         Lista de Catalog con tema "Bases de datos" y secciones por bloque.
 
     Raises:
         requests.RequestException: Si falla la petición HTTP.
     """
-    return scrape_bases_datos()
\ No newline at end of file
+    return scrape_bases_datos(cache_path=cache_path, max_workers=max_workers, stats=stats, session=session)
+
+
+async def agenerate_catalog_with_errors(
+    show_progress: bool = True,
+    concurrency: int = ASYNC_CONCURRENCY,
+    client=None,
+    on_page: Callable[[str, Dict], None] | None = None,
+    on_stats: Callable[[str, Dict], None] | None = None,
+    redirects: RedirectMap | None = None,
+    negative: NegativeCache | None = None,
+    sitemap_filter: SitemapFilter | None = None,
+    timings: PageTimings | None = None,
+    done: Dict[str, Dict] | None = None,
+):
+    """
+    Versión asíncrona de generate_catalog_with_errors.
+
+    Las páginas se descargan concurrentemente (acotado por un semáforo) sobre un
+    único cliente HTTP con pool de conexiones (multiplexadas con HTTP/2 si está
+    disponible, ver create_async_client); el parseo HTML se ejecuta en threads.
+    Si la tarea se cancela, se cancelan también todas las peticiones en curso.
+
+    Sin duraciones previas, cada página se empieza a descargar apenas aparece
+    en el MapaSitio. Con `timings`, se espera al MapaSitio completo y las
+    páginas se inician de la más lenta a la más rápida según las corridas
+    anteriores (ver PageTimings.schedule), para que las lentas no queden
+    solas al final; el makespan previsto y el real quedan en `timings.report`.
+
+    Args:
+        show_progress: Si mostrar barra de progreso (default: True).
+        concurrency: Máximo de páginas procesándose a la vez.
+        client: httpx.AsyncClient a reutilizar (default: se crea uno propio).
+        on_page: Función llamada con (url, datos del tema) por cada página exitosa.
+        on_stats: Función llamada con (url, métricas) por cada página, como en
+            generate_catalog_with_errors.
+        redirects: Mapa de redirecciones entre corridas (ver RedirectMap).
+        negative: Caché de páginas sin datos (ver NegativeCache).
+        sitemap_filter: Procesar solo las páginas del MapaSitio que lo cumplen.
+        timings: Duraciones de corridas anteriores para planificar el orden de
+            las descargas. No se actualiza acá: para eso, pasar su método
+            record como (o dentro de) `on_stats`.
+        done: Resultados ya obtenidos por URL (p. ej. de un CrawlJournal al
+            reanudar); esas páginas no se vuelven a descargar.
+
+    Returns:
+        Tupla con (lista de diccionarios de temas, lista de URLs con errores),
+        en el orden del sitemap. Como en generate_catalog_with_errors, si el
+        MapaSitio se corta después de listar alguna página se devuelven las
+        páginas listadas y SITEMAP_URL figura entre los errores.
+    """
+    if client is None:
+        async with create_async_client(concurrency) as own_client:
+            return await agenerate_catalog_with_errors(
+                show_progress, concurrency, own_client, on_page, on_stats, redirects, negative, sitemap_filter,
+                timings, done,
+            )
+
+    if timings is not None and len(timings):
+        links = await aextract_sitemap_urls(client, sitemap_filter=sitemap_filter)
+        urls = [build_url(link, BASE_URL) for link in links]
+        order = timings.schedule(urls)
+        predicted = timings.makespan(urls, concurrency, order)
+        start = time.perf_counter()
+        result = await _afetch_pages(
+            urls, client, concurrency, show_progress, on_page, on_stats, redirects, negative, order, done
+        )
+        timings.report = {
+            "pages": len(urls),
+            "workers": concurrency,
+            "predicted": predicted,
+            "sitemap_order": timings.makespan(urls, concurrency),
+            "actual": time.perf_counter() - start,
+        }
+        return result
+
+    if sitemap_filter is not None:
+        links = await aextract_sitemap_urls(client, sitemap_filter=sitemap_filter)
+        urls = [build_url(link, BASE_URL) for link in links]
+        return await _afetch_pages(
+            urls, client, concurrency, show_progress, on_page, on_stats, redirects, negative, done=done
+        )
+
+    sitemap_failed = False
+
+    async def pending() -> AsyncIterator[str]:
+        nonlocal sitemap_failed
+        listed = 0
+        try:
+            async for link in aiter_sitemap_urls(client):
+                listed += 1
+                yield build_url(link, BASE_URL)
+        except Exception:
+            if not listed:
+                raise
+            sitemap_failed = True
+
+    result, errors = await _afetch_pages(
+        pending(), client, concurrency, show_progress, on_page, on_stats, redirects, negative, done=done
+    )
+    if sitemap_failed:
+        errors.append(SITEMAP_URL)
+    return result, errors
+
+
+async def _afetch_pages(
+    urls: List[str] | AsyncIterable[str],
+    client,
+    concurrency: int = ASYNC_CONCURRENCY,
+    show_progress: bool = True,
+    on_page: Callable[[str, Dict], None] | None = None,
+    on_stats: Callable[[str, Dict], None] | None = None,
+    redirects: RedirectMap | None = None,
+    negative: NegativeCache | None = None,
+    order: List[int] | None = None,
+    done: Dict[str, Dict] | None = None,
+) -> Tuple[List[Dict], List[str]]:
+    """
+    Versión asíncrona de _fetch_pages: descarga páginas Nivel4 concurrentemente.
+
+    Las peticiones que el mapa de redirecciones sabe que terminan en la misma
+    página final comparten una única descarga en vuelo; como en _fetch_pages,
+    cada página final aparece una sola vez en el resultado y las páginas que
+    la caché negativa saltea no figuran ni como página ni como error.
+
+    Args:
+        urls: URLs completas a procesar, o un iterable asíncrono de URLs (p. ej.
+            el MapaSitio mientras se descarga): cada página se empieza a
+            descargar apenas llega y el total de la barra de progreso se
+            conoce al terminar el iterable.
+        client: httpx.AsyncClient compartido.
+        concurrency: Máximo de páginas procesándose a la vez.
+        show_progress: Si mostrar barra de progreso.
+        on_page: Función llamada con (url, datos del tema) por cada página
+            exitosa, apenas termina su descarga (en orden de llegada).
+        on_stats: Función llamada con (url, métricas) por cada página descargada,
+            apenas termina su descarga.
+        redirects: Mapa de redirecciones entre corridas (default: solo en memoria).
+        negative: Caché negativa, consultada antes de cada descarga y
+            actualizada con su resultado.
+        order: Índices de `urls` (si es una lista) en el orden en que se
+            inician las descargas (default: el de `urls`); el resultado sigue
+            en el orden de `urls`.
+        done: Resultados ya obtenidos por URL (p. ej. de un CrawlJournal al
+            reanudar): esas páginas no se descargan ni se informan a on_page,
+            y su resultado previo queda en su lugar.
+
+    Returns:
+        Tupla con (lista de diccionarios de temas, lista de URLs con errores),
+        en el orden de `urls`.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    total = len(urls) if isinstance(urls, list) else None
+    progress = tqdm(total=total, desc="Procesando links") if show_progress else None
+    redirects = redirects if redirects is not None else RedirectMap()
+    in_flight: Dict[str, asyncio.Task] = {}  # URL final -> descarga en curso o terminada
+    seen: set = set()  # URLs finales ya informadas con éxito en esta corrida
+    done = done or {}
+
+    async def fetch_once(url: str) -> Tuple[Dict | None, str | None]:
+        async with semaphore:
+            stats: Dict = {}
+            start = time.perf_counter()
+            try:
+                record = await afetch_tema_data(url, client, stats=stats)
+            except Exception as e:
+                stats.update(classify_exception(e))
+                return None, None
+            finally:
+                stats["elapsed"] = time.perf_counter() - start
+                if negative is not None:
+                    negative.record(url, stats)
+                if on_stats is not None:
+                    on_stats(url, stats)
+        final_url = stats.get("final_url") if record is not None else None
+        redirects.record(url, final_url)
+        return record, final_url
+
+    async def fetch(url: str) -> Tuple[Dict | None, str | None, bool]:
+        """
+        Devuelve (registro, URL final, si la página no va al resultado porque
+        reutilizó la descarga de otra URL, su URL final ya se procesó o la
+        caché negativa la saltea). Las páginas que van al resultado se
+        informan a on_page apenas terminan, en orden de llegada.
+        """
+        try:
+            if url in done:
+                return done[url], None, False
+            if negative is not None and negative.skip(url):
+                return None, None, True
+            key = redirects.resolve(url)
+            shared = in_flight.get(key)
+            if shared is not None:
+                record, final_url = await shared
+                if record is not None:
+                    return record, final_url, True
+            task = asyncio.ensure_future(fetch_once(url))
+            in_flight.setdefault(key, task)
+            record, final_url = await task
+            if record is None:
+                return None, None, False
+            if final_url is not None:
+                in_flight.setdefault(final_url, task)
+                if final_url in seen:
+                    return record, final_url, True
+                seen.add(final_url)
+            if on_page is not None:
+                on_page(url, record)
+            return record, final_url, False
+        finally:
+            if progress is not None:
+                progress.update()
+
+    listed: List[str] = []
+    tasks: List[asyncio.Future] = []
+    try:
+        if isinstance(urls, list):
+            listed = urls
+            # El semáforo atiende las descargas en el orden en que se crean
+            scheduled: Dict[int, asyncio.Future] = {}
+            for i in range(len(urls)) if order is None else order:
+                scheduled[i] = asyncio.ensure_future(fetch(urls[i]))
+            tasks = [scheduled[i] for i in range(len(urls))]
+        else:
+            async for url in urls:
+                listed.append(url)
+                tasks.append(asyncio.ensure_future(fetch(url)))
+            if progress is not None:
+                progress.total = len(listed)
+                progress.refresh()
+        outcomes = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        if progress is not None:
+            progress.close()
+
+    # on_page ya se llamó en orden de llegada; el resultado sigue el orden de `urls`
+    result: List[Dict] = []
+    errors: List[str] = []
+    for url, (record, _, skipped) in zip(listed, outcomes):
+        if skipped:
+            continue
+        if record is None:
+            errors.append(url)
+        else:
+            result.append(record)
+    return result, errors
+
+
+async def agenerate_catalog(
+    show_progress: bool = True,
+    concurrency: int = ASYNC_CONCURRENCY,
+    client=None,
+) -> List[Catalog]:
+    """
+    Versión asíncrona de generate_catalog.
+
+    Args:
+        show_progress: Si mostrar barra de progreso (default: True).
+        concurrency: Máximo de páginas procesándose a la vez.
+        client: httpx.AsyncClient a reutilizar (default: se crea uno propio).
+
+    Returns:
+        Lista de Catalog con archivos, en el orden del sitemap.
+
+    Raises:
+        httpx.HTTPError: Si falla la conexión con el sitemap.
+    """
+    result, _ = await agenerate_catalog_with_errors(show_progress, concurrency, client)
+    return [
+        Catalog.model_validate(x)
+        for x in result if x["archivos"] != []
+    ]
+
+
+async def agenerate_catalog_bases_datos(
+    client=None,
+    cache_path: str | Path | None = None,
+    max_workers: int | None = None,
+) -> List[Catalog]:
+    """
+    Versión asíncrona de generate_catalog_bases_datos.
+
+    Args:
+        client: httpx.AsyncClient a reutilizar (default: se crea uno propio).
+        cache_path: Archivo JSON con resultados por tab para reutilizar entre corridas.
+        max_workers: Procesos para los tabs que cambiaron (default: automático).
+
+    Returns:
+        Lista de Catalog con tema "Bases de datos".
+    """
+    if client is None:
+        async with create_async_client() as own_client:
+            return await ascrape_bases_datos(own_client, cache_path=cache_path, max_workers=max_workers)
+    return await ascrape_bases_datos(client, cache_path=cache_path, max_workers=max_workers)
+
+
+def read_catalog(path: str | Path) -> List[Catalog]:
+    """
+    Lee un catálogo guardado con write_catalog.
+
+    Args:
+        path: Archivo JSON del catálogo.
+
+    Returns:
+        Lista de Catalog.
+
+    Raises:
+        FileNotFoundError: Si no existe el archivo.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return [Catalog.model_validate(x) for x in json.load(f)]
+
+
+def write_catalog(path: str | Path, catalog: List[Catalog]) -> None:
+    """
+    Guarda el catálogo en JSON (indentado, UTF-8) de forma atómica.
+
+    Args:
+        path: Archivo de salida; se crean los directorios faltantes.
+        catalog: Lista de Catalog a serializar.
+    """
+    save_json(path, [x.model_dump() for x in catalog], indent=2)
@@ -1,20 +1,307 @@
 """Script CLI para generar el catálogo de datos del INDEC."""
 
 import argparse
-import json
+import asyncio
+import re
 import sys
+import time
+from contextlib import nullcontext
 from pathlib import Path
+from indec_catalog.binary import write_snapshot
 from indec_catalog.catalog import (
-    generate_catalog,
-    generate_catalog_with_errors,
-    generate_catalog_bases_datos,
+    merge_catalogs,
+    read_catalog,
+    retry_failed_pages,
+    write_catalog,
 )
+from indec_catalog.config import (
+    ASYNC_CONCURRENCY,
+    CACHE_DIR,
+    BASES_DATOS_CACHE_FILE,
+    CRAWL_STATE_FILE,
+    DISCOVERY_MAX_DEPTH,
+    DISCOVERY_MAX_PAGES,
+    DISCOVERY_STORE_FILE,
+    FAILURES_FILE,
+    NEGATIVE_CACHE_FILE,
+    PAGE_TIMINGS_FILE,
+    PAGE_HISTORY_FILE,
+    REDIRECTS_FILE,
+    SITEMAP_URL,
+    WATCH_STATE_FILE,
+    WATCH_MIN_INTERVAL,
+    WATCH_MAX_INTERVAL,
+)
+from indec_catalog.deadline import PageHistory, write_stale
+from indec_catalog.failures import FailureQueue
+from indec_catalog.history import CatalogHistory
+from indec_catalog.http import create_async_client
+from indec_catalog.journal import CrawlJournal
+from indec_catalog.negative import NegativeCache
+from indec_catalog.redirects import RedirectMap
 from indec_catalog.models import Catalog
+from indec_catalog.profiling import DEFAULT_TOP, PageProfiler, profile_run
+from indec_catalog.server import make_server
+from indec_catalog.series import load_or_build_series
+from indec_catalog.shard import crawl_shard, merge_shards, parse_shard, write_shard
+from indec_catalog.sitemap import SitemapFilter
+from indec_catalog.sources import (
+    SOURCES,
+    SourceContext,
+    SourceResult,
+    arun_sources,
+    combine_results,
+    run_sources,
+    select_sources,
+)
+from indec_catalog.sqlite_store import CatalogStore
+from indec_catalog.timings import PageTimings
+from indec_catalog.watch import CatalogWatcher
 from typing import List
-import typing
 
-def main():
+
+def watch(argv: List[str]):
+    """Subcomando watch: mantiene el catálogo actualizado con chequeos adaptativos."""
+    parser = argparse.ArgumentParser(
+        prog="indec-catalog watch",
+        description="Monitorea las páginas del INDEC y actualiza el catálogo cuando cambian",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default="data/catalogo_indec.json",
+        help="Archivo de salida (default: data/catalogo_indec.json)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=CACHE_DIR,
+        help=f"Directorio para el estado del monitoreo (default: {CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--sin-bases-datos",
+        action="store_true",
+        help="No monitorear la página Institucional Bases de datos",
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=WATCH_MIN_INTERVAL,
+        help=f"Intervalo mínimo entre chequeos de una página, en segundos (default: {WATCH_MIN_INTERVAL})",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=WATCH_MAX_INTERVAL,
+        help=f"Intervalo máximo entre chequeos de una página, en segundos (default: {WATCH_MAX_INTERVAL})",
+    )
+    args = parser.parse_args(argv)
+
+    watcher = CatalogWatcher(
+        output_path=args.output,
+        state_path=Path(args.cache_dir) / WATCH_STATE_FILE,
+        include_bases_datos=not args.sin_bases_datos,
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        bases_datos_cache=Path(args.cache_dir) / BASES_DATOS_CACHE_FILE,
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.save_state()
+        print("\nMonitoreo detenido por el usuario", file=sys.stderr)
+
+
+def serve(argv: List[str]):
+    """Subcomando serve: expone el catálogo por HTTP con filtros y paginación."""
+    parser = argparse.ArgumentParser(
+        prog="indec-catalog serve",
+        description="Sirve el catálogo por HTTP (/catalogo y /archivos)",
+    )
+    parser.add_argument(
+        "--catalog",
+        "-c",
+        type=str,
+        default="data/catalogo_indec.json",
+        help="Archivo del catálogo a servir (default: data/catalogo_indec.json)",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interfaz (default: 127.0.0.1)")
+    parser.add_argument("--port", "-p", type=int, default=8000, help="Puerto (default: 8000)")
+    args = parser.parse_args(argv)
+
+    try:
+        server = make_server(args.catalog, args.host, args.port)
+    except FileNotFoundError:
+        print(f"Error: no existe el catálogo {args.catalog}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: el catálogo {args.catalog} no es JSON válido: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Sirviendo {args.catalog} en http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServidor detenido por el usuario", file=sys.stderr)
+    finally:
+        server.server_close()
+
+
+def merge(argv: List[str]):
+    """Subcomando merge: combina las salidas parciales de un crawl con --shard."""
+    parser = argparse.ArgumentParser(
+        prog="indec-catalog merge",
+        description="Combina las salidas parciales de --shard en un único catálogo",
+    )
+    parser.add_argument("partials", nargs="+", help="Archivos parciales de cada shard")
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default="data/catalogo_indec.json",
+        help="Archivo de salida (default: data/catalogo_indec.json)",
+    )
+    parser.add_argument(
+        "--errors",
+        "-e",
+        action="store_true",
+        help="Incluir archivo con URLs que fallaron",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        catalog, errors = merge_shards(args.partials)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    output_path = Path(args.output)
+    write_catalog(output_path, catalog)
+    print(f"Catálogo guardado en: {output_path}")
+    if args.errors and errors:
+        errors_path = output_path.with_suffix(".errors.txt")
+        with open(errors_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(errors))
+        print(f"Errores guardados en: {errors_path}")
+    print(f"Total de registros: {len(catalog)}")
+
+
+def history(argv: List[str]):
+    """Subcomando history: consulta el historial de corridas guardado con --historial."""
+    parser = argparse.ArgumentParser(
+        prog="indec-catalog history",
+        description="Lista las corridas del historial, reconstruye el catálogo en una fecha "
+        "o informa cuándo apareció un archivo",
+    )
+    parser.add_argument("path", help="Directorio del historial")
+    parser.add_argument(
+        "--as-of",
+        type=str,
+        metavar="FECHA",
+        help="Reconstruir el catálogo vigente en FECHA (ISO 8601, p. ej. 2025-03-01)",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default="catalogo_historico.json",
+        help="Archivo de salida de --as-of (default: catalogo_historico.json)",
+    )
+    parser.add_argument("--url", type=str, help="Informar primera y última corrida con la URL de un archivo")
+    args = parser.parse_args(argv)
+
+    store = CatalogHistory(args.path)
+    try:
+        if args.as_of:
+            catalog = store.as_of(args.as_of)
+            write_catalog(args.output, catalog)
+            print(f"Catálogo al {args.as_of} guardado en: {args.output} ({len(catalog)} registros)")
+        elif args.url:
+            dates = store.file_dates(args.url)
+            if dates is None:
+                print(f"{args.url} no aparece en el historial")
+            else:
+                print(f"Primera vez: {dates['first_seen']}\nÚltima vez: {dates['last_seen']}")
+        elif not store.snapshots:
+            print(f"El historial {args.path} está vacío")
+        else:
+            for entry in store.snapshots:
+                print(
+                    f"{entry['timestamp']}  {entry['kind']:<8}  {entry['files']} archivos "
+                    f"(+{entry['added']} -{entry['removed']} ~{entry['changed']})"
+                )
+    except (LookupError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def series(argv: List[str]):
+    """Subcomando series: consulta las series de datos (publicaciones periódicas) del catálogo."""
+    parser = argparse.ArgumentParser(
+        prog="indec-catalog series",
+        description="Busca series de datos del catálogo y sus publicaciones por período "
+        "(el índice se guarda junto al catálogo, *.series.json)",
+    )
+    parser.add_argument("query", nargs="?", default="", help="Palabras de la serie (ej: \"eph microdatos txt\")")
+    parser.add_argument(
+        "--catalog",
+        type=str,
+        default="data/catalogo_indec.json",
+        help="Archivo JSON del catálogo (default: data/catalogo_indec.json)",
+    )
+    parser.add_argument("--ultima", action="store_true", help="Mostrar la última publicación de cada serie")
+    parser.add_argument("--desde", type=str, metavar="PERIODO", help="Publicaciones desde PERIODO (ej: 2024, \"T1 2024\")")
+    parser.add_argument("--hasta", type=str, metavar="PERIODO", help="Publicaciones hasta PERIODO, inclusive")
+    args = parser.parse_args(argv)
+
+    try:
+        index = load_or_build_series(args.catalog)
+        for match in index.find(args.query):
+            print(f"{match.label}  ({len(match.releases)} publicaciones, última: {match.releases[-1].period})")
+            if args.ultima:
+                releases = [index.latest(match.key)]
+            elif args.desde or args.hasta:
+                releases = index.between(
+                    match.key, args.desde or (0, 1), args.hasta or (match.releases[-1].start, 1)
+                )
+            else:
+                continue
+            for release in releases:
+                for archivo in release.archivos:
+                    print(f"  {release.period}  {archivo.url}")
+    except FileNotFoundError:
+        print(f"Error: no existe el catálogo {args.catalog}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+async def _acrawl(sources, context: SourceContext, on_source):
+    """Crawl de las fuentes con el pipeline asíncrono sobre un único cliente (HTTP/2 si está disponible)."""
+    async with create_async_client(context.concurrency) as client:
+        return await arun_sources(sources, client, context, on_source)
+
+
+def _report_journal(journal: CrawlJournal | None) -> None:
+    if journal is not None and len(journal):
+        print(f"Progreso guardado en {journal.path}; continuar con --resume", file=sys.stderr)
+
+
+def main(argv: List[str] | None = None):
     """Función principal del CLI."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "watch":
+        return watch(argv[1:])
+    if argv and argv[0] == "serve":
+        return serve(argv[1:])
+    if argv and argv[0] == "merge":
+        return merge(argv[1:])
+    if argv and argv[0] == "history":
+        return history(argv[1:])
+    if argv and argv[0] == "series":
+        return series(argv[1:])
+
     parser = argparse.ArgumentParser(
         description="Genera un catálogo con todas las fuentes de datos del INDEC"
     )
@@ -41,51 +328,407 @@ def main():
         action="store_true",
         help="Incluir también la página Institucional Bases de datos en el catálogo",
     )
+    parser.add_argument(
+        "--fuentes",
+        type=str,
+        metavar="NOMBRES",
+        help="Fuentes a procesar en paralelo, separadas por coma "
+        f"(disponibles: {', '.join(SOURCES)}; default: mapa_sitio)",
+    )
+    parser.add_argument(
+        "--sin-fuente",
+        action="append",
+        default=[],
+        metavar="NOMBRE",
+        help="Deshabilitar una fuente (se puede repetir)",
+    )
+    parser.add_argument(
+        "--descubrimiento-profundidad",
+        type=int,
+        default=DISCOVERY_MAX_DEPTH,
+        metavar="N",
+        help=f"Fuente descubrimiento: saltos máximos desde el MapaSitio (default: {DISCOVERY_MAX_DEPTH})",
+    )
+    parser.add_argument(
+        "--descubrimiento-paginas",
+        type=int,
+        default=DISCOVERY_MAX_PAGES,
+        metavar="N",
+        help=f"Fuente descubrimiento: páginas máximas a visitar (default: {DISCOVERY_MAX_PAGES})",
+    )
+    parser.add_argument(
+        "--tema",
+        type=str,
+        help="Actualizar solo las páginas de este tema del MapaSitio (ej: Sociedad) y combinarlas "
+        "con el catálogo existente en --output",
+    )
+    parser.add_argument(
+        "--subtema",
+        type=str,
+        help="Actualizar solo las páginas de este subtema (ej: \"Trabajo e ingresos\"), como --tema",
+    )
+    parser.add_argument(
+        "--path-regex",
+        type=str,
+        metavar="REGEX",
+        help="Actualizar solo las páginas cuya ruta en el MapaSitio (niveles unidos por \" > \") "
+        "coincide con REGEX, como --tema",
+    )
+    parser.add_argument(
+        "--sqlite",
+        type=str,
+        metavar="PATH",
+        help="Guardar también el catálogo en una base SQLite (con búsqueda FTS5)",
+    )
+    parser.add_argument(
+        "--binary",
+        type=str,
+        metavar="PATH",
+        help="Guardar también un snapshot binario del catálogo (lectura con mmap, ver binary.CatalogSnapshot)",
+    )
+    parser.add_argument(
+        "--historial",
+        type=str,
+        metavar="DIR",
+        help="Agregar la corrida al historial comprimido en DIR (consultas con: indec-catalog history; "
+        "requiere: uv sync --extra history)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        metavar="PATH",
+        help="Perfilar la corrida con cProfile (archivo .pstats) y reportar las páginas más lentas",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_TOP,
+        metavar="N",
+        help=f"Cantidad de páginas en el reporte de --profile (default: {DEFAULT_TOP})",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Usar <lastmod> de sitemap.xml y descargar solo las páginas modificadas desde la última corrida",
+    )
+    parser.add_argument(
+        "--sin-cache-negativo",
+        action="store_true",
+        help="Re-verificar también las páginas que en corridas anteriores no tenían datos "
+        "(normalmente se saltean hasta su re-chequeo periódico)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        metavar="SECONDS",
+        help="Terminar dentro de SECONDS segundos: descargar primero las páginas con más datos o "
+        "cambios recientes y completar las que no entren con la corrida anterior "
+        "(detalle en <output>.stale.json)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reanudar una corrida interrumpida: saltear las páginas ya registradas en el "
+        "diario (<output>.journal.ndjson) y procesar solo el resto",
+    )
+    parser.add_argument(
+        "--shard",
+        type=str,
+        metavar="i/N",
+        help="Procesar solo el shard i de N (partición estable por data-view) y escribir en "
+        "--output una salida parcial; combinarlas con: indec-catalog merge",
+    )
+    parser.add_argument(
+        "--retry-errors",
+        action="store_true",
+        help="Reintentar solo las páginas que fallaron en la corrida anterior (con backoff) "
+        "e incorporarlas al catálogo existente en --output",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Usar el pipeline asíncrono con un cliente compartido, con HTTP/2 multiplexado "
+        "si está instalado (requiere: uv sync --extra async; HTTP/2: --extra http2)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=ASYNC_CONCURRENCY,
+        help=f"Páginas simultáneas con --async (default: {ASYNC_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--sin-orden-por-costo",
+        action="store_true",
+        help="Con --async, no ordenar las descargas por su duración en corridas anteriores "
+        "(las páginas se empiezan a descargar a medida que aparecen en el MapaSitio)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Parsear cada página a medida que se descarga y cortar la lectura al terminar el contenido",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=CACHE_DIR,
+        help=f"Directorio para cachés entre corridas (default: {CACHE_DIR})",
+    )
 
-    args = parser.parse_args()
-    
-    try:
-        if args.errors:
-            catalog_raw, errors = generate_catalog_with_errors(
-                show_progress=not args.no_progress,
+    args = parser.parse_args(argv)
+    if args.deadline is not None and args.deadline < 0:
+        parser.error("--deadline no puede ser negativo")
+    deadline = time.monotonic() + args.deadline if args.deadline is not None else None
+    if args.concurrency < 1:
+        parser.error("--concurrency debe ser al menos 1")
+    if args.use_async and (args.incremental or args.streaming):
+        parser.error("--async no se puede combinar con --incremental ni --streaming")
+    if args.retry_errors and (args.use_async or args.incremental):
+        parser.error("--retry-errors no se puede combinar con --async ni --incremental")
+    if args.shard and (args.use_async or args.incremental or args.retry_errors or args.sqlite):
+        parser.error("--shard no se puede combinar con --async, --incremental, --retry-errors ni --sqlite")
+    # --incremental y --deadline completan con sus propios datos de la corrida anterior
+    if args.resume and (args.incremental or args.retry_errors or args.shard):
+        parser.error("--resume no se puede combinar con --incremental, --retry-errors ni --shard")
+    if deadline is not None and (
+        args.use_async or args.incremental or args.retry_errors or args.shard or args.resume
+    ):
+        parser.error("--deadline no se puede combinar con --async, --incremental, --retry-errors, --shard ni --resume")
+    sitemap_filter = None
+    if args.tema or args.subtema or args.path_regex:
+        if args.incremental or args.retry_errors or args.shard or args.resume or deadline is not None:
+            parser.error(
+                "--tema/--subtema/--path-regex no se pueden combinar con --incremental, --retry-errors, "
+                "--shard, --resume ni --deadline"
             )
-            catalog = [Catalog.model_validate(x) for x in catalog_raw]
-            if args.incluir_bases_datos:
-                catalog = catalog + generate_catalog_bases_datos()
-
-            output_path = Path(args.output)
-            Path(output_path.parent).mkdir(parents=True, exist_ok=True)
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump([x.model_dump() for x in catalog], f, indent=2, ensure_ascii=False)
-            print(f"Catálogo guardado en: {output_path}")
-
-            if errors:
-                errors_path = output_path.with_suffix(".errors.txt")
-                with open(errors_path, "w", encoding="utf-8") as f:
-                    f.write("\n".join(errors))
-                print(f"Errores guardados en: {errors_path}")
-                print(f"Total de errores: {len(errors)}")
+        try:
+            sitemap_filter = SitemapFilter(args.tema, args.subtema, args.path_regex)
+        except re.error as e:
+            parser.error(f"--path-regex inválida: {e}")
+    try:
+        shard = parse_shard(args.shard) if args.shard else None
+        if args.fuentes:
+            names = [name.strip() for name in args.fuentes.split(",") if name.strip()]
         else:
-            catalog = typing.cast(List[Catalog], generate_catalog(
-                show_progress=not args.no_progress,
-            ))
-            if args.incluir_bases_datos:
-                catalog = catalog + generate_catalog_bases_datos()
-
-            Path("data").mkdir(parents=True, exist_ok=True)
-            output_path = Path(args.output)
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump([x.model_dump() for x in catalog], f, indent=2, ensure_ascii=False)
-            print(f"Catálogo guardado en: {output_path}")
+            names = [s.name for s in SOURCES.values() if s.default]
+        if args.incluir_bases_datos:
+            names.append("bases_datos")
+        sources = select_sources(names, exclude=args.sin_fuente)
+    except ValueError as e:
+        parser.error(str(e))
+    if not sources:
+        parser.error("No quedó ninguna fuente habilitada")
+    if shard is not None and [s.name for s in sources if s.name != "bases_datos"] != ["mapa_sitio"]:
+        parser.error("--shard solo admite las fuentes mapa_sitio y bases_datos")
+    if sitemap_filter is not None and [s.name for s in sources] != ["mapa_sitio"]:
+        parser.error("--tema/--subtema/--path-regex solo se aplican a la fuente mapa_sitio")
+    # El descubrimiento sigue los enlaces de cada página: no se puede reanudar salteando páginas
+    discovering = any(s.name == "descubrimiento" for s in sources)
+    if args.resume and discovering:
+        parser.error("--resume no se puede usar con la fuente descubrimiento")
+    include_bases_datos = any(s.name == "bases_datos" for s in sources)
+    bases_datos_cache = Path(args.cache_dir) / BASES_DATOS_CACHE_FILE
+
+    output_path = Path(args.output)
+    journal_path = output_path.with_suffix(".journal.ndjson")
+    if args.resume and not journal_path.exists():
+        parser.error(f"--resume: no hay una corrida interrumpida para reanudar ({journal_path} no existe)")
+    # El diario se usa en los crawls completos (sincrónico o --async), los únicos que --resume puede reanudar
+    journaled = not (
+        args.incremental or args.retry_errors or args.shard or discovering
+        or deadline is not None or sitemap_filter is not None
+    )
+    store = CatalogStore(args.sqlite) if args.sqlite else None
+    journal = CrawlJournal(journal_path, resume=args.resume) if journaled else None
+
+    page_history = PageHistory(Path(args.cache_dir) / PAGE_HISTORY_FILE)
+
+    def on_page(url: str, record: dict) -> None:
+        page_history.record(url, record)
+        if journal is not None:
+            journal.append(url, record)
+        if store is not None:
+            store.add_page(url, record)
+
+    profiler = PageProfiler() if args.profile else None
+    failures = FailureQueue(Path(args.cache_dir) / FAILURES_FILE)
+    redirects = RedirectMap(Path(args.cache_dir) / REDIRECTS_FILE)
+    negative = NegativeCache(Path(args.cache_dir) / NEGATIVE_CACHE_FILE, refresh=args.sin_cache_negativo)
+
+    timings = PageTimings(Path(args.cache_dir) / PAGE_TIMINGS_FILE)
+
+    def on_stats(url: str, stats: dict) -> None:
+        failures.record(url, stats)
+        timings.record(url, stats)
+        if profiler is not None:
+            profiler.record(url, stats)
+
+    def on_source(result: SourceResult) -> None:
+        # Las fuentes de varias páginas ya registraron cada una con on_page
+        if result.url is None:
+            return
+        if journal is not None and result.url not in journal:
+            journal.append(result.url, [c.model_dump() for c in result.records])
+        # Último resultado conocido, con el que --deadline completa la fuente si no entra en el tiempo
+        if result.records and not result.stale:
+            page_history.record(result.url, [c.model_dump() for c in result.records])
+        if store is not None:
+            store.add_records(result.records, page_url=result.url)
+        if profiler is not None and result.stats:
+            profiler.record(result.url, result.stats)
+
+    try:
+        show_progress = not args.no_progress
+        if args.resume:
+            print(f"Reanudando desde {journal_path}: {len(journal)} páginas ya procesadas")
+        if args.retry_errors and not failures:
+            print("No hay páginas fallidas pendientes de reintento")
+            return
+
+        with profile_run(args.profile) if args.profile else nullcontext():
+            if shard is not None:
+                failures.reset()
+                partial = crawl_shard(
+                    *shard,
+                    include_bases_datos=include_bases_datos,
+                    show_progress=show_progress,
+                    on_page=on_page,
+                    on_stats=on_stats,
+                    streaming=args.streaming,
+                    bases_datos_cache=bases_datos_cache,
+                    redirects=redirects,
+                    negative=negative,
+                )
+                write_shard(output_path, partial)
+                failures.save()
+                redirects.save()
+                negative.save()
+                page_history.save()
+                timings.save()
+                print(f"Shard {args.shard} guardado en: {output_path} ({len(partial['pages'])} páginas)")
+                return
+            stale = None
+            if args.retry_errors:
+                existing = read_catalog(output_path)
+                pages, errors = retry_failed_pages(
+                    failures.urls(),
+                    show_progress=show_progress,
+                    on_page=on_page,
+                    on_stats=on_stats,
+                )
+                catalog = merge_catalogs(
+                    existing,
+                    [Catalog.model_validate(record) for _, record in pages if record["archivos"] != []],
+                )
+            else:
+                # Una actualización parcial no sabe nada de las páginas fuera del filtro
+                if sitemap_filter is None:
+                    failures.reset()
+                context = SourceContext(
+                    show_progress=show_progress,
+                    on_page=on_page,
+                    on_stats=on_stats,
+                    streaming=args.streaming,
+                    done=journal.entries if journal is not None else None,
+                    redirects=redirects,
+                    concurrency=args.concurrency,
+                    incremental_state=Path(args.cache_dir) / CRAWL_STATE_FILE if args.incremental else None,
+                    bases_datos_cache=bases_datos_cache,
+                    deadline=deadline,
+                    history=page_history,
+                    discovery_store=Path(args.cache_dir) / DISCOVERY_STORE_FILE,
+                    discovery_depth=args.descubrimiento_profundidad,
+                    discovery_pages=args.descubrimiento_paginas,
+                    negative=negative,
+                    sitemap_filter=sitemap_filter,
+                    timings=None if args.sin_orden_por_costo else timings,
+                )
+                if args.use_async:
+                    results = asyncio.run(_acrawl(sources, context, on_source))
+                else:
+                    results = run_sources(sources, context, on_source)
+                catalog, errors = combine_results(results)
+                stale = [url for result in results for url in result.stale]
+                if sitemap_filter is not None:
+                    print(f"Registros actualizados: {len(catalog)}")
+                    if output_path.exists():
+                        catalog = merge_catalogs(read_catalog(output_path), catalog)
+
+        write_catalog(output_path, catalog)
+        if journal is not None:
+            journal.discard()
+        # --retry-errors solo toca las páginas fallidas: los registros desactualizados siguen igual
+        if stale is not None:
+            write_stale(output_path.with_suffix(".stale.json"), stale, page_history)
+        failures.save()
+        redirects.save()
+        page_history.save()
+        negative.save()
+        timings.save()
+        print(f"Catálogo guardado en: {output_path}")
+        if stale:
+            print(f"Páginas completadas con datos de corridas anteriores: {len(stale)} "
+                  f"(detalle en {output_path.with_suffix('.stale.json')})")
+        if store is not None:
+            store.sync(catalog)
+            print(f"Base SQLite actualizada: {args.sqlite}")
+        if args.binary:
+            write_snapshot(args.binary, catalog)
+            print(f"Snapshot binario guardado en: {args.binary}")
+        if args.historial:
+            entry = CatalogHistory(args.historial).append(catalog)
+            print(
+                f"Corrida agregada al historial {args.historial}: +{entry['added']} "
+                f"-{entry['removed']} ~{entry['changed']} archivos"
+            )
+
+        if args.errors and errors:
+            errors_path = output_path.with_suffix(".errors.txt")
+            with open(errors_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(errors))
+            print(f"Errores guardados en: {errors_path}")
+            print(f"Total de errores: {len(errors)}")
 
         print(f"Total de registros: {len(catalog)}")
+        if SITEMAP_URL in errors:
+            print(
+                "Aviso: la descarga del MapaSitio se cortó; el catálogo incluye solo las páginas "
+                "listadas hasta ese punto",
+                file=sys.stderr,
+            )
+        if negative.skipped:
+            print(f"Páginas sin datos salteadas (caché negativa): {negative.skipped}")
+        if timings.report is not None:
+            report = timings.report
+            print(
+                f"Makespan con {report['workers']} descargas simultáneas ({report['pages']} páginas): "
+                f"previsto {report['predicted']:.1f}s (orden del MapaSitio: {report['sitemap_order']:.1f}s), "
+                f"real {report['actual']:.1f}s"
+            )
+        if failures:
+            detail = ", ".join(f"{kind}: {n}" for kind, n in sorted(failures.summary().items()))
+            print(f"Páginas fallidas: {len(failures)} ({detail}); reintentar con --retry-errors")
+
+        if profiler is not None:
+            report = profiler.report(args.profile_top)
+            report_path = Path(args.profile).with_suffix(".txt")
+            report_path.write_text(report + "\n", encoding="utf-8")
+            print(report)
+            print(f"Perfil guardado en: {args.profile} (reporte en {report_path})")
         
     except KeyboardInterrupt:
         print("\nOperación cancelada por el usuario", file=sys.stderr)
+        _report_journal(journal)
         sys.exit(1)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
+        _report_journal(journal)
         sys.exit(1)
+    finally:
+        if journal is not None:
+            journal.close()
+        if store is not None:
+            store.close()
 
 
 if __name__ == "__main__":
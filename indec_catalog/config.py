@@ -2,9 +2,66 @@
 
 BASE_URL = "https://www.indec.gob.ar"
 SITEMAP_URL = "https://www.indec.gob.ar/Institucional/Indec/MapaSitio"
+SITEMAP_XML_URL = "https://www.indec.gob.ar/sitemap.xml"
 BASES_DATOS_URL = "https://www.indec.gob.ar/Institucional/Indec/BasesDeDatos"
 DEFAULT_SITEMAP_REGEX = "Nivel4"
 HTTP_TIMEOUT = 30  # Timeout en segundos para peticiones HTTP
+ASYNC_CONCURRENCY = 8  # Peticiones simultáneas en el pipeline asíncrono
+CACHE_DIR = ".cache/indec_catalog"  # Estado persistente entre corridas
+BASES_DATOS_CACHE_FILE = "bases_datos_tabs.json"
+CRAWL_STATE_FILE = "crawl_state.json"
+WATCH_STATE_FILE = "watch_state.json"
+FAILURES_FILE = "failures.json"
+REDIRECTS_FILE = "redirects.json"
+PAGE_HISTORY_FILE = "page_history.json"
+DISCOVERY_STORE_FILE = "discovery.db"
+NEGATIVE_CACHE_FILE = "negative_cache.json"
+PAGE_TIMINGS_FILE = "page_timings.json"
+REDIRECT_TTL = 7 * 24 * 60 * 60  # Vigencia en segundos de una redirección conocida
+
+# Crawl con tiempo límite (--deadline): duración estimada de una página antes de
+# medir ninguna, en segundos, y antigüedad máxima de un cambio "reciente", en días
+DEADLINE_PAGE_ESTIMATE = 2.0
+DEADLINE_RECENT_DAYS = 30
+
+# Historial del catálogo: corridas entre keyframes completos y nivel de compresión zstd
+HISTORY_KEYFRAME_INTERVAL = 30
+HISTORY_ZSTD_LEVEL = 10
+
+# Crawler de descubrimiento (fuente "descubrimiento"): profundidad y páginas máximas,
+# segundos entre peticiones a un host, vigencia de una visita y tamaño del filtro de Bloom
+DISCOVERY_MAX_DEPTH = 3
+DISCOVERY_MAX_PAGES = 2000
+DISCOVERY_DELAY = 0.5
+DISCOVERY_REVISIT = 7 * 24 * 60 * 60
+DISCOVERY_BLOOM_CAPACITY = 1_000_000
+DISCOVERY_BLOOM_ERROR_RATE = 1e-4
+DISCOVERY_TEMA = "Otras secciones"  # Tema de las páginas sin ruta de navegación
+
+# Caché negativa: segundos hasta re-verificar una página sin datos, con jitter relativo
+NEGATIVE_TTL = 7 * 24 * 60 * 60
+NEGATIVE_JITTER = 0.25
+
+# Planificación por costo del crawl asíncrono: peso de la última medición en el
+# promedio móvil de cada página y duración supuesta sin ninguna medición, en segundos
+TIMINGS_SMOOTHING = 0.5
+TIMINGS_DEFAULT_ESTIMATE = 2.0
+
+# Reintentos de páginas fallidas (--retry-errors): intentos y espera base en segundos
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 2.0
+
+# Fetch en streaming: tamaño de chunk y tags que marcan el fin del contenido
+STREAM_CHUNK_SIZE = 16 * 1024
+STREAM_STOP_TAGS = ("footer",)
+
+# Links del MapaSitio leídos por adelantado mientras se procesan las páginas
+SITEMAP_PREFETCH_SIZE = 1024
+
+# Modo watch: intervalos de chequeo por página, en segundos
+WATCH_MIN_INTERVAL = 15 * 60
+WATCH_INITIAL_INTERVAL = 6 * 60 * 60
+WATCH_MAX_INTERVAL = 7 * 24 * 60 * 60
 
 DATA_EXTENSIONS = (
     ".csv",
@@ -21,3 +78,38 @@ DATA_EXTENSIONS = (
     ".sav",
 )
 
+
+# Jerarquía de la página Bases de datos: expresiones XPath, relativas a cada
+# div.tabContent, que seleccionan los títulos de cada nivel. Se compilan una
+# vez y se evalúan en bloque por tab; cada enlace toma el último título de cada
+# nivel que lo precede en el documento.
+_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_LOWER = "abcdefghijklmnopqrstuvwxyz"
+BASES_DATOS_LEVELS = {
+    # L1 (subtema): h3–h6 y <p> con clase fontsize20/fontsize24/font-color-violeta o style font-size:20px
+    "subtema": (
+        "descendant-or-self::*[self::h3 or self::h4 or self::h5 or self::h6 or self::p["
+        "contains(@class, 'fontsize20') or contains(@class, 'fontsize24') "
+        "or contains(@class, 'font-color-violeta') "
+        f"or (contains(translate(@style, '{_UPPER}', '{_LOWER}'), 'font-size') "
+        f"and contains(translate(@style, '{_UPPER}', '{_LOWER}'), '20px'))]]"
+    ),
+    # L2 (agrupamiento): div.sub_enc_salud_tit ("Documentos metodológicos", "Bases de microdatos", ...)
+    "agrupamiento": "descendant-or-self::div[contains(concat(' ', normalize-space(@class), ' '), ' sub_enc_salud_tit ')]",
+    # L3 (detalle, se agrega al agrupamiento): último <strong>, p. ej. "Tercer trimestre 2025."
+    "detalle": "descendant-or-self::strong",
+}
+# Excepciones por id de tab:
+# - "principal": enlaces dentro de estos bloques toman como subtema el primer L1 del tab.
+# - "cadena" / "contenedor": para el resto, agrupamiento = títulos ancestros del enlace
+#   ("cadena") más el texto previo a la <ul> del "contenedor" que lo agrupa.
+BASES_DATOS_TAB_RULES = {
+    # Mercado laboral: los primeros 5 li.enlaces_li son de la EPH; luego, otras
+    # encuestas con div.enlace_li_tit dentro de li.a-color2
+    "tab1": {
+        "principal": "(descendant::li[contains(concat(' ', normalize-space(@class), ' '), ' enlaces_li ')])"
+        "[position() <= 5]",
+        "cadena": "descendant::div[contains(concat(' ', normalize-space(@class), ' '), ' enlace_li_tit ')]",
+        "contenedor": "descendant::li[contains(concat(' ', normalize-space(@class), ' '), ' a-color2 ')]",
+    },
+}
@@ -0,0 +1,204 @@
+"""Crawl con tiempo límite: frontera priorizada y relleno con datos de la corrida anterior."""
+
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import requests
+
+from indec_catalog.cache import content_fingerprint, load_json, save_json
+from indec_catalog.catalog import _fetch_pages
+from indec_catalog.config import BASE_URL, DEADLINE_PAGE_ESTIMATE, DEADLINE_RECENT_DAYS
+from indec_catalog.negative import NegativeCache
+from indec_catalog.redirects import RedirectMap
+from indec_catalog.sitemap import build_url, extract_sitemap_urls
+
+
+class PageHistory:
+    """
+    Último resultado conocido de cada página Nivel4, persistido en JSON.
+
+    Por página guarda el registro extraído (o la lista de registros, en las
+    fuentes de una sola página como Bases de datos), la cantidad de archivos,
+    cuándo se descargó por última vez y cuándo cambió su contenido por última
+    vez. Su método record sirve como callback `on_page` de cualquier crawl.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else None
+        self.entries: Dict[str, Dict] = (load_json(self.path, {}) if self.path else None) or {}
+
+    def record(self, url: str, record: Dict | List[Dict]) -> None:
+        """Registra el resultado (un registro o una lista) de una página descargada."""
+        now = datetime.now(timezone.utc).isoformat()
+        records = record if isinstance(record, list) else [record]
+        previous = self.entries.get(url)
+        fingerprint = content_fingerprint(record)
+        changed = previous.get("changed") if previous else None
+        if previous is not None and previous["fingerprint"] != fingerprint:
+            changed = now
+        self.entries[url] = {
+            "record": record,
+            "files": sum(len(r.get("archivos", [])) for r in records),
+            "fingerprint": fingerprint,
+            "fetched": now,
+            "changed": changed,
+        }
+
+    def save(self) -> None:
+        if self.path is not None:
+            save_json(self.path, self.entries)
+
+
+def prioritize(urls: List[str], history: PageHistory, now: datetime | None = None) -> List[str]:
+    """
+    Ordena la frontera del crawl por prioridad.
+
+    Primero las páginas sin historial (no hay datos previos con qué
+    reemplazarlas), después las que cambiaron en los últimos
+    DEADLINE_RECENT_DAYS días y por último el resto; dentro de cada grupo, las
+    de más archivos primero. Los empates conservan el orden de `urls`.
+
+    Args:
+        urls: URLs en el orden del MapaSitio.
+        history: Historial de corridas anteriores.
+        now: Fecha de referencia (default: ahora).
+
+    Returns:
+        Las mismas URLs, en orden de prioridad.
+    """
+    now = now or datetime.now(timezone.utc)
+    recent = now - timedelta(days=DEADLINE_RECENT_DAYS)
+
+    def key(url: str) -> Tuple[int, int, int]:
+        entry = history.entries.get(url)
+        if entry is None:
+            return 0, 0, 0
+        changed = entry.get("changed")
+        is_recent = changed is not None and datetime.fromisoformat(changed) >= recent
+        return 1, 0 if is_recent else 1, -entry["files"]
+
+    return sorted(urls, key=key)
+
+
+def fits_before(
+    deadline: float,
+    estimate: float = DEADLINE_PAGE_ESTIMATE,
+    clock: Callable[[], float] = time.monotonic,
+) -> bool:
+    """
+    Si una descarga que se estima en `estimate` segundos termina antes de `deadline`.
+
+    Args:
+        deadline: Instante límite, en la escala de `clock`.
+        estimate: Duración estimada de la descarga.
+        clock: Reloj monotónico (inyectable para tests).
+    """
+    return clock() + estimate <= deadline
+
+
+def generate_catalog_deadline(
+    deadline: float,
+    history: PageHistory,
+    show_progress: bool = True,
+    on_page: Callable[[str, Dict], None] | None = None,
+    on_stats: Callable[[str, Dict], None] | None = None,
+    streaming: bool = False,
+    redirects: RedirectMap | None = None,
+    clock: Callable[[], float] = time.monotonic,
+    negative: NegativeCache | None = None,
+    session: requests.Session | None = None,
+) -> Tuple[List[Dict], List[str], List[str]]:
+    """
+    Genera el catálogo dentro de un tiempo límite.
+
+    Las páginas se descargan en el orden de prioritize. Antes de cada una se
+    estima su duración con el promedio de las ya descargadas (al principio,
+    DEADLINE_PAGE_ESTIMATE); si no entra en el tiempo restante no se inician
+    más descargas. Las páginas que quedaron sin descargar se completan con su
+    último resultado del historial y se informan como desactualizadas.
+
+    Args:
+        deadline: Instante límite, en la escala de `clock`.
+        history: Historial de corridas anteriores.
+        show_progress: Si mostrar barra de progreso.
+        on_page: Función llamada con (url, datos del tema) por cada página exitosa.
+        on_stats: Función llamada con (url, métricas) por cada página descargada.
+        streaming: Usar fetch_tema_data_streaming en lugar de fetch_tema_data.
+        redirects: Mapa de redirecciones entre corridas (ver RedirectMap).
+        clock: Reloj monotónico (inyectable para tests).
+        negative: Caché de páginas sin datos (ver NegativeCache).
+        session: Sesión HTTP compartida (default: una petición sin sesión).
+
+    Returns:
+        Tupla con (lista de diccionarios de temas en el orden del MapaSitio,
+        URLs con errores, URLs completadas con datos del historial).
+    """
+    links = extract_sitemap_urls(session=session)
+    urls = [build_url(link, BASE_URL) for link in links]
+    frontier = prioritize(urls, history)
+
+    elapsed: List[float] = []
+    issued = 0
+
+    def collect(url: str, stats: Dict) -> None:
+        elapsed.append(stats["elapsed"])
+        if on_stats is not None:
+            on_stats(url, stats)
+
+    def stop() -> bool:
+        nonlocal issued
+        estimate = sum(elapsed) / len(elapsed) if elapsed else DEADLINE_PAGE_ESTIMATE
+        if not fits_before(deadline, estimate, clock):
+            return True
+        issued += 1
+        return False
+
+    pages, errors = _fetch_pages(
+        frontier, show_progress, on_page, collect, streaming, redirects, stop, negative, session
+    )
+    fetched = dict(pages)
+    unfetched = set(frontier[issued:])
+
+    result: List[Dict] = []
+    stale: List[str] = []
+    for url in urls:
+        if url in fetched:
+            result.append(fetched[url])
+        elif url in unfetched and url in history.entries:
+            result.append(history.entries[url]["record"])
+            stale.append(url)
+    return result, errors, stale
+
+
+def write_stale(path: str | Path, stale: List[str], history: PageHistory) -> None:
+    """
+    Guarda el detalle de los registros desactualizados de un catálogo.
+
+    Por cada registro completado desde el historial se informan su página, su
+    jerarquía y la fecha de la última descarga de la página. Si no hay
+    ninguno, se borra el archivo.
+
+    Args:
+        path: Archivo JSON (junto al catálogo).
+        stale: URLs completadas con datos del historial.
+        history: Historial del que salieron esos datos.
+    """
+    path = Path(path)
+    if not stale:
+        path.unlink(missing_ok=True)
+        return
+    entries = []
+    for url in stale:
+        entry = history.entries[url]
+        records = entry["record"] if isinstance(entry["record"], list) else [entry["record"]]
+        for record in records:
+            entries.append({
+                "url": url,
+                "tema": record.get("tema"),
+                "subtema": record.get("subtema"),
+                "agrupamiento": record.get("agrupamiento"),
+                "fetched": entry["fetched"],
+            })
+    save_json(path, {"stale": entries}, indent=2)
@@ -0,0 +1,367 @@
+"""Crawler de descubrimiento: recorre enlaces internos para encontrar datos fuera del MapaSitio."""
+
+import hashlib
+import json
+import math
+import sqlite3
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+from bs4 import BeautifulSoup
+from tqdm import tqdm
+
+from indec_catalog.config import (
+    BASE_URL,
+    DISCOVERY_BLOOM_CAPACITY,
+    DISCOVERY_BLOOM_ERROR_RATE,
+    DISCOVERY_DELAY,
+    DISCOVERY_MAX_DEPTH,
+    DISCOVERY_MAX_PAGES,
+    DISCOVERY_REVISIT,
+    DISCOVERY_TEMA,
+    HTTP_TIMEOUT,
+    SITEMAP_URL,
+)
+from indec_catalog.failures import classify_exception
+from indec_catalog.parser import extract_data_links, parse_tema_info
+from indec_catalog.sitemap import build_url, parse_sitemap_html
+from indec_catalog.sqlite_store import canonical_url
+
+# Extensiones de páginas HTML que se siguen; las rutas sin extensión también
+PAGE_EXTENSIONS = (".html", ".htm", ".asp", ".aspx", ".php")
+
+
+class BloomFilter:
+    """
+    Conjunto probabilístico de tamaño fijo: sin falsos negativos y con una tasa
+    de falsos positivos acotada por `error_rate` hasta `capacity` elementos.
+    """
+
+    def __init__(self, capacity: int = DISCOVERY_BLOOM_CAPACITY, error_rate: float = DISCOVERY_BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value: str) -> None:
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class VisitStore:
+    """
+    Páginas visitadas por el crawler, persistidas en SQLite.
+
+    Por página guarda cuándo se visitó, el registro extraído (si tiene
+    archivos de datos) y sus enlaces salientes, así una corrida posterior
+    reutiliza las visitas recientes sin volver a descargarlas y sigue
+    expandiendo la frontera desde ellas.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path) if path is not None else ":memory:")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS visits ("
+            "url TEXT PRIMARY KEY, visited_at TEXT NOT NULL, record TEXT, links TEXT NOT NULL)"
+        )
+
+    def get(self, url: str, max_age: float | None) -> Tuple[Dict | None, List[str]] | None:
+        """Registro y enlaces de una visita de hace menos de `max_age` segundos (None: cualquiera), o None."""
+        row = self.conn.execute("SELECT visited_at, record, links FROM visits WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(row[0])
+        if max_age is not None and age > timedelta(seconds=max_age):
+            return None
+        return (json.loads(row[1]) if row[1] else None), json.loads(row[2])
+
+    def put(self, url: str, record: Dict | None, links: List[str]) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO visits VALUES (?, ?, ?, ?)",
+            (
+                url,
+                datetime.now(timezone.utc).isoformat(),
+                json.dumps(record, ensure_ascii=False) if record else None,
+                json.dumps(links),
+            ),
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class Politeness:
+    """Respeta robots.txt y un intervalo mínimo entre peticiones a un mismo host."""
+
+    def __init__(
+        self,
+        delay: float = DISCOVERY_DELAY,
+        user_agent: str = "*",
+        respect_robots: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        session: requests.Session | None = None,
+    ):
+        self.delay = delay
+        self.user_agent = user_agent
+        self.respect_robots = respect_robots
+        self.clock = clock
+        self.sleep = sleep
+        self.session = session
+        self._last: Dict[str, float] = {}
+        self._robots: Dict[str, RobotFileParser | None] = {}
+
+    def allowed(self, url: str) -> bool:
+        """True si robots.txt del host permite `url` (o si no se pudo leer)."""
+        if not self.respect_robots:
+            return True
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        if host not in self._robots:
+            robots = None
+            try:
+                self.wait(url)
+                response = (self.session or requests).get(f"{host}/robots.txt", timeout=HTTP_TIMEOUT)
+                if response.status_code == 200:
+                    robots = RobotFileParser()
+                    robots.parse(response.text.splitlines())
+            except requests.RequestException:
+                pass
+            self._robots[host] = robots
+        robots = self._robots[host]
+        return robots is None or robots.can_fetch(self.user_agent, url)
+
+    def wait(self, url: str) -> None:
+        """Espera lo necesario antes de pedir `url` y registra la petición."""
+        host = urlsplit(url).netloc
+        last = self._last.get(host)
+        if last is not None:
+            remaining = last + self.delay - self.clock()
+            if remaining > 0:
+                self.sleep(remaining)
+        self._last[host] = self.clock()
+
+
+def _is_page(url: str, hosts: Tuple[str, ...]) -> bool:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or parts.netloc.lower() not in hosts:
+        return False
+    last = parts.path.rsplit("/", 1)[-1].lower()
+    return "." not in last or last.endswith(PAGE_EXTENSIONS)
+
+
+def _page_record(soup: BeautifulSoup, url: str) -> Dict:
+    """Registro de una página: jerarquía de su ruta de navegación o, si no tiene, de su URL."""
+    info = parse_tema_info(soup)
+    if info is None:
+        segments = [unquote(s) for s in urlsplit(url).path.split("/") if s]
+        info = {
+            "tema": DISCOVERY_TEMA,
+            "subtema": segments[0] if segments else "Inicio",
+            "agrupamiento": " > ".join(segments[1:]) or urlsplit(url).path or "/",
+        }
+    info["archivos"] = extract_data_links(soup, BASE_URL)
+    return info
+
+
+def discover(
+    seeds: List[str],
+    store: VisitStore | None = None,
+    exclude: Iterable[str] = (),
+    max_depth: int = DISCOVERY_MAX_DEPTH,
+    max_pages: int = DISCOVERY_MAX_PAGES,
+    hosts: Iterable[str] | None = None,
+    politeness: Politeness | None = None,
+    revisit: float = DISCOVERY_REVISIT,
+    show_progress: bool = True,
+    on_page: Callable[[str, Dict], None] | None = None,
+    on_stats: Callable[[str, Dict], None] | None = None,
+    session: requests.Session | None = None,
+    stop: Callable[[], bool] | None = None,
+) -> Tuple[List[Dict], List[str], Dict]:
+    """
+    Recorre en anchura los enlaces internos a partir de `seeds` y extrae datos de cada página.
+
+    La frontera se deduplica con un BloomFilter (memoria acotada aunque se
+    descubran muchas URLs) y las visitas de menos de `revisit` segundos se
+    toman de `store` sin volver a descargarse. Solo se siguen páginas HTML de
+    los hosts permitidos, hasta `max_depth` saltos desde las semillas y
+    `max_pages` páginas en total. Cada archivo de datos se informa una sola vez,
+    en la primera página (en orden de recorrido) que lo enlaza.
+
+    Args:
+        seeds: URLs iniciales (profundidad 0).
+        store: Visitas persistidas entre corridas (default: solo en memoria).
+        exclude: Páginas que se recorren pero cuyos archivos ya cubre otra
+            fuente (p. ej. las Nivel4 del MapaSitio): no generan registros y
+            sus archivos no se repiten en otras páginas.
+        max_depth: Profundidad máxima.
+        max_pages: Máximo de páginas visitadas (descargadas o tomadas de `store`).
+        hosts: Hosts permitidos (default: el de BASE_URL).
+        politeness: robots.txt e intervalo entre peticiones (default: Politeness() sobre `session`).
+        revisit: Antigüedad en segundos a partir de la cual se vuelve a descargar una página.
+        show_progress: Si mostrar barra de progreso.
+        on_page: Función llamada con (url, registro) por cada registro del
+            resultado, una vez aplicadas las exclusiones.
+        on_stats: Función llamada con (url, métricas) por cada página
+            descargada: 'fetch_time', 'parse_time', 'bytes', 'links',
+            'final_url' y 'outcome', o la clasificación del error.
+        session: Sesión HTTP compartida (default: una petición sin sesión).
+        stop: Función consultada antes de cada descarga; una vez que devuelve
+            True (p. ej. al agotarse el tiempo de --deadline) no se descarga
+            nada más y el recorrido sigue solo con las visitas de `store`,
+            sin importar su antigüedad.
+
+    Returns:
+        Tupla con (registros con archivos nuevos en orden de recorrido, URLs
+        con errores, métricas: 'visited', 'fetched', 'cached', 'skipped_robots',
+        'skipped_deadline' y 'errors' por clase de error).
+    """
+    store = store if store is not None else VisitStore()
+    politeness = politeness if politeness is not None else Politeness(session=session)
+    hosts = tuple(h.lower() for h in (hosts or (urlsplit(BASE_URL).netloc,)))
+    exclude = {canonical_url(url) for url in exclude}
+
+    queued = BloomFilter()
+    frontier: deque = deque()
+    for seed in seeds:
+        seed = canonical_url(seed)
+        if seed not in queued:
+            queued.add(seed)
+            frontier.append((seed, 0))
+
+    pages: List[Tuple[str, Dict]] = []
+    errors: List[str] = []
+    stats: Dict = {
+        "visited": 0, "fetched": 0, "cached": 0, "skipped_robots": 0, "skipped_deadline": 0, "errors": {}
+    }
+    stopped = False
+    progress = tqdm(total=max_pages, desc="Descubriendo páginas") if show_progress else None
+
+    while frontier and stats["visited"] < max_pages:
+        url, depth = frontier.popleft()
+        cached = store.get(url, revisit)
+        if cached is None and (stopped or (stop is not None and stop())):
+            stopped = True
+            cached = store.get(url, None)
+            if cached is None:
+                stats["skipped_deadline"] += 1
+                continue
+        if cached is not None:
+            record, links = cached
+            stats["cached"] += 1
+        elif not politeness.allowed(url):
+            stats["skipped_robots"] += 1
+            continue
+        else:
+            politeness.wait(url)
+            page_stats: Dict = {}
+            start = time.perf_counter()
+            try:
+                # stream=True: el cuerpo de un archivo enlazado (PDF, ZIP...) no se descarga, solo los headers
+                response = (session or requests).get(
+                    url, timeout=HTTP_TIMEOUT, allow_redirects=True, stream=True
+                )
+                try:
+                    response.raise_for_status()
+                    is_html = "html" in response.headers.get("Content-Type", "html")
+                    content = response.content if is_html else b""
+                finally:
+                    response.close()
+            except requests.RequestException as e:
+                errors.append(url)
+                page_stats.update(classify_exception(e))
+                page_stats["elapsed"] = time.perf_counter() - start
+                stats["errors"][page_stats["outcome"]] = stats["errors"].get(page_stats["outcome"], 0) + 1
+                if on_stats is not None:
+                    on_stats(url, page_stats)
+                continue
+            page_stats["fetch_time"] = time.perf_counter() - start
+            page_stats["bytes"] = len(content)
+            page_stats["final_url"] = response.url or url
+            record, links = None, []
+            parse_start = time.perf_counter()
+            if is_html:
+                soup = BeautifulSoup(content, "html.parser")
+                record = _page_record(soup, url)
+                final_url = response.url or url
+                queued.add(canonical_url(final_url))
+                links = sorted({
+                    canonical_url(urljoin(final_url, a["href"].strip()))
+                    for a in soup.find_all("a", href=True)
+                    if not a["href"].strip().lower().startswith(("mailto:", "javascript:", "tel:"))
+                })
+            store.put(url, record if record and record["archivos"] else None, links)
+            stats["fetched"] += 1
+            page_stats["parse_time"] = time.perf_counter() - parse_start
+            page_stats["links"] = len(record["archivos"]) if record else 0
+            page_stats["outcome"] = "ok"
+            page_stats["elapsed"] = time.perf_counter() - start
+            if on_stats is not None:
+                on_stats(url, page_stats)
+        stats["visited"] += 1
+        if progress is not None:
+            progress.update()
+
+        if record and record["archivos"]:
+            pages.append((url, record))
+        if depth < max_depth:
+            for link in links:
+                if link not in queued and _is_page(link, hosts):
+                    queued.add(link)
+                    frontier.append((link, depth + 1))
+
+    if progress is not None:
+        progress.close()
+
+    # Archivos ya cubiertos: los de las páginas excluidas, y los repetidos en otra página anterior
+    known = {a["url"] for url, record in pages if url in exclude for a in record["archivos"]}
+    result: List[Dict] = []
+    for url, record in pages:
+        if url in exclude:
+            continue
+        archivos = [a for a in record["archivos"] if a["url"] not in known]
+        known.update(a["url"] for a in archivos)
+        if archivos:
+            result.append({**record, "archivos": archivos})
+            if on_page is not None:
+                on_page(url, result[-1])
+    return result, errors, stats
+
+
+def sitemap_seeds(
+    sitemap_url: str = SITEMAP_URL, session: requests.Session | None = None
+) -> Tuple[List[str], List[str]]:
+    """
+    Semillas del crawler: el MapaSitio y todas las páginas que lista.
+
+    Args:
+        sitemap_url: URL del MapaSitio.
+        session: Sesión HTTP compartida (default: una petición sin sesión).
+
+
+    Returns:
+        Tupla con (semillas, páginas Nivel4 del MapaSitio, cuyos archivos ya
+        procesa la fuente mapa_sitio).
+    """
+    response = (session or requests).get(sitemap_url, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    views = parse_sitemap_html(response.content, ".")
+    nivel4 = [build_url(view, BASE_URL) for view in parse_sitemap_html(response.content)]
+    return [sitemap_url] + [build_url(view, BASE_URL) for view in views], nivel4
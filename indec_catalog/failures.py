@@ -0,0 +1,138 @@
+"""Cola persistente de páginas fallidas, con el error clasificado, para reintentos."""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+from pydantic import BaseModel
+
+from indec_catalog.cache import load_json, save_json
+
+try:
+    import httpx
+except ImportError:  # Dependencia opcional (extra "async")
+    httpx = None
+
+# Clases de error. Las dos últimas son respuestas válidas sin datos (ver fetch_tema_data)
+TIMEOUT = "timeout"
+CONNECTION = "connection"
+HTTP_STATUS = "http_status"
+OTHER = "other"
+ERROR_DEFAULT = "error_default"
+NO_BREADCRUMB = "no_breadcrumb"
+
+
+def classify_exception(exc: BaseException) -> Dict:
+    """
+    Clasifica la excepción de una descarga (requests o httpx).
+
+    Args:
+        exc: Excepción capturada.
+
+    Returns:
+        Diccionario con 'outcome' (TIMEOUT, CONNECTION, HTTP_STATUS u OTHER),
+        'error' (repr de la excepción) y 'status' si hubo respuesta HTTP.
+    """
+    info: Dict = {"error": repr(exc)}
+    timeouts = (requests.Timeout,) + ((httpx.TimeoutException,) if httpx is not None else ())
+    connections = (requests.ConnectionError,) + ((httpx.TransportError,) if httpx is not None else ())
+    statuses = (requests.HTTPError,) + ((httpx.HTTPStatusError,) if httpx is not None else ())
+
+    # ConnectTimeout es a la vez timeout y error de conexión: se reporta como timeout
+    if isinstance(exc, timeouts):
+        info["outcome"] = TIMEOUT
+    elif isinstance(exc, statuses) and getattr(exc, "response", None) is not None:
+        info["outcome"] = HTTP_STATUS
+        info["status"] = exc.response.status_code
+    elif isinstance(exc, connections):
+        info["outcome"] = CONNECTION
+    else:
+        info["outcome"] = OTHER
+    return info
+
+
+def is_retryable(outcome: str, status: int | None = None) -> bool:
+    """True si el error es transitorio: timeout, conexión, 429 o 5xx."""
+    if outcome == HTTP_STATUS:
+        return status is not None and (status == 429 or status >= 500)
+    return outcome in (TIMEOUT, CONNECTION)
+
+
+class Failure(BaseModel):
+    url: str
+    outcome: str
+    status: int | None = None
+    error: str | None = None
+    latency: float | None = None
+    attempts: int = 1
+    first_failed: str
+    last_failed: str
+
+
+class FailureQueue:
+    """
+    Páginas que fallaron en la última corrida, persistidas en JSON.
+
+    Cada entrada guarda la clase de error, el status HTTP, la latencia hasta el
+    fallo y la cantidad de intentos. Su método record sirve como callback
+    `on_stats` del crawl: las páginas exitosas salen de la cola y las fallidas
+    entran (o suman un intento).
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        data = load_json(self.path, {})
+        self.failures: Dict[str, Failure] = {
+            url: Failure.model_validate(f) for url, f in data.get("failures", {}).items()
+        }
+
+    def record(self, url: str, stats: Dict) -> None:
+        """
+        Registra el resultado de una página según sus métricas.
+
+        Args:
+            url: URL de la página.
+            stats: Métricas de fetch_tema_data, con 'outcome' y, si falló con
+                una excepción, 'error' y 'status' (ver classify_exception).
+        """
+        outcome = stats.get("outcome")
+        if outcome == "ok":
+            self.failures.pop(url, None)
+            return
+
+        now = datetime.now(timezone.utc).isoformat()
+        previous = self.failures.get(url)
+        self.failures[url] = Failure(
+            url=url,
+            outcome=outcome or OTHER,
+            status=stats.get("status"),
+            error=stats.get("error"),
+            latency=stats.get("elapsed", stats.get("fetch_time")),
+            attempts=previous.attempts + 1 if previous else 1,
+            first_failed=previous.first_failed if previous else now,
+            last_failed=now,
+        )
+
+    def reset(self, urls: List[str] | None = None) -> None:
+        """Vacía la cola, o quita solo las URLs dadas."""
+        if urls is None:
+            self.failures.clear()
+        for url in urls or ():
+            self.failures.pop(url, None)
+
+    def urls(self) -> List[str]:
+        return list(self.failures)
+
+    def summary(self) -> Dict[str, int]:
+        """Cantidad de fallas por clase de error."""
+        counts: Dict[str, int] = {}
+        for failure in self.failures.values():
+            counts[failure.outcome] = counts.get(failure.outcome, 0) + 1
+        return counts
+
+    def save(self) -> None:
+        save_json(self.path, {"failures": {url: f.model_dump() for url, f in self.failures.items()}}, indent=2)
+
+    def __len__(self) -> int:
+        return len(self.failures)
@@ -0,0 +1,246 @@
+"""Historial append-only del catálogo: deltas comprimidos, keyframes y consultas por fecha."""
+
+import bisect
+import difflib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from indec_catalog.cache import load_json, save_json
+from indec_catalog.config import HISTORY_KEYFRAME_INTERVAL, HISTORY_ZSTD_LEVEL
+from indec_catalog.models import Archivo, Catalog
+
+try:
+    import zstandard
+except ImportError:  # Dependencia opcional (extra "history")
+    zstandard = None
+
+INDEX_FILE = "index.json"
+FILES_INDEX_FILE = "archivos.json.zst"
+
+# Una fila por archivo: tema, subtema, agrupamiento, nombre_archivo, url
+Row = List[str]
+
+
+def _rows(catalog: List[Catalog]) -> List[Row]:
+    return [
+        [r.tema, r.subtema, r.agrupamiento, a.nombre_archivo, a.url]
+        for r in catalog for a in r.archivos
+    ]
+
+
+def _identity(row: Row) -> Tuple[str, str, str, str]:
+    """Un archivo es el mismo entre corridas si conserva jerarquía y URL."""
+    return row[0], row[1], row[2], row[4]
+
+
+def _catalog(rows: List[Row]) -> List[Catalog]:
+    """Reagrupa las filas consecutivas de un mismo tema/subtema/agrupamiento."""
+    catalog: List[Catalog] = []
+    for row in rows:
+        archivo = Archivo(nombre_archivo=row[3], url=row[4])
+        if catalog and (catalog[-1].tema, catalog[-1].subtema, catalog[-1].agrupamiento) == tuple(row[:3]):
+            catalog[-1].archivos.append(archivo)
+        else:
+            catalog.append(Catalog(tema=row[0], subtema=row[1], agrupamiento=row[2], archivos=[archivo]))
+    return catalog
+
+
+def diff_rows(old: List[Row], new: List[Row]) -> Dict:
+    """
+    Delta a nivel archivo entre dos versiones del catálogo.
+
+    Args:
+        old: Filas de la versión anterior.
+        new: Filas de la versión nueva.
+
+    Returns:
+        Diccionario con 'ops' (["d", i, j]: se quitan old[i:j]; ["i", i, filas]:
+        se agregan filas antes de old[i]; ["r", i, j, filas]: reemplazo) y
+        'changed' ([i, nombre]: old[i] sigue pero cambió su nombre_archivo),
+        con índices sobre `old`.
+    """
+    matcher = difflib.SequenceMatcher(
+        None, [_identity(r) for r in old], [_identity(r) for r in new], autojunk=False
+    )
+    ops: List = []
+    changed: List = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            changed += [[i1 + k, new[j1 + k][3]] for k in range(i2 - i1) if old[i1 + k][3] != new[j1 + k][3]]
+        elif tag == "delete":
+            ops.append(["d", i1, i2])
+        elif tag == "insert":
+            ops.append(["i", i1, new[j1:j2]])
+        else:
+            ops.append(["r", i1, i2, new[j1:j2]])
+    return {"ops": ops, "changed": changed}
+
+
+def apply_delta(old: List[Row], delta: Dict) -> List[Row]:
+    """Aplica un delta de diff_rows sobre las filas de la versión anterior."""
+    old = list(old)
+    for i, name in delta["changed"]:
+        old[i] = old[i][:3] + [name, old[i][4]]
+    new: List[Row] = []
+    position = 0
+    for op in delta["ops"]:
+        new += old[position:op[1]]
+        if op[0] == "d":
+            position = op[2]
+        elif op[0] == "i":
+            new += op[2]
+            position = op[1]
+        else:
+            new += op[3]
+            position = op[2]
+    return new + old[position:]
+
+
+def _timestamp(when: datetime | str) -> datetime:
+    when = datetime.fromisoformat(when) if isinstance(when, str) else when
+    return when if when.tzinfo else when.replace(tzinfo=timezone.utc)
+
+
+class CatalogHistory:
+    """
+    Historial de corridas del catálogo en un directorio, solo de agregado.
+
+    Cada corrida se guarda como delta a nivel archivo (altas, bajas y cambios
+    de nombre) contra la anterior, y cada HISTORY_KEYFRAME_INTERVAL corridas
+    como catálogo completo (keyframe); todo comprimido con zstd. Reconstruir
+    cualquier fecha aplica a lo sumo HISTORY_KEYFRAME_INTERVAL - 1 deltas.
+    Un índice aparte guarda la primera y la última corrida en que apareció
+    cada URL de archivo.
+
+    Los archivos de cada corrida nunca se reescriben; index.json y el índice
+    de URLs se reemplazan de forma atómica al final de append.
+    """
+
+    def __init__(self, path: str | Path, keyframe_interval: int = HISTORY_KEYFRAME_INTERVAL):
+        """
+        Args:
+            path: Directorio del historial (se crea si no existe).
+            keyframe_interval: Corridas entre keyframes.
+
+        Raises:
+            ImportError: Si zstandard no está instalado.
+        """
+        if zstandard is None:
+            raise ImportError("El historial requiere zstandard: uv sync --extra history")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.keyframe_interval = keyframe_interval
+        self.snapshots: List[Dict] = load_json(self.path / INDEX_FILE, {}).get("snapshots", [])
+        self._times = [_timestamp(s["timestamp"]) for s in self.snapshots]
+        self._files_index: Dict[str, List[str]] | None = None
+        self._head: List[Row] | None = None  # Filas de la última corrida, una vez reconstruidas
+
+    def _read(self, name: str):
+        with open(self.path / name, "rb") as f:
+            return json.loads(zstandard.ZstdDecompressor().decompress(f.read()))
+
+    def _write(self, name: str, data) -> None:
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=f".{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(zstandard.ZstdCompressor(level=HISTORY_ZSTD_LEVEL).compress(payload))
+            os.replace(tmp, self.path / name)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _rows_at(self, index: int) -> List[Row]:
+        """Filas de la corrida `index`: su keyframe más los deltas posteriores."""
+        if index == len(self.snapshots) - 1 and self._head is not None:
+            return self._head
+        start = index
+        while self.snapshots[start]["kind"] != "keyframe":
+            start -= 1
+        rows = self._read(self.snapshots[start]["file"])
+        for snapshot in self.snapshots[start + 1:index + 1]:
+            rows = apply_delta(rows, self._read(snapshot["file"]))
+        return rows
+
+    def _files(self) -> Dict[str, List[str]]:
+        if self._files_index is None:
+            exists = (self.path / FILES_INDEX_FILE).exists()
+            self._files_index = self._read(FILES_INDEX_FILE) if exists else {}
+        return self._files_index
+
+    def append(self, catalog: List[Catalog], timestamp: datetime | str | None = None) -> Dict:
+        """
+        Agrega una corrida al historial.
+
+        Args:
+            catalog: Catálogo de la corrida.
+            timestamp: Fecha de la corrida (default: ahora, UTC).
+
+        Returns:
+            Entrada del índice, con la cantidad de archivos agregados, quitados
+            y renombrados respecto de la corrida anterior.
+
+        Raises:
+            ValueError: Si `timestamp` es anterior a la última corrida guardada.
+        """
+        when = _timestamp(timestamp) if timestamp is not None else datetime.now(timezone.utc)
+        if self._times and when < self._times[-1]:
+            raise ValueError(f"La corrida ({when.isoformat()}) es anterior a la última del historial")
+
+        rows = _rows(catalog)
+        number = len(self.snapshots)
+        entry: Dict = {"timestamp": when.isoformat(), "files": len(rows)}
+        if number % self.keyframe_interval == 0:
+            entry.update(kind="keyframe", file=f"{number:06d}.key.json.zst")
+            self._write(entry["file"], rows)
+            delta = diff_rows(self._rows_at(number - 1) if number else [], rows)
+        else:
+            delta = diff_rows(self._rows_at(number - 1), rows)
+            entry.update(kind="delta", file=f"{number:06d}.delta.json.zst")
+            self._write(entry["file"], delta)
+        entry["added"] = sum(len(op[-1]) for op in delta["ops"] if op[0] != "d")
+        entry["removed"] = sum(op[2] - op[1] for op in delta["ops"] if op[0] != "i")
+        entry["changed"] = len(delta["changed"])
+
+        files = self._files()
+        for url in {row[4] for row in rows}:
+            files.setdefault(url, [entry["timestamp"], entry["timestamp"]])[1] = entry["timestamp"]
+        self._write(FILES_INDEX_FILE, files)
+
+        self.snapshots.append(entry)
+        self._times.append(when)
+        self._head = rows
+        save_json(self.path / INDEX_FILE, {"snapshots": self.snapshots}, indent=2)
+        return entry
+
+    def as_of(self, when: datetime | str) -> List[Catalog]:
+        """
+        Catálogo vigente en una fecha: el de la última corrida no posterior a `when`.
+
+        Raises:
+            LookupError: Si no hay corridas hasta esa fecha.
+        """
+        index = bisect.bisect_right(self._times, _timestamp(when)) - 1
+        if index < 0:
+            raise LookupError(f"No hay corridas en el historial hasta {when}")
+        return _catalog(self._rows_at(index))
+
+    def file_dates(self, url: str) -> Dict[str, str] | None:
+        """
+        Primera y última corrida en que apareció la URL de un archivo.
+
+        Returns:
+            {"first_seen": fecha, "last_seen": fecha}, o None si nunca apareció.
+        """
+        dates = self._files().get(url)
+        if dates is None:
+            return None
+        return {"first_seen": dates[0], "last_seen": dates[1]}
+
+    def __len__(self) -> int:
+        return len(self.snapshots)
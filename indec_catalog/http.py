@@ -0,0 +1,95 @@
+"""Capa HTTP compartida: clientes con pool de conexiones y charset de las respuestas."""
+
+import re
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from indec_catalog.config import ASYNC_CONCURRENCY, HTTP_TIMEOUT
+
+try:
+    import httpx
+except ImportError:  # Dependencia opcional (extra "async")
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (lo usa httpx para HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:  # Dependencia opcional (extra "http2")
+    HTTP2_AVAILABLE = False
+
+
+def response_charset(content_type: str | None) -> str:
+    """
+    Charset declarado en un header Content-Type.
+
+    Args:
+        content_type: Valor del header (puede faltar).
+
+    Returns:
+        El charset informado, o utf-8 si no se informa.
+    """
+    match = re.search(r"charset=([\w.-]+)", content_type or "", re.IGNORECASE)
+    return match.group(1) if match else "utf-8"
+
+
+def create_session(max_connections: int = ASYNC_CONCURRENCY) -> requests.Session:
+    """
+    Crea una requests.Session para compartir entre las fuentes de un crawl sincrónico.
+
+    Las peticiones reutilizan las conexiones keep-alive del pool en lugar de
+    abrir una conexión (y un handshake TLS) nueva cada vez. El pool admite
+    `max_connections` conexiones por host, una por fuente corriendo a la vez.
+
+    Args:
+        max_connections: Conexiones que el pool conserva por host.
+
+    Returns:
+        requests.Session (cerrar con close() o usar con `with`).
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def create_async_client(
+    max_connections: int = ASYNC_CONCURRENCY,
+    http2: bool | None = None,
+    prior_knowledge: bool = False,
+):
+    """
+    Crea un httpx.AsyncClient para compartir entre todas las peticiones de un crawl.
+
+    Con HTTP/2 las peticiones concurrentes se multiplexan como streams sobre
+    una conexión por host, en lugar de abrir una conexión por petición en vuelo.
+    El protocolo se negocia por ALPN en cada conexión TLS: si el servidor no
+    ofrece HTTP/2 se usa HTTP/1.1 y el pool crece hasta `max_connections`.
+
+    Args:
+        max_connections: Máximo de conexiones simultáneas del pool.
+        http2: Habilitar HTTP/2 (default: si el paquete h2 está instalado).
+        prior_knowledge: Hablar HTTP/2 sin negociar, también sobre http://
+            (h2c). Solo para servidores que se sabe que lo soportan, p. ej. de prueba.
+
+    Returns:
+        httpx.AsyncClient (usar con `async with`).
+
+    Raises:
+        ImportError: Si httpx no está instalado, o si se pide HTTP/2 sin h2.
+    """
+    if httpx is None:
+        raise ImportError("El pipeline asíncrono requiere httpx: uv sync --extra async")
+    if http2 is None:
+        http2 = HTTP2_AVAILABLE or prior_knowledge
+    if http2 and not HTTP2_AVAILABLE:
+        raise ImportError("HTTP/2 requiere el paquete h2: uv sync --extra http2")
+
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=HTTP_TIMEOUT,
+        http2=http2,
+        http1=not (http2 and prior_knowledge),
+    )
@@ -0,0 +1,68 @@
+"""Diario de crawl append-only (NDJSON) para reanudar corridas interrumpidas."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+
+class CrawlJournal:
+    """
+    Registra el resultado de cada página apenas termina, una línea JSON por página.
+
+    Cada línea se escribe con flush + fsync, así un corte (Ctrl+C, falta de
+    memoria, caída de la red o de la máquina) pierde a lo sumo la página en
+    curso. Una última línea incompleta se ignora al leer.
+    """
+
+    def __init__(self, path: str | Path, resume: bool = False):
+        """
+        Args:
+            path: Archivo del diario.
+            resume: Conservar las entradas existentes (default: empezar de cero).
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.entries: Dict[str, Any] = self._read() if resume else {}
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+    def _read(self) -> Dict[str, Any]:
+        """Lee las entradas válidas y descarta una última línea incompleta."""
+        entries: Dict[str, Any] = {}
+        valid = 0
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Línea cortada por la interrupción
+                    if not line.endswith(b"\n"):
+                        break
+                    entries[entry["url"]] = entry["data"]
+                    valid += len(line)
+            os.truncate(self.path, valid)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def append(self, url: str, data: Any) -> None:
+        """Registra el resultado de una página (pensado como callback `on_page`)."""
+        self._file.write(json.dumps({"url": url, "data": data}, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.entries[url] = data
+
+    def close(self) -> None:
+        self._file.close()
+
+    def discard(self) -> None:
+        """Cierra y elimina el diario (una vez guardado el catálogo final)."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,103 @@
+"""Caché negativa: páginas que no aportan archivos de datos y se re-verifican solo cada tanto."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict
+
+from indec_catalog.cache import load_json, save_json
+from indec_catalog.config import NEGATIVE_JITTER, NEGATIVE_TTL
+from indec_catalog.failures import ERROR_DEFAULT, NO_BREADCRUMB
+
+# Motivos por los que una página entra en la caché
+EMPTY = "empty"  # Página válida sin enlaces a archivos de datos
+REASONS = (EMPTY, ERROR_DEFAULT, NO_BREADCRUMB)
+
+
+class NegativeCache:
+    """
+    Páginas que en su último chequeo no aportaron datos, persistidas en JSON.
+
+    Una página entra con motivo EMPTY (sin archivos), ERROR_DEFAULT (redirige a
+    la página de error) o NO_BREADCRUMB (sin div.ruta-texto) y se saltea hasta
+    su próxima verificación, a NEGATIVE_TTL segundos ± NEGATIVE_JITTER. El
+    jitter reparte las re-verificaciones entre corridas en lugar de que todas
+    venzan juntas. Un error transitorio (timeout, conexión) no la modifica:
+    de eso se ocupa FailureQueue.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl: float = NEGATIVE_TTL,
+        jitter: float = NEGATIVE_JITTER,
+        rng: random.Random | None = None,
+        refresh: bool = False,
+    ):
+        """
+        Args:
+            path: Archivo JSON de la caché (default: solo en memoria).
+            ttl: Segundos hasta re-verificar una página.
+            jitter: Variación relativa del TTL, sorteada por página.
+            rng: Generador para el jitter (inyectable para tests).
+            refresh: Re-verificar todas las páginas en esta corrida (no se
+                saltea ninguna, pero la caché se sigue actualizando).
+        """
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.refresh = refresh
+        self.entries: Dict[str, Dict] = (load_json(self.path, {}) if self.path else None) or {}
+        self.skipped = 0
+
+    def skip(self, url: str) -> bool:
+        """True si `url` está en la caché y todavía no le toca re-verificarse."""
+        entry = self.entries.get(url)
+        if self.refresh or entry is None or datetime.now(timezone.utc) >= datetime.fromisoformat(entry["recheck"]):
+            return False
+        self.skipped += 1
+        return True
+
+    def record(self, url: str, stats: Dict) -> None:
+        """
+        Actualiza la caché con el resultado de una página.
+
+        Args:
+            url: URL de la página.
+            stats: Métricas de fetch_tema_data ('outcome' y 'links').
+        """
+        outcome = stats.get("outcome")
+        if outcome == "ok":
+            reason = EMPTY if stats.get("links") == 0 else None
+        elif outcome in (ERROR_DEFAULT, NO_BREADCRUMB):
+            reason = outcome
+        else:
+            return
+        if reason is None:
+            self.entries.pop(url, None)
+            return
+
+        now = datetime.now(timezone.utc)
+        previous = self.entries.get(url)
+        delay = self.ttl * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+        self.entries[url] = {
+            "reason": reason,
+            "since": previous["since"] if previous and previous["reason"] == reason else now.isoformat(),
+            "checked": now.isoformat(),
+            "recheck": (now + timedelta(seconds=delay)).isoformat(),
+        }
+
+    def summary(self) -> Dict[str, int]:
+        """Cantidad de páginas en la caché por motivo."""
+        counts: Dict[str, int] = {}
+        for entry in self.entries.values():
+            counts[entry["reason"]] = counts.get(entry["reason"], 0) + 1
+        return counts
+
+    def save(self) -> None:
+        if self.path is not None:
+            save_json(self.path, self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
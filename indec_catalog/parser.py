@@ -78,7 +78,19 @@ def parse_tema_info(soup: BeautifulSoup) -> Dict[str, str] | None:
     if not ruta_texto:
         return None
     
-    texto = ruta_texto.get_text(strip=True)
+    return parse_breadcrumb(ruta_texto.get_text(strip=True))
+
+
+def parse_breadcrumb(texto: str) -> Dict[str, str] | None:
+    """
+    Interpreta el texto de la ruta de navegación (div.ruta-texto).
+    
+    Args:
+        texto: Texto de la ruta sin espacios entre nodos (ej: "Inicio> Tema >Subtema >Agrupamiento").
+        
+    Returns:
+        Diccionario con 'tema', 'subtema', 'agrupamiento' o None si la ruta es incompleta.
+    """
     nivel_name = re.sub(r"Inicio> ", "", texto)
     nivel_name = re.sub(r" >|>", ", ", nivel_name)
     
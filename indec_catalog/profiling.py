@@ -0,0 +1,110 @@
+"""Perfilado de corridas: volcado cProfile y reporte de páginas más lentas."""
+
+import cProfile
+import pstats
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+DEFAULT_TOP = 20
+
+
+def _total_time(stats: Dict) -> float:
+    return stats.get("fetch_time", 0.0) + stats.get("parse_time", 0.0) + stats.get("extract_time", 0.0)
+
+
+class PageProfiler:
+    """
+    Acumula las métricas por página que reportan fetch_tema_data y
+    scrape_bases_datos (descarga, parseo de la ruta, extracción de enlaces).
+    Su método record sirve directamente como callback `on_stats` del crawl.
+    """
+
+    def __init__(self):
+        self.pages: Dict[str, Dict] = {}
+
+    def record(self, url: str, stats: Dict) -> None:
+        self.pages[url] = dict(stats)
+
+    def slowest(self, n: int = DEFAULT_TOP) -> List[Tuple[str, Dict]]:
+        """Las n páginas con mayor tiempo total, de más lenta a más rápida."""
+        ranked = sorted(self.pages.items(), key=lambda item: _total_time(item[1]), reverse=True)
+        return ranked[:n]
+
+    def report(self, n: int = DEFAULT_TOP) -> str:
+        """
+        Arma un reporte de texto con las n páginas más lentas.
+
+        Returns:
+            Tabla con tiempo total, descarga, parseo, extracción, enlaces y URL.
+        """
+        lines = [
+            f"Páginas más lentas ({min(n, len(self.pages))} de {len(self.pages)}):",
+            f"{'total':>8} {'descarga':>9} {'parseo':>8} {'extracción':>11} {'enlaces':>8}  url",
+        ]
+        for url, stats in self.slowest(n):
+            suffix = f"  [{stats['error']}]" if "error" in stats else ""
+            lines.append(
+                f"{_total_time(stats):>7.3f}s"
+                f" {stats.get('fetch_time', 0.0):>8.3f}s"
+                f" {stats.get('parse_time', 0.0):>7.3f}s"
+                f" {stats.get('extract_time', 0.0):>10.3f}s"
+                f" {stats.get('links', 0):>8}  {url}{suffix}"
+            )
+        totals = [_total_time(s) for s in self.pages.values()]
+        fetch = sum(s.get("fetch_time", 0.0) for s in self.pages.values())
+        if totals:
+            lines.append(
+                f"Total: {sum(totals):.3f}s en {len(totals)} páginas "
+                f"({fetch:.3f}s descarga, {sum(totals) - fetch:.3f}s parseo y extracción)"
+            )
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_run(pstats_path: str | Path) -> Iterator[cProfile.Profile]:
+    """
+    Ejecuta el bloque bajo cProfile y guarda el resultado en formato .pstats
+    (legible con `python -m pstats` o snakeviz), incluso si el bloque falla.
+
+    El crawl descarga y parsea en otros threads (fuentes en paralelo,
+    descarga del MapaSitio, asyncio.to_thread): hasta Python 3.11 cProfile
+    solo mide el thread que lo activa, así que cada thread creado durante el
+    bloque tiene su propio perfil y todos se suman en el archivo. Desde 3.12
+    un único perfil ya abarca todos los threads.
+
+    Args:
+        pstats_path: Archivo de salida.
+
+    Yields:
+        El cProfile.Profile del thread principal.
+    """
+    profiler = cProfile.Profile()
+    workers: List[cProfile.Profile] = []
+    per_thread = sys.version_info < (3, 12)
+
+    def start_thread_profile(frame, event, arg) -> None:
+        # Primer evento del thread nuevo: su perfil reemplaza este hook
+        worker = cProfile.Profile()
+        workers.append(worker)
+        worker.enable()
+
+    if per_thread:
+        threading.setprofile(start_thread_profile)
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if per_thread:
+            threading.setprofile(None)
+        stats = pstats.Stats()
+        for each in (profiler, *workers):
+            each.create_stats()
+            if each.stats:
+                stats.add(each)
+        pstats_path = Path(pstats_path)
+        pstats_path.parent.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(pstats_path)
@@ -0,0 +1,53 @@
+"""Mapa de redirecciones persistente: URL pedida -> URL final de la página."""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict
+
+from indec_catalog.cache import load_json, save_json
+from indec_catalog.config import REDIRECT_TTL
+
+
+class RedirectMap:
+    """
+    Recuerda a qué página final redirige cada URL del MapaSitio.
+
+    Varios data-view pueden terminar en la misma página; con este mapa el crawl
+    sabe, antes de pedirla, que una URL equivale a otra ya procesada en la
+    corrida y reutiliza su resultado. Solo se guardan redirecciones de páginas
+    con datos (nunca hacia Error-Default) y cada entrada vence a los
+    REDIRECT_TTL segundos, así una URL redirigida se vuelve a verificar
+    periódicamente.
+    """
+
+    def __init__(self, path: str | Path | None = None, ttl: float = REDIRECT_TTL):
+        self.path = Path(path) if path else None
+        self.ttl = timedelta(seconds=ttl)
+        self.entries: Dict[str, Dict[str, str]] = (load_json(self.path, {}) if self.path else None) or {}
+
+    def resolve(self, url: str) -> str:
+        """URL final conocida y vigente para `url`, o la misma `url`."""
+        entry = self.entries.get(url)
+        if entry is None:
+            return url
+        checked = datetime.fromisoformat(entry["checked"])
+        if datetime.now(timezone.utc) - checked > self.ttl:
+            return url
+        return entry["final"]
+
+    def record(self, url: str, final_url: str | None) -> None:
+        """
+        Registra la URL final observada al descargar `url`.
+
+        Args:
+            url: URL pedida.
+            final_url: URL final tras las redirecciones, o None para olvidar la entrada.
+        """
+        if final_url is None or final_url == url:
+            self.entries.pop(url, None)
+            return
+        self.entries[url] = {"final": final_url, "checked": datetime.now(timezone.utc).isoformat()}
+
+    def save(self) -> None:
+        if self.path is not None:
+            save_json(self.path, self.entries)
@@ -1,19 +1,36 @@
 """Funciones para hacer scraping de páginas web."""
 
-from typing import Dict
+import asyncio
+import time
+from typing import Dict, Iterable, Tuple
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
 
-from indec_catalog.config import BASE_URL, HTTP_TIMEOUT
-from indec_catalog.parser import extract_data_links, parse_tema_info
+from indec_catalog.config import (
+    BASE_URL,
+    DATA_EXTENSIONS,
+    HTTP_TIMEOUT,
+    STREAM_CHUNK_SIZE,
+    STREAM_STOP_TAGS,
+)
+from indec_catalog.http import response_charset
+from indec_catalog.parser import _normalize_url, extract_data_links, parse_breadcrumb, parse_tema_info
 
 
-def fetch_tema_data(url: str) -> Dict | None:
+def fetch_tema_data(
+    url: str, stats: Dict | None = None, session: requests.Session | None = None
+) -> Dict | None:
     """
     Obtiene los datos de un tema desde su URL.
 
     Args:
         url: URL del tema a procesar.
+        stats: Diccionario opcional donde se registran métricas de la página:
+            'fetch_time', 'parse_time' y 'extract_time' (segundos), 'bytes',
+            'links', 'final_url' y 'outcome' ("ok", "error_default" o
+            "no_breadcrumb").
+        session: Sesión HTTP compartida (default: una petición sin sesión).
         
     Returns:
         Diccionario con 'tema', 'subtema', 'agrupamiento' y 'archivos', o None si hay error.
@@ -21,14 +38,172 @@ def fetch_tema_data(url: str) -> Dict | None:
     Raises:
         requests.RequestException: Si falla la petición HTTP.
     """
-    response = requests.get(url, allow_redirects=True, timeout=HTTP_TIMEOUT)
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+    response = (session or requests).get(url, allow_redirects=True, timeout=HTTP_TIMEOUT)
+    stats["fetch_time"] = time.perf_counter() - start
     response.raise_for_status()
+    stats["bytes"] = len(response.content)
+    stats["final_url"] = response.url
     
     if "Error-Default" in response.url:
+        stats["outcome"] = "error_default"
         return None
     
+    start = time.perf_counter()
     soup = BeautifulSoup(response.content, "html.parser")
     tema_info = parse_tema_info(soup)
+    stats["parse_time"] = time.perf_counter() - start
+    if tema_info is None:
+        stats["outcome"] = "no_breadcrumb"
+        return None
+
+    start = time.perf_counter()
+    tema_info["archivos"] = extract_data_links(soup, BASE_URL)
+    stats["extract_time"] = time.perf_counter() - start
+    stats["links"] = len(tema_info["archivos"])
+    stats["outcome"] = "ok"
+    return tema_info
+
+
+def fetch_tema_data_streaming(
+    url: str,
+    stats: Dict | None = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    stop_tags: Iterable[str] = STREAM_STOP_TAGS,
+    session: requests.Session | None = None,
+) -> Dict | None:
+    """
+    Variante de fetch_tema_data que parsea el cuerpo a medida que se descarga.
+
+    Los chunks de la respuesta alimentan un parser incremental de lxml; la ruta
+    (div.ruta-texto) y los enlaces de datos se extraen al cerrarse cada elemento
+    y los elementos ya procesados se descartan. La lectura se corta al abrirse
+    el primer tag de `stop_tags` (fin de la región de contenido), así no se
+    descargan ni se parsean el pie de página y los scripts finales.
+
+    Args:
+        url: URL del tema a procesar.
+        stats: Diccionario opcional de métricas, como en fetch_tema_data. 'bytes'
+            son los bytes efectivamente leídos y 'parse_time' incluye la extracción.
+        chunk_size: Tamaño de cada chunk leído.
+        stop_tags: Tags que marcan el fin de la región de contenido.
+        session: Sesión HTTP compartida (default: una petición sin sesión).
+
+    Returns:
+        Diccionario con 'tema', 'subtema', 'agrupamiento' y 'archivos', o None si hay error.
+
+    Raises:
+        requests.RequestException: Si falla la petición HTTP.
+    """
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+    response = (session or requests).get(url, allow_redirects=True, timeout=HTTP_TIMEOUT, stream=True)
+    try:
+        stats["fetch_time"] = time.perf_counter() - start
+        response.raise_for_status()
+        stats["final_url"] = response.url
+        if "Error-Default" in response.url:
+            stats["outcome"] = "error_default"
+            return None
+
+        parse_start = time.perf_counter()
+        breadcrumb, archivos, read = _stream_parse(
+            response.iter_content(chunk_size),
+            response_charset(response.headers.get("Content-Type", "")),
+            frozenset(stop_tags),
+        )
+        elapsed = time.perf_counter() - parse_start
+    finally:
+        response.close()
+
+    # Descarga y parseo se solapan: 'parse_time' mide la lectura del cuerpo completa
+    stats["bytes"] = read
+    stats["parse_time"] = elapsed
+    tema_info = parse_breadcrumb(breadcrumb) if breadcrumb is not None else None
+    if tema_info is None:
+        stats["outcome"] = "no_breadcrumb"
+        return None
+    tema_info["archivos"] = archivos
+    stats["links"] = len(archivos)
+    stats["outcome"] = "ok"
+    return tema_info
+
+
+def _text(el) -> str:
+    """Equivalente a BeautifulSoup get_text(strip=True) para un elemento lxml."""
+    return "".join(t.strip() for t in el.itertext())
+
+
+def _stream_parse(
+    chunks: Iterable[bytes],
+    encoding: str,
+    stop_tags: frozenset,
+) -> Tuple[str | None, list, int]:
+    """
+    Parsea HTML incrementalmente y extrae la ruta y los enlaces de datos.
+
+    Returns:
+        Tupla (texto de div.ruta-texto o None, lista de archivos, bytes leídos).
+    """
+    parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+    breadcrumb: str | None = None
+    archivos = []
+    read = 0
+    holding = 0  # Elementos abiertos cuyo texto se necesita (enlaces y la ruta)
+
+    def is_ruta(el) -> bool:
+        return el.tag == "div" and " ".join((el.get("class") or "").split()) == "ruta-texto mb-3"
+
+    def handle(events) -> bool:
+        nonlocal breadcrumb, holding
+        for event, el in events:
+            held = el.tag == "a" or (breadcrumb is None and is_ruta(el))
+            if event == "start":
+                if el.tag in stop_tags:
+                    return True
+                holding += held
+                continue
+
+            if el.tag == "a":
+                href = (el.get("href") or "").strip()
+                if href and href.lower().endswith(DATA_EXTENSIONS):
+                    archivos.append({"nombre_archivo": _text(el), "url": _normalize_url(href, BASE_URL)})
+            elif held:
+                breadcrumb = _text(el)
+            holding -= held
+
+            if not holding:
+                # Ya procesado: se libera el subárbol y los hermanos anteriores
+                el.clear(keep_tail=True)
+                parent = el.getparent()
+                while parent is not None and el.getprevious() is not None:
+                    del parent[0]
+        return False
+
+    for chunk in chunks:
+        read += len(chunk)
+        parser.feed(chunk)
+        if handle(parser.read_events()):
+            return breadcrumb, archivos, read
+    parser.close()
+    handle(parser.read_events())
+    return breadcrumb, archivos, read
+
+
+def parse_tema_page(content: bytes) -> Dict | None:
+    """
+    Parsea el HTML de una página Nivel4 ya descargada.
+
+    Args:
+        content: Cuerpo de la respuesta HTTP.
+
+    Returns:
+        Diccionario con 'tema', 'subtema', 'agrupamiento' y 'archivos', o None si
+        la página no tiene la ruta (div.ruta-texto).
+    """
+    soup = BeautifulSoup(content, "html.parser")
+    tema_info = parse_tema_info(soup)
     if tema_info is None:
         return None
     
@@ -36,3 +211,44 @@ def fetch_tema_data(url: str) -> Dict | None:
     tema_info["archivos"]  = archivos
     return tema_info
 
+
+async def afetch_tema_data(url: str, client, stats: Dict | None = None) -> Dict | None:
+    """
+    Versión asíncrona de fetch_tema_data.
+
+    El parseo HTML se ejecuta en un thread aparte para no bloquear el event loop.
+
+    Args:
+        url: URL del tema a procesar.
+        client: httpx.AsyncClient compartido (ver indec_catalog.http.create_async_client).
+        stats: Diccionario opcional de métricas: 'fetch_time', 'parse_time',
+            'bytes', 'links', 'final_url', 'http_version' y 'outcome'.
+
+    Returns:
+        Diccionario con 'tema', 'subtema', 'agrupamiento' y 'archivos', o None si hay error.
+
+    Raises:
+        httpx.HTTPError: Si falla la petición HTTP.
+    """
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+    response = await client.get(url, follow_redirects=True, timeout=HTTP_TIMEOUT)
+    stats["fetch_time"] = time.perf_counter() - start
+    response.raise_for_status()
+    stats["bytes"] = len(response.content)
+    stats["final_url"] = str(response.url)
+    stats["http_version"] = response.http_version
+
+    if "Error-Default" in str(response.url):
+        stats["outcome"] = "error_default"
+        return None
+
+    start = time.perf_counter()
+    tema_info = await asyncio.to_thread(parse_tema_page, response.content)
+    stats["parse_time"] = time.perf_counter() - start
+    if tema_info is None:
+        stats["outcome"] = "no_breadcrumb"
+        return None
+    stats["links"] = len(tema_info["archivos"])
+    stats["outcome"] = "ok"
+    return tema_info
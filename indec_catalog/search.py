@@ -0,0 +1,191 @@
+"""Búsqueda difusa sobre el catálogo con un índice de trigramas sin acentos."""
+
+import hashlib
+import json
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from indec_catalog.cache import load_json, save_json
+from indec_catalog.models import Catalog
+
+INDEX_VERSION = 1
+
+# Campos indexados y su peso en el puntaje (el nombre del archivo pesa más)
+FIELDS = ("nombre_archivo", "agrupamiento", "subtema", "tema")
+FIELD_WEIGHTS = (1.0, 0.6, 0.4, 0.3)
+
+DEFAULT_LIMIT = 20
+DEFAULT_MIN_SCORE = 0.3
+
+
+def fold(text: str) -> str:
+    """
+    Normaliza texto para comparar sin acentos ni mayúsculas y con espacios simples.
+
+    Args:
+        text: Texto original (ej: "Población  Total").
+
+    Returns:
+        Texto normalizado (ej: "poblacion total").
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Trigramas de cada palabra del texto normalizado, con relleno al inicio y al
+    final (como pg_trgm), así las palabras cortas y los bordes también cuentan.
+
+    Args:
+        text: Texto original.
+
+    Returns:
+        Conjunto de trigramas.
+    """
+    result: set[str] = set()
+    for word in fold(text).split():
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def catalog_fingerprint(catalog_path: str | Path) -> str:
+    """Hash SHA-256 del archivo del catálogo, para validar un índice persistido."""
+    return hashlib.sha256(Path(catalog_path).read_bytes()).hexdigest()
+
+
+class SearchIndex:
+    """
+    Índice invertido de trigramas sobre los archivos del catálogo.
+
+    Cada documento es un archivo con su jerarquía. Las postings guardan
+    `doc * len(FIELDS) + campo`, así un solo recorrido suma el puntaje por campo.
+    El puntaje de un campo es la fracción de trigramas de la consulta que
+    aparecen en él, ponderada por FIELD_WEIGHTS; eso tolera errores de tipeo
+    porque una palabra con una letra cambiada conserva la mayoría de sus trigramas.
+    """
+
+    def __init__(self, docs: List[Dict[str, str]], postings: Dict[str, List[int]], fingerprint: str | None = None):
+        self.docs = docs
+        self.postings = postings
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, catalog: List[Catalog], fingerprint: str | None = None) -> "SearchIndex":
+        """
+        Construye el índice a partir del catálogo.
+
+        Args:
+            catalog: Lista de Catalog.
+            fingerprint: Hash del catálogo de origen (para persistir el índice).
+
+        Returns:
+            Índice listo para consultar.
+        """
+        docs: List[Dict[str, str]] = []
+        postings: Dict[str, List[int]] = {}
+        n_fields = len(FIELDS)
+        for record in catalog:
+            for archivo in record.archivos:
+                doc = {
+                    "tema": record.tema,
+                    "subtema": record.subtema,
+                    "agrupamiento": record.agrupamiento,
+                    "nombre_archivo": archivo.nombre_archivo,
+                    "url": archivo.url,
+                }
+                doc_id = len(docs)
+                docs.append(doc)
+                for field_id, field in enumerate(FIELDS):
+                    for gram in trigrams(doc[field]):
+                        postings.setdefault(gram, []).append(doc_id * n_fields + field_id)
+        return cls(docs, postings, fingerprint)
+
+    def search(
+        self,
+        query: str,
+        limit: int = DEFAULT_LIMIT,
+        min_score: float = DEFAULT_MIN_SCORE,
+    ) -> List[Tuple[float, Dict[str, str]]]:
+        """
+        Busca archivos parecidos a la consulta.
+
+        Args:
+            query: Texto a buscar; se ignoran acentos y mayúsculas.
+            limit: Máximo de resultados.
+            min_score: Puntaje mínimo; 1.0 equivale a que todos los trigramas de
+                la consulta aparezcan en el nombre del archivo.
+
+        Returns:
+            Pares (puntaje, archivo) ordenados de mayor a menor puntaje.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+        n_fields = len(FIELDS)
+        hits: Dict[int, int] = {}
+        for gram in grams:
+            for entry in self.postings.get(gram, ()):
+                hits[entry] = hits.get(entry, 0) + 1
+
+        scores: Dict[int, float] = {}
+        for entry, count in hits.items():
+            doc_id, field_id = divmod(entry, n_fields)
+            scores[doc_id] = scores.get(doc_id, 0.0) + FIELD_WEIGHTS[field_id] * count / len(grams)
+
+        best = FIELD_WEIGHTS[0]
+        ranked = sorted(
+            ((score / best, doc_id) for doc_id, score in scores.items() if score / best >= min_score),
+            key=lambda x: (-x[0], x[1]),
+        )
+        return [(round(score, 4), self.docs[doc_id]) for score, doc_id in ranked[:limit]]
+
+    def save(self, path: str | Path) -> None:
+        """Guarda el índice en JSON junto con el hash del catálogo de origen."""
+        save_json(path, {
+            "version": INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "docs": self.docs,
+            "postings": self.postings,
+        })
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SearchIndex | None":
+        """Carga un índice guardado, o None si no existe o es de otra versión."""
+        data = load_json(path)
+        if not data or data.get("version") != INDEX_VERSION:
+            return None
+        return cls(data["docs"], data["postings"], data.get("fingerprint"))
+
+
+def index_path_for(catalog_path: str | Path) -> Path:
+    """Ruta del índice persistido junto al catálogo (ej: catalogo_indec.search.json)."""
+    return Path(catalog_path).with_suffix(".search.json")
+
+
+def load_or_build_index(catalog_path: str | Path, index_path: str | Path | None = None) -> SearchIndex:
+    """
+    Carga el índice persistido junto al catálogo, o lo construye y guarda si
+    no existe o corresponde a otra versión del catálogo.
+
+    Args:
+        catalog_path: Archivo JSON del catálogo.
+        index_path: Archivo del índice (default: junto al catálogo, *.search.json).
+
+    Returns:
+        SearchIndex del catálogo actual.
+    """
+    index_path = Path(index_path) if index_path else index_path_for(catalog_path)
+    fingerprint = catalog_fingerprint(catalog_path)
+    index = SearchIndex.load(index_path)
+    if index is not None and index.fingerprint == fingerprint:
+        return index
+
+    with open(catalog_path, "r", encoding="utf-8") as f:
+        catalog = [Catalog.model_validate(x) for x in json.load(f)]
+    index = SearchIndex.build(catalog, fingerprint)
+    index.save(index_path)
+    return index
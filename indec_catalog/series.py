@@ -0,0 +1,374 @@
+"""Índice de series de datos: agrupa publicaciones periódicas y resuelve consultas por período."""
+
+import bisect
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from pydantic import BaseModel
+
+from indec_catalog.cache import load_json, save_json
+from indec_catalog.models import Archivo, Catalog
+from indec_catalog.search import catalog_fingerprint, fold
+
+INDEX_VERSION = 2
+
+# Un período es (inicio, meses): inicio = año * 12 + mes - 1, así los períodos
+# de cualquier granularidad se ordenan y comparan como enteros
+Period = Tuple[int, int]
+
+_YEAR = r"((?:19|20)\d{2})"
+_SEP = r"[\s_.,/-]*"
+_ORDINALS = {"primer": 1, "primero": 1, "segundo": 2, "tercer": 3, "tercero": 3, "cuarto": 4}
+_ORDINAL = r"(primero?|segundo|tercero?|cuarto|[1-4])\s*(?:er|ro|do|to|°|º|o)?\.?"
+_MONTHS = {
+    "enero": 1, "febrero": 2, "marzo": 3, "abril": 4, "mayo": 5, "junio": 6, "julio": 7, "agosto": 8,
+    "septiembre": 9, "setiembre": 9, "octubre": 10, "noviembre": 11, "diciembre": 12,
+    "ene": 1, "feb": 2, "mar": 3, "abr": 4, "may": 5, "jun": 6, "jul": 7, "ago": 8,
+    "sep": 9, "set": 9, "oct": 10, "nov": 11, "dic": 12,
+}
+_MONTH = "(" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")\.?"
+_OF = r"(?:\s+del?\s+|" + _SEP + ")"
+_START = r"(?<![a-z0-9])"
+_END = r"(?![a-z0-9])"
+
+
+def _ordinal(token: str) -> int:
+    return int(token) if token.isdigit() else _ORDINALS[token]
+
+
+# Expresiones de período, de la más específica a la menos: (regex, función -> (año, mes, meses))
+_PATTERNS = [
+    (rf"{_START}{_ORDINAL}{_SEP}trim(?:estre)?\.?{_OF}{_YEAR}{_END}",
+     lambda m: (int(m[2]), 3 * _ordinal(m[1]) - 2, 3)),
+    (rf"{_START}t([1-4]){_SEP}{_YEAR}{_END}", lambda m: (int(m[2]), 3 * int(m[1]) - 2, 3)),
+    (rf"{_START}{_YEAR}{_SEP}t([1-4]){_END}", lambda m: (int(m[1]), 3 * int(m[2]) - 2, 3)),
+    (rf"{_START}{_ORDINAL}{_SEP}sem(?:estre)?\.?{_OF}{_YEAR}{_END}",
+     lambda m: (int(m[2]), 6 * _ordinal(m[1]) - 5, 6)),
+    (rf"{_START}{_MONTH}{_OF}{_YEAR}{_END}", lambda m: (int(m[2]), _MONTHS[m[1]], 1)),
+    (rf"{_START}{_YEAR}[-/](0[1-9]|1[0-2]){_END}", lambda m: (int(m[1]), int(m[2]), 1)),
+    (rf"{_START}(0[1-9]|1[0-2])[-/]{_YEAR}{_END}", lambda m: (int(m[2]), int(m[1]), 1)),
+    (rf"{_START}{_YEAR}\s*[/-]\s*{_YEAR}{_END}",
+     lambda m: (int(m[1]), 1, 12 * (int(m[2]) - int(m[1]) + 1)) if int(m[2]) > int(m[1]) else None),
+    (rf"{_START}(?:a[nñ]o\s+)?{_YEAR}{_END}", lambda m: (int(m[1]), 1, 12)),
+]
+_COMPILED = [(re.compile(pattern), build) for pattern, build in _PATTERNS]
+
+# Rangos "X a Y" ("Primer trimestre 2017 a primer trimestre de 2026", "1980 a 2022")
+_RANGE = re.compile(r"\s+(?:a|al|hasta)\s+")
+
+# Fechas de actualización, que no son el período de los datos: "(actualizado al
+# 23/05/2022)", "(fecha de actualización 17/05/2021)", "Actualización: 22/10/2025"
+_UPDATE = re.compile(r"\(?\s*(?:fecha\s+de\s+)?actualiza(?:do|da|cion)s?(?![a-z])[^)]*\)?")
+
+# Restos que quedan al quitar el período (ej: "Base del tercer trimestre de 2025." -> "Base")
+_DANGLING = re.compile(r"(?:^|\s)(?:del?|al|en|año)\s*$", re.IGNORECASE)
+_EDGES = " \t\n.,;:-_|/()[]"
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(c: str) -> str:
+    folded = fold(c)
+    return folded if len(folded) == 1 else c
+
+
+def _fold_chars(text: str) -> str:
+    """
+    search.fold aplicado carácter a carácter, así las posiciones coinciden con
+    `text` (fold sobre el texto entero une espacios y puede cambiar su largo).
+    Los caracteres que fold no lleva a uno solo (espacios, "ß") quedan igual.
+    """
+    if text.isascii():
+        return text.lower()
+    return "".join(map(_fold_char, text))
+
+
+def _as_ordinal(parts: Tuple[int, int, int]) -> Period:
+    year, month, months = parts
+    return year * 12 + month - 1, months
+
+
+def _period_at(folded: str, pos: int) -> Tuple[Period, int] | None:
+    """Período que empieza exactamente en `pos`, con la posición donde termina."""
+    for pattern, build in _COMPILED:
+        match = pattern.match(folded, pos)
+        if match is not None:
+            parts = build(match)
+            if parts is not None:
+                return _as_ordinal(parts), match.end()
+    return None
+
+
+def _mask_updates(folded: str) -> str:
+    """`folded` con las fechas de actualización reemplazadas por espacios (mismas posiciones)."""
+    return _UPDATE.sub(lambda m: " " * len(m.group()), folded)
+
+
+def strip_updates(text: str) -> str:
+    """`text` sin las fechas de actualización (ej: "Formato txt (actualizado al 23/05/2022)" -> "Formato txt")."""
+    folded = _fold_chars(text)
+    for match in reversed(list(_UPDATE.finditer(folded))):
+        text = text[:match.start()] + " " + text[match.end():]
+    return " ".join(text.split()).rstrip(" .,;:-")
+
+
+def parse_period(text: str) -> Tuple[Period, Tuple[int, int]] | None:
+    """
+    Busca una expresión de período en un texto.
+
+    Reconoce trimestres ("Tercer trimestre 2025", "3er trim. de 2025",
+    "3_Trim_2025", "T3 2025"), semestres, meses ("marzo de 2025", "2025-03"),
+    rangos ("2017 / 2018", "noviembre de 2015 a junio de 2026") y años
+    sueltos. Las fechas de actualización ("actualizado al 23/05/2022") no se
+    consideran períodos.
+
+    Args:
+        text: Texto libre (nombre de archivo, agrupamiento, etc.).
+
+    Returns:
+        Tupla con (período, posición (inicio, fin) de la expresión en `text`),
+        o None si no hay ninguno.
+    """
+    folded = _mask_updates(_fold_chars(text))
+    for pattern, build in _COMPILED:
+        for match in pattern.finditer(folded):
+            parts = build(match)
+            if parts is None:
+                continue
+            period, end = _as_ordinal(parts), match.end()
+            joined = _RANGE.match(folded, end)
+            last = _period_at(folded, joined.end()) if joined else None
+            if last is not None and last[0][0] >= period[0]:
+                (last_start, last_months), end = last
+                period = (period[0], last_start + last_months - period[0])
+            return period, (match.start(), end)
+    return None
+
+
+def _unit_label(start: int, unit: int) -> str:
+    year, month = divmod(start, 12)
+    if unit == 12:
+        return str(year)
+    if unit == 6:
+        return f"{year}-S{month // 6 + 1}"
+    if unit == 3:
+        return f"{year}-T{month // 3 + 1}"
+    return f"{year}-{month + 1:02d}"
+
+
+def period_label(period: Period) -> str:
+    """
+    Etiqueta canónica de un período: "2025", "2025-S2", "2025-T3", "2025-03" o,
+    para rangos, "2017-2018", "2017-T1/2026-T1", "2015-11/2026-06".
+    """
+    start, months = period
+    unit = next(u for u in (12, 6, 3, 1) if start % u == 0 and months % u == 0)
+    last = start + months - unit
+    if last == start:
+        return _unit_label(start, unit)
+    return f"{_unit_label(start, unit)}{'-' if unit == 12 else '/'}{_unit_label(last, unit)}"
+
+
+def _within(inner: Period, outer: Period) -> bool:
+    return outer[0] <= inner[0] and inner[0] + inner[1] <= outer[0] + outer[1]
+
+
+def _without(text: str, span: Tuple[int, int]) -> str:
+    """`text` sin la expresión de período ni los conectores y signos que quedan sueltos."""
+    before = _DANGLING.sub("", text[:span[0]].rstrip(_EDGES)).rstrip(_EDGES)
+    after = text[span[1]:].strip(_EDGES)
+    return " ".join(" ".join(filter(None, (before, after))).split())
+
+
+class Release(BaseModel):
+    period: str
+    start: int  # año * 12 + mes - 1
+    months: int
+    archivos: List[Archivo]
+
+
+class Series(BaseModel):
+    key: str
+    tema: str
+    subtema: str
+    agrupamiento: str  # Sin la expresión de período
+    nombre: str  # Nombre de archivo sin la expresión de período
+    releases: List[Release]  # Ordenadas por período
+
+    @property
+    def label(self) -> str:
+        return " > ".join(filter(None, (self.tema, self.subtema, self.agrupamiento, self.nombre)))
+
+
+class SeriesIndex:
+    """
+    Series de datos del catálogo con sus publicaciones ordenadas por período.
+
+    Un archivo pertenece a una serie si su agrupamiento, su subtema o su
+    nombre incluye una expresión de período. Manda la de la jerarquía
+    (agrupamiento y luego subtema); la del nombre se usa si la jerarquía no
+    tiene período o si es un período contenido en el de la jerarquía (ej: un
+    mes del año del agrupamiento). La serie es la jerarquía y el nombre sin
+    sus expresiones de período ni fechas de actualización, así "Bases de microdatos |
+    Tercer trimestre 2025." / "Formato txt" y la del trimestre anterior
+    "Formato txt (actualizado al 23/05/2022)" quedan juntas.
+    Las consultas por período usan búsqueda binaria sobre los inicios.
+    """
+
+    def __init__(self, series: List[Series], fingerprint: str | None = None):
+        self.series = series
+        self.fingerprint = fingerprint
+        self._by_key = {s.key: s for s in series}
+        self._starts = {s.key: [r.start for r in s.releases] for s in series}
+        self._labels = [(fold(s.label), s) for s in series]
+
+    @classmethod
+    def build(cls, catalog: List[Catalog], fingerprint: str | None = None) -> "SeriesIndex":
+        """
+        Construye el índice a partir del catálogo.
+
+        Args:
+            catalog: Lista de Catalog.
+            fingerprint: Hash del catálogo de origen (para persistir el índice).
+
+        Returns:
+            Índice listo para consultar.
+        """
+        groups: Dict[str, Dict] = {}
+        keys: Dict[Tuple[str, ...], str] = {}  # fold de cada jerarquía, calculado una vez
+        for record in catalog:
+            record_period = None
+            for field in ("agrupamiento", "subtema"):
+                found = parse_period(getattr(record, field))
+                if found is not None:
+                    record_period = field, found
+                    break
+            for archivo in record.archivos:
+                nombre = strip_updates(archivo.nombre_archivo)
+                fields = {"subtema": record.subtema, "agrupamiento": record.agrupamiento, "nombre": nombre}
+                found = parse_period(nombre)
+                if found is not None and (record_period is None or _within(found[0], record_period[1][0])):
+                    period, span = found
+                    fields["nombre"] = _without(nombre, span)
+                    if record_period is not None:  # El período de la jerarquía lo contiene
+                        field, (_, outer) = record_period
+                        fields[field] = _without(getattr(record, field), outer)
+                elif record_period is not None:
+                    field, (period, span) = record_period
+                    fields[field] = _without(getattr(record, field), span)
+                    if found is not None:  # Otra fecha (p. ej. de publicación): no distingue la serie
+                        fields["nombre"] = _without(nombre, found[1])
+                else:
+                    continue
+                names = (record.tema, fields["subtema"], fields["agrupamiento"], fields["nombre"])
+                if names not in keys:
+                    keys[names] = fold(" > ".join(names))
+                group = groups.setdefault(keys[names], {"tema": record.tema, **fields, "periods": {}})
+                group["periods"].setdefault(period, []).append(archivo)
+
+        series = []
+        for key, group in groups.items():
+            periods = group.pop("periods")
+            releases = [
+                Release(period=period_label(period), start=period[0], months=period[1], archivos=archivos)
+                for period, archivos in sorted(periods.items())
+            ]
+            series.append(Series(key=key, releases=releases, **group))
+        return cls(series, fingerprint)
+
+    def get(self, key: str) -> Series | None:
+        """Serie por su clave (ver Series.key)."""
+        return self._by_key.get(key)
+
+    def find(self, query: str) -> List[Series]:
+        """Series cuya jerarquía y nombre contienen todas las palabras de `query` (sin acentos ni mayúsculas)."""
+        terms = fold(query).split()
+        return [s for label, s in self._labels if all(t in label for t in terms)]
+
+    def latest(self, key: str) -> Release:
+        """
+        Última publicación de una serie.
+
+        Raises:
+            KeyError: Si la serie no existe.
+        """
+        return self._by_key[key].releases[-1]
+
+    def between(self, key: str, start: str | Period, end: str | Period) -> List[Release]:
+        """
+        Publicaciones de una serie que empiezan entre dos períodos (inclusive).
+
+        Args:
+            key: Clave de la serie.
+            start: Período inicial, como tupla o texto (ej: "2024", "primer trimestre 2024").
+            end: Período final; se incluye completo (ej: "2025" llega hasta diciembre).
+
+        Returns:
+            Publicaciones en orden de período.
+
+        Raises:
+            KeyError: Si la serie no existe.
+            ValueError: Si `start` o `end` no es un período reconocible.
+        """
+        first, last = _as_period(start), _as_period(end)
+        starts = self._starts[key]
+        lo = bisect.bisect_left(starts, first[0])
+        hi = bisect.bisect_right(starts, last[0] + last[1] - 1)
+        return self._by_key[key].releases[lo:hi]
+
+    def save(self, path: str | Path) -> None:
+        """Guarda el índice en JSON junto con el hash del catálogo de origen."""
+        save_json(path, {
+            "version": INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "series": [s.model_dump() for s in self.series],
+        })
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SeriesIndex | None":
+        """Carga un índice guardado, o None si no existe o es de otra versión."""
+        data = load_json(path)
+        if not data or data.get("version") != INDEX_VERSION:
+            return None
+        return cls([Series.model_validate(s) for s in data["series"]], data.get("fingerprint"))
+
+
+def _as_period(value: str | Period) -> Period:
+    if isinstance(value, tuple):
+        return value
+    found = parse_period(value)
+    if found is None:
+        raise ValueError(f"Período no reconocido: {value}")
+    return found[0]
+
+
+def series_path_for(catalog_path: str | Path) -> Path:
+    """Ruta del índice persistido junto al catálogo (ej: catalogo_indec.series.json)."""
+    return Path(catalog_path).with_suffix(".series.json")
+
+
+def load_or_build_series(catalog_path: str | Path, index_path: str | Path | None = None) -> SeriesIndex:
+    """
+    Carga el índice de series persistido junto al catálogo, o lo construye y
+    guarda si no existe o corresponde a otra versión del catálogo.
+
+    Args:
+        catalog_path: Archivo JSON del catálogo.
+        index_path: Archivo del índice (default: junto al catálogo, *.series.json).
+
+    Returns:
+        SeriesIndex del catálogo actual.
+    """
+    index_path = Path(index_path) if index_path else series_path_for(catalog_path)
+    fingerprint = catalog_fingerprint(catalog_path)
+    index = SeriesIndex.load(index_path)
+    if index is not None and index.fingerprint == fingerprint:
+        return index
+
+    with open(catalog_path, "r", encoding="utf-8") as f:
+        catalog = [Catalog.model_validate(x) for x in json.load(f)]
+    index = SeriesIndex.build(catalog, fingerprint)
+    index.save(index_path)
+    return index
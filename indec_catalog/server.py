@@ -0,0 +1,295 @@
+"""Servidor HTTP del catálogo con índices en memoria, compresión y ETags."""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from indec_catalog.search import fold
+
+try:
+    import brotli
+except ImportError:  # Dependencia opcional: sin brotli se sirve solo gzip
+    brotli = None
+
+DEFAULT_PER_PAGE = 100
+MAX_PER_PAGE = 1000
+RELOAD_CHECK_INTERVAL = 1.0  # Segundos entre chequeos de cambios del archivo
+QUERY_CACHE_SIZE = 256
+
+
+def _extension(url: str) -> str:
+    """Extensión del archivo sin punto (ej: "xlsx"), o "" si no tiene."""
+    name = urlparse(url).path.rsplit("/", 1)[-1]
+    return name.rsplit(".", 1)[-1].lower() if "." in name else ""
+
+
+def _etag(body: bytes, encoding: str = "identity") -> str:
+    """ETag fuerte del cuerpo; cada codificación tiene el suyo porque sus bytes difieren."""
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    return f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Codificaciones de Accept-Encoding con q > 0 (un q inválido cuenta como rechazo)."""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(name)
+    return accepted
+
+
+class CompressedBody:
+    """Cuerpo de respuesta con sus variantes comprimidas y ETags precalculados."""
+
+    def __init__(self, body: bytes, precompress: bool = True):
+        self.variants: Dict[str, bytes] = {"identity": body}
+        if precompress:
+            self.variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(body)
+        self.etags: Dict[str, str] = {encoding: _etag(body, encoding) for encoding in self.variants}
+
+    def negotiate(self, accept_encoding: str) -> Tuple[str, bytes]:
+        """Elige la mejor codificación disponible según Accept-Encoding."""
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.variants:
+                return encoding, self.variants[encoding]
+        return "identity", self.variants["identity"]
+
+
+class CatalogIndex:
+    """
+    Catálogo cargado en memoria con índices por tema, subtema y extensión.
+
+    Las consultas trabajan a nivel de archivo: cada resultado es un archivo con
+    su jerarquía (tema, subtema, agrupamiento).
+    """
+
+    def __init__(self, catalog_path: str | Path):
+        self.catalog_path = Path(catalog_path)
+        stat = os.stat(self.catalog_path)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+
+        raw = self.catalog_path.read_bytes()
+        records = json.loads(raw)
+        self.full = CompressedBody(raw)
+
+        self.files: List[Dict[str, str]] = []
+        self.search_text: List[str] = []
+        self.by_tema: Dict[str, List[int]] = {}
+        self.by_subtema: Dict[str, List[int]] = {}
+        self.by_extension: Dict[str, List[int]] = {}
+        for record in records:
+            for archivo in record["archivos"]:
+                i = len(self.files)
+                self.files.append({
+                    "tema": record["tema"],
+                    "subtema": record["subtema"],
+                    "agrupamiento": record["agrupamiento"],
+                    "nombre_archivo": archivo["nombre_archivo"],
+                    "url": archivo["url"],
+                })
+                self.search_text.append(fold(" ".join((
+                    record["tema"], record["subtema"], record["agrupamiento"], archivo["nombre_archivo"],
+                ))))
+                self.by_tema.setdefault(fold(record["tema"]), []).append(i)
+                self.by_subtema.setdefault(fold(record["subtema"]), []).append(i)
+                self.by_extension.setdefault(_extension(archivo["url"]), []).append(i)
+
+        self._query_cache: Dict[Tuple, CompressedBody] = {}
+        self._lock = threading.Lock()
+
+    def filter(
+        self,
+        tema: str | None = None,
+        subtema: str | None = None,
+        extension: str | None = None,
+        q: str | None = None,
+    ) -> List[int]:
+        """
+        Filtra archivos por igualdad (sin acentos ni mayúsculas) de tema/subtema,
+        extensión y texto libre contenido en la jerarquía o el nombre.
+
+        Returns:
+            Índices de los archivos que cumplen todos los filtros, en orden del catálogo.
+        """
+        candidates: List[List[int]] = []
+        if tema:
+            candidates.append(self.by_tema.get(fold(tema), []))
+        if subtema:
+            candidates.append(self.by_subtema.get(fold(subtema), []))
+        if extension:
+            candidates.append(self.by_extension.get(extension.lower().lstrip("."), []))
+
+        if candidates:
+            smallest = min(candidates, key=len)
+            others = [set(c) for c in candidates if c is not smallest]
+            result = [i for i in smallest if all(i in o for o in others)]
+        else:
+            result = list(range(len(self.files)))
+
+        if q:
+            terms = fold(q).split()
+            result = [i for i in result if all(t in self.search_text[i] for t in terms)]
+        return result
+
+    def query(self, params: Dict[str, str]) -> CompressedBody:
+        """
+        Resuelve una consulta paginada de /archivos y cachea el cuerpo resultante.
+
+        Raises:
+            ValueError: Si page o per_page no son enteros válidos.
+        """
+        page = int(params.get("page", 1))
+        per_page = min(int(params.get("per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+        if page < 1 or per_page < 1:
+            raise ValueError("page y per_page deben ser positivos")
+
+        key = (
+            params.get("tema"), params.get("subtema"), params.get("extension"),
+            params.get("q"), page, per_page,
+        )
+        with self._lock:
+            cached = self._query_cache.get(key)
+        if cached is not None:
+            return cached
+
+        matches = self.filter(params.get("tema"), params.get("subtema"), params.get("extension"), params.get("q"))
+        start = (page - 1) * per_page
+        payload = {
+            "total": len(matches),
+            "page": page,
+            "per_page": per_page,
+            "resultados": [self.files[i] for i in matches[start:start + per_page]],
+        }
+        body = CompressedBody(json.dumps(payload, ensure_ascii=False).encode("utf-8"), precompress=False)
+        with self._lock:
+            if len(self._query_cache) >= QUERY_CACHE_SIZE:
+                self._query_cache.pop(next(iter(self._query_cache)))
+            self._query_cache[key] = body
+        return body
+
+
+class CatalogServer(ThreadingHTTPServer):
+    """Servidor HTTP que recarga el índice cuando cambia el archivo del catálogo."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], catalog_path: str | Path):
+        self.catalog_path = Path(catalog_path)
+        self.index = CatalogIndex(self.catalog_path)
+        self._last_check = time.monotonic()
+        self._reload_lock = threading.Lock()
+        super().__init__(address, CatalogRequestHandler)
+
+    def current_index(self) -> CatalogIndex:
+        """Devuelve el índice vigente, recargándolo si el archivo cambió."""
+        now = time.monotonic()
+        if now - self._last_check < RELOAD_CHECK_INTERVAL:
+            return self.index
+        with self._reload_lock:
+            if now - self._last_check >= RELOAD_CHECK_INTERVAL:
+                self._last_check = now
+                try:
+                    stat = os.stat(self.catalog_path)
+                    if (stat.st_mtime_ns, stat.st_size) != self.index.signature:
+                        self.index = CatalogIndex(self.catalog_path)
+                except (OSError, ValueError):
+                    pass  # Archivo en reemplazo o inválido: se sigue sirviendo la versión anterior
+        return self.index
+
+
+class CatalogRequestHandler(BaseHTTPRequestHandler):
+    """
+    Endpoints:
+        GET /catalogo  Catálogo completo (gzip/br precalculados).
+        GET /archivos  Archivos filtrados por tema, subtema, extension y q, paginados
+                       con page y per_page.
+    """
+
+    server: CatalogServer
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        index = self.server.current_index()
+        try:
+            if parsed.path == "/catalogo":
+                body = index.full
+            elif parsed.path == "/archivos":
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                body = index.query(params)
+            else:
+                self._send_error(HTTPStatus.NOT_FOUND, "Recurso no encontrado")
+                return
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        self._send_body(body)
+
+    def _send_body(self, body: CompressedBody):
+        encoding, content = body.negotiate(self.headers.get("Accept-Encoding", ""))
+        etag = body.etags[encoding]
+        if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _send_error(self, status: HTTPStatus, message: str):
+        content = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def make_server(catalog_path: str | Path, host: str = "127.0.0.1", port: int = 8000) -> CatalogServer:
+    """
+    Crea el servidor del catálogo sin iniciarlo (usar serve_forever()).
+
+    Args:
+        catalog_path: Archivo JSON del catálogo.
+        host: Interfaz donde escuchar.
+        port: Puerto (0 para elegir uno libre).
+
+    Returns:
+        Instancia de CatalogServer.
+
+    Raises:
+        FileNotFoundError: Si no existe el archivo del catálogo.
+        ValueError: Si el catálogo no es JSON válido.
+    """
+    return CatalogServer((host, port), catalog_path)
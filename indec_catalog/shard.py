@@ -0,0 +1,192 @@
+"""Crawl particionado en shards deterministas y combinación de sus salidas parciales."""
+
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from indec_catalog.bases_datos import scrape_bases_datos
+from indec_catalog.cache import load_json, save_json
+from indec_catalog.catalog import _fetch_pages
+from indec_catalog.config import BASE_URL, BASES_DATOS_URL
+from indec_catalog.models import Catalog
+from indec_catalog.negative import NegativeCache
+from indec_catalog.redirects import RedirectMap
+from indec_catalog.sitemap import build_url, extract_sitemap_urls
+
+SHARD_VERSION = 1
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Interpreta una especificación de shard "i/N" (i desde 0).
+
+    Args:
+        value: Texto como "0/4".
+
+    Returns:
+        Tupla (i, N).
+
+    Raises:
+        ValueError: Si el formato es inválido o i no está en [0, N).
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard inválido: {value!r} (formato esperado: i/N)") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard inválido: {value!r} (se requiere 0 <= i < N)")
+    return index, count
+
+
+def shard_of(key: str, count: int) -> int:
+    """
+    Shard al que pertenece una clave (data-view o URL de una fuente).
+
+    Usa SHA-256 y no hash(), que cambia entre procesos: todas las máquinas
+    calculan la misma partición.
+    """
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def _sitemap_fingerprint(links: List[str]) -> str:
+    return hashlib.sha256("\n".join(links).encode("utf-8")).hexdigest()
+
+
+def crawl_shard(
+    index: int,
+    count: int,
+    include_bases_datos: bool = False,
+    show_progress: bool = True,
+    on_page: Callable[[str, Dict], None] | None = None,
+    on_stats: Callable[[str, Dict], None] | None = None,
+    streaming: bool = False,
+    bases_datos_cache: str | Path | None = None,
+    redirects: RedirectMap | None = None,
+    negative: NegativeCache | None = None,
+) -> Dict:
+    """
+    Procesa solo las páginas del MapaSitio que corresponden a un shard.
+
+    Cada página se asigna por hash de su data-view; la página Bases de datos
+    es una unidad más y la procesa un único shard. El resultado guarda la
+    posición de cada página en el MapaSitio, así merge_shards puede armar el
+    catálogo en el mismo orden que una corrida completa.
+
+    Args:
+        index: Número de shard (desde 0).
+        count: Cantidad total de shards.
+        include_bases_datos: Si la corrida completa incluye Bases de datos.
+        show_progress: Si mostrar barra de progreso.
+        on_page: Función llamada con (url, datos del tema) por cada página exitosa.
+        on_stats: Función llamada con (url, métricas) por cada página.
+        streaming: Usar fetch_tema_data_streaming.
+        bases_datos_cache: Caché por tab de Bases de datos.
+        redirects: Mapa de redirecciones entre corridas (ver RedirectMap).
+        negative: Caché de páginas sin datos (ver NegativeCache); las páginas
+            que saltea no figuran en la salida, como en una corrida completa.
+
+    Returns:
+        Salida parcial serializable (ver write_shard).
+    """
+    links = extract_sitemap_urls()
+    urls = [build_url(link, BASE_URL) for link in links]
+    positions = {urls[i]: i for i, link in enumerate(links) if shard_of(link, count) == index}
+
+    final_urls: Dict[str, str] = {}
+
+    def collect(url: str, stats: Dict) -> None:
+        if stats.get("final_url"):
+            final_urls[url] = stats["final_url"]
+        if on_stats is not None:
+            on_stats(url, stats)
+
+    pages, errors = _fetch_pages(
+        list(positions), show_progress, on_page, collect, streaming, redirects, negative=negative
+    )
+
+    bases_datos = None
+    if include_bases_datos and shard_of(BASES_DATOS_URL, count) == index:
+        bases_datos = [c.model_dump() for c in scrape_bases_datos(cache_path=bases_datos_cache)]
+
+    return {
+        "version": SHARD_VERSION,
+        "shard": index,
+        "shards": count,
+        "sitemap": _sitemap_fingerprint(links),
+        "include_bases_datos": include_bases_datos,
+        "pages": [
+            {"position": positions[url], "url": url, "final_url": final_urls.get(url), "record": record}
+            for url, record in pages
+        ],
+        "errors": [{"position": positions[url], "url": url} for url in errors],
+        "bases_datos": bases_datos,
+    }
+
+
+def write_shard(path: str | Path, partial: Dict) -> None:
+    """Guarda la salida parcial de un shard de forma atómica."""
+    save_json(path, partial)
+
+
+def merge_shards(paths: List[str | Path]) -> Tuple[List[Catalog], List[str]]:
+    """
+    Combina las salidas parciales de todos los shards de una corrida.
+
+    Las páginas se ordenan por su posición en el MapaSitio y se deduplican
+    por posición (un shard repetido o re-ejecutado no duplica registros) y por
+    URL final (como en una corrida completa); Bases de datos va al final. Con
+    write_catalog el archivo resultante es idéntico byte a byte al de una
+    corrida en un solo nodo.
+
+    Args:
+        paths: Archivos escritos por write_shard.
+
+    Returns:
+        Tupla con (catálogo, URLs con errores en orden del MapaSitio).
+
+    Raises:
+        ValueError: Si los parciales son de corridas distintas o falta algún shard.
+    """
+    partials = []
+    for path in paths:
+        partial = load_json(path)
+        if not partial or partial.get("version") != SHARD_VERSION:
+            raise ValueError(f"{path} no es una salida parcial válida")
+        partials.append(partial)
+    if not partials:
+        raise ValueError("No se indicaron salidas parciales")
+
+    first = partials[0]
+    for partial in partials:
+        for key in ("shards", "sitemap", "include_bases_datos"):
+            if partial[key] != first[key]:
+                raise ValueError(f"Las salidas parciales no son de la misma corrida (difiere '{key}')")
+    missing = set(range(first["shards"])) - {p["shard"] for p in partials}
+    if missing:
+        raise ValueError(f"Faltan shards: {', '.join(str(i) for i in sorted(missing))}")
+
+    pages: Dict[int, Dict] = {}
+    errors: Dict[int, str] = {}
+    bases_datos = None
+    for partial in partials:
+        for page in partial["pages"]:
+            pages.setdefault(page["position"], page)
+        for error in partial["errors"]:
+            errors.setdefault(error["position"], error["url"])
+        if partial["bases_datos"] is not None:
+            bases_datos = partial["bases_datos"]
+
+    catalog: List[Catalog] = []
+    seen: set = set()
+    for position in sorted(pages):
+        page = pages[position]
+        if page["final_url"] is not None:
+            if page["final_url"] in seen:
+                continue
+            seen.add(page["final_url"])
+        if page["record"]["archivos"] != []:
+            catalog.append(Catalog.model_validate(page["record"]))
+    if first["include_bases_datos"]:
+        catalog += [Catalog.model_validate(x) for x in bases_datos or []]
+    return catalog, [errors[position] for position in sorted(errors) if position not in pages]
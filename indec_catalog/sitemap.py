@@ -1,11 +1,21 @@
 """Funciones para extraer URLs del sitemap HTML del INDEC."""
 
+import asyncio
 import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Tuple
+from urllib.parse import urlparse
+
 import requests
-from typing import List
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+from lxml import etree
+
+from indec_catalog.config import SITEMAP_URL, SITEMAP_XML_URL, DEFAULT_SITEMAP_REGEX, HTTP_TIMEOUT, STREAM_CHUNK_SIZE
+from indec_catalog.http import response_charset
+from indec_catalog.search import fold
 
-from indec_catalog.config import SITEMAP_URL, DEFAULT_SITEMAP_REGEX, HTTP_TIMEOUT
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
 
 
 def build_url(data_view: str, base_url: str) -> str:
@@ -24,8 +34,45 @@ def build_url(data_view: str, base_url: str) -> str:
     return url
 
 
+class SitemapFilter:
+    """
+    Selección de páginas del MapaSitio por su ubicación en el árbol.
+
+    `tema` y `subtema` se comparan (sin acentos ni mayúsculas) con dos niveles
+    consecutivos de la ruta de la página, en cualquier profundidad, para
+    tolerar títulos del MapaSitio por encima de los temas; `path_regex` se
+    busca en la ruta completa, con los niveles unidos por " > " (ej:
+    "Sociedad > Trabajo e ingresos > Mercado de trabajo"). Una página se
+    selecciona si cumple todos los criterios indicados.
+    """
+
+    def __init__(self, tema: str | None = None, subtema: str | None = None, path_regex: str | None = None):
+        """
+        Raises:
+            re.error: Si `path_regex` no es una expresión regular válida.
+        """
+        self.tema = fold(tema) if tema else None
+        self.subtema = fold(subtema) if subtema else None
+        self.path_regex = re.compile(path_regex, re.IGNORECASE) if path_regex else None
+
+    def matches(self, path: List[str]) -> bool:
+        """True si la página con ruta `path` (etiquetas desde la raíz) cumple el filtro."""
+        if self.tema is not None or self.subtema is not None:
+            folded = [fold(label) for label in path] + [None]
+            if not any(
+                (self.tema is None or folded[i] == self.tema)
+                and (self.subtema is None or folded[i + 1] == self.subtema)
+                for i in range(len(path))
+            ):
+                return False
+        return self.path_regex is None or self.path_regex.search(" > ".join(path)) is not None
+
+
 def extract_sitemap_urls(
-    sitemap_url: str = SITEMAP_URL, regex_pattern: str = DEFAULT_SITEMAP_REGEX
+    sitemap_url: str = SITEMAP_URL,
+    regex_pattern: str = DEFAULT_SITEMAP_REGEX,
+    sitemap_filter: SitemapFilter | None = None,
+    session: requests.Session | None = None,
 ) -> List[str]:
     """
     Extrae valores del atributo data-view de elementos <li> en la página del sitemap.
@@ -34,6 +81,9 @@ def extract_sitemap_urls(
     Args:
         sitemap_url: URL de la página del sitemap.
         regex_pattern: Patrón regex para filtrar valores de data-view.
+        sitemap_filter: Si se indica, solo las páginas cuya ubicación en el
+            árbol del MapaSitio lo cumple.
+        session: Sesión HTTP compartida (default: una petición sin sesión).
         
     Returns:
         Lista de valores de data-view que coinciden con el patrón.
@@ -41,10 +91,26 @@ def extract_sitemap_urls(
     Raises:
         requests.RequestException: Si falla la petición HTTP.
     """
-    response = requests.get(sitemap_url, timeout=HTTP_TIMEOUT)
+    response = (session or requests).get(sitemap_url, timeout=HTTP_TIMEOUT)
     response.raise_for_status()
     
-    soup = BeautifulSoup(response.content, 'html.parser')
+    if sitemap_filter is not None:
+        return filter_sitemap(parse_sitemap_tree(response.content, regex_pattern), sitemap_filter)
+    return parse_sitemap_html(response.content, regex_pattern)
+
+
+def parse_sitemap_html(content: bytes, regex_pattern: str = DEFAULT_SITEMAP_REGEX) -> List[str]:
+    """
+    Extrae los data-view que coinciden con el patrón del HTML del MapaSitio.
+
+    Args:
+        content: Cuerpo de la respuesta HTTP.
+        regex_pattern: Patrón regex para filtrar valores de data-view.
+
+    Returns:
+        Lista de valores de data-view que coinciden con el patrón.
+    """
+    soup = BeautifulSoup(content, 'html.parser')
     
     urls = []
     for li in soup.find_all('li', attrs={'data-view': True}):
@@ -56,3 +122,317 @@ def extract_sitemap_urls(
     
     return urls
 
+
+class _DataViewParser:
+    """Parser incremental del MapaSitio: entrega los data-view a medida que llegan los chunks."""
+
+    def __init__(self, regex_pattern: str, encoding: str = "utf-8"):
+        self.regex = re.compile(regex_pattern)
+        self.parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+
+    def _read(self) -> List[str]:
+        found = []
+        for event, el in self.parser.read_events():
+            if el.tag != "li":
+                continue
+            if event == "start":
+                data_view = el.get("data-view")
+                if data_view and self.regex.search(data_view):
+                    found.append(data_view)
+            else:
+                el.clear(keep_tail=True)  # Ya entregado: se libera su subárbol
+        return found
+
+    def feed(self, chunk: bytes) -> List[str]:
+        """Procesa un chunk y retorna los data-view que se completaron en él."""
+        self.parser.feed(chunk)
+        return self._read()
+
+    def close(self) -> List[str]:
+        """Termina el parseo y retorna los data-view pendientes."""
+        self.parser.close()
+        return self._read()
+
+
+def _iter_data_views(chunks: Iterable[bytes], regex_pattern: str, encoding: str = "utf-8") -> Iterator[str]:
+    parser = _DataViewParser(regex_pattern, encoding)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def iter_sitemap_urls(
+    sitemap_url: str = SITEMAP_URL,
+    regex_pattern: str = DEFAULT_SITEMAP_REGEX,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    session: requests.Session | None = None,
+) -> Iterator[str]:
+    """
+    Variante de extract_sitemap_urls que entrega los data-view a medida que se descargan.
+
+    El cuerpo del MapaSitio se lee en chunks que alimentan un parser
+    incremental de lxml; cada <li> con data-view se entrega al abrirse, así
+    el procesamiento de las primeras páginas puede empezar antes de terminar
+    la descarga del sitemap. El orden es el mismo que el de extract_sitemap_urls.
+
+    Args:
+        sitemap_url: URL de la página del sitemap.
+        regex_pattern: Patrón regex para filtrar valores de data-view.
+        chunk_size: Tamaño de cada chunk leído.
+        session: Sesión HTTP compartida (default: una petición sin sesión).
+
+    Yields:
+        Valores de data-view que coinciden con el patrón.
+
+    Raises:
+        requests.RequestException: Si falla la petición HTTP.
+    """
+    response = (session or requests).get(sitemap_url, timeout=HTTP_TIMEOUT, stream=True)
+    try:
+        response.raise_for_status()
+        yield from _iter_data_views(
+            response.iter_content(chunk_size),
+            regex_pattern,
+            response_charset(response.headers.get("Content-Type", "")),
+        )
+    finally:
+        response.close()
+
+
+def _own_label(li: Tag) -> str:
+    """Texto de un <li> sin el de sus listas anidadas."""
+    parts: List[str] = []
+    for child in li.children:
+        if getattr(child, "name", None) in ("ul", "ol"):
+            break
+        parts.append(child.get_text(" ", strip=True) if isinstance(child, Tag) else str(child).strip())
+    return " ".join(filter(None, parts))
+
+
+def _list_label(lst: Tag) -> str:
+    """
+    Etiqueta de una lista del árbol: el texto propio del <li> que la contiene o,
+    si cuelga de otro elemento, el del elemento hermano anterior (p. ej. un título).
+    """
+    if lst.parent is not None and lst.parent.name == "li":
+        return _own_label(lst.parent)
+    previous = lst.find_previous_sibling()
+    if previous is None or previous.name in ("ul", "ol"):
+        return ""
+    return previous.get_text(" ", strip=True)
+
+
+def parse_sitemap_tree(content: bytes, regex_pattern: str = DEFAULT_SITEMAP_REGEX) -> List[Tuple[str, List[str]]]:
+    """
+    Extrae los data-view del MapaSitio junto con su ubicación en el árbol.
+
+    Args:
+        content: Cuerpo de la respuesta HTTP.
+        regex_pattern: Patrón regex para filtrar valores de data-view.
+
+    Returns:
+        Lista de tuplas (data_view, ruta) en el orden del MapaSitio, donde la
+        ruta son las etiquetas de las listas que contienen al <li>, desde la
+        raíz, más la del propio <li> (ej: ["Sociedad", "Trabajo e ingresos",
+        "Mercado de trabajo"]).
+    """
+    soup = BeautifulSoup(content, "html.parser")
+    labels: Dict[int, str] = {}  # Etiqueta por lista, calculada una vez
+
+    entries = []
+    for li in soup.find_all("li", attrs={"data-view": True}):
+        data_view = str(li.get("data-view") or "")
+        if not data_view or not re.search(regex_pattern, data_view):
+            continue
+        path = []
+        for lst in reversed(li.find_parents(["ul", "ol"])):
+            if id(lst) not in labels:
+                labels[id(lst)] = _list_label(lst)
+            if labels[id(lst)]:
+                path.append(labels[id(lst)])
+        own = _own_label(li)
+        if own:
+            path.append(own)
+        entries.append((data_view, path))
+    return entries
+
+
+def filter_sitemap(entries: List[Tuple[str, List[str]]], sitemap_filter: SitemapFilter) -> List[str]:
+    """
+    Selecciona las páginas del árbol del MapaSitio que cumplen un filtro.
+
+    Args:
+        entries: Tuplas (data_view, ruta) de parse_sitemap_tree.
+        sitemap_filter: Criterios de selección.
+
+    Returns:
+        Lista de data-view seleccionados, en orden.
+    """
+    return [data_view for data_view, path in entries if sitemap_filter.matches(path)]
+
+
+async def aextract_sitemap_urls(
+    client,
+    sitemap_url: str = SITEMAP_URL,
+    regex_pattern: str = DEFAULT_SITEMAP_REGEX,
+    sitemap_filter: SitemapFilter | None = None,
+) -> List[str]:
+    """
+    Versión asíncrona de extract_sitemap_urls.
+
+    Args:
+        client: httpx.AsyncClient compartido.
+        sitemap_url: URL de la página del sitemap.
+        regex_pattern: Patrón regex para filtrar valores de data-view.
+        sitemap_filter: Si se indica, solo las páginas cuya ubicación en el
+            árbol del MapaSitio lo cumple.
+
+    Returns:
+        Lista de valores de data-view que coinciden con el patrón.
+
+    Raises:
+        httpx.HTTPError: Si falla la petición HTTP.
+    """
+    response = await client.get(sitemap_url, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    if sitemap_filter is not None:
+        entries = await asyncio.to_thread(parse_sitemap_tree, response.content, regex_pattern)
+        return filter_sitemap(entries, sitemap_filter)
+    return await asyncio.to_thread(parse_sitemap_html, response.content, regex_pattern)
+
+
+async def aiter_sitemap_urls(
+    client,
+    sitemap_url: str = SITEMAP_URL,
+    regex_pattern: str = DEFAULT_SITEMAP_REGEX,
+) -> AsyncIterator[str]:
+    """
+    Versión asíncrona de iter_sitemap_urls.
+
+    Args:
+        client: httpx.AsyncClient compartido.
+        sitemap_url: URL de la página del sitemap.
+        regex_pattern: Patrón regex para filtrar valores de data-view.
+
+    Yields:
+        Valores de data-view que coinciden con el patrón.
+
+    Raises:
+        httpx.HTTPError: Si falla la petición HTTP.
+    """
+    async with client.stream("GET", sitemap_url, timeout=HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        parser = _DataViewParser(regex_pattern, response_charset(response.headers.get("Content-Type", "")))
+        async for chunk in response.aiter_bytes():
+            for data_view in parser.feed(chunk):
+                yield data_view
+        for data_view in parser.close():
+            yield data_view
+
+
+def loc_to_data_view(loc: str) -> str:
+    """
+    Convierte un <loc> de sitemap.xml al formato data-view del MapaSitio.
+
+    Args:
+        loc: URL del sitemap (ej: "https://www.indec.gob.ar/Nivel4-Tema-2-41-170").
+
+    Returns:
+        Valor equivalente a data-view (ej: "Nivel4/Tema/2/41/170").
+    """
+    path = urlparse(loc).path.strip("/")
+    if "/" not in path:
+        path = path.replace("-", "/")
+    return path
+
+
+def parse_lastmod(value: str | None) -> datetime | None:
+    """
+    Parsea un <lastmod> (formato W3C Datetime) a datetime con zona horaria.
+
+    Args:
+        value: Texto del elemento, p. ej. "2025-03-14" o "2025-03-14T10:00:00Z".
+
+    Returns:
+        datetime en UTC si no trae zona, o None si está vacío o es inválido.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def iter_sitemap_xml(
+    sitemap_url: str = SITEMAP_XML_URL,
+    regex_pattern: str = DEFAULT_SITEMAP_REGEX,
+    session: requests.Session | None = None,
+) -> Iterator[Tuple[str, datetime | None]]:
+    """
+    Recorre sitemap.xml en streaming (iterparse) y devuelve data-view y <lastmod>.
+
+    El cuerpo se parsea a medida que llega y cada <url> se descarta tras
+    procesarse, por lo que la memoria usada no depende del tamaño del sitemap.
+
+    Args:
+        sitemap_url: URL del sitemap XML.
+        regex_pattern: Patrón regex para filtrar los valores de data-view.
+        session: Sesión HTTP compartida (default: una petición sin sesión).
+
+    Yields:
+        Tuplas (data_view, lastmod) en el orden del sitemap.
+
+    Raises:
+        requests.RequestException: Si falla la petición HTTP.
+        xml.etree.ElementTree.ParseError: Si el XML es inválido.
+    """
+    response = (session or requests).get(sitemap_url, timeout=HTTP_TIMEOUT, stream=True)
+    root = None
+    try:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        for event, elem in ET.iterparse(response.raw, events=("start", "end")):
+            if root is None:
+                root = elem
+            if event != "end" or elem.tag != f"{SITEMAP_NS}url":
+                continue
+            loc = elem.findtext(f"{SITEMAP_NS}loc")
+            lastmod = elem.findtext(f"{SITEMAP_NS}lastmod")
+            root.clear()
+            if not loc:
+                continue
+            data_view = loc_to_data_view(loc.strip())
+            if re.search(regex_pattern, data_view):
+                yield data_view, parse_lastmod(lastmod)
+    finally:
+        response.close()
+
+
+def extract_sitemap_lastmod(
+    sitemap_url: str = SITEMAP_XML_URL,
+    regex_pattern: str = DEFAULT_SITEMAP_REGEX,
+    session: requests.Session | None = None,
+) -> Dict[str, datetime | None]:
+    """
+    Extrae los data-view de sitemap.xml junto con su fecha de modificación.
+
+    Args:
+        sitemap_url: URL del sitemap XML.
+        regex_pattern: Patrón regex para filtrar los valores de data-view.
+        session: Sesión HTTP compartida (default: una petición sin sesión).
+
+    Returns:
+        Diccionario data_view -> lastmod (None si el sitemap no lo informa), en orden.
+
+    Raises:
+        requests.RequestException: Si falla la petición HTTP.
+        xml.etree.ElementTree.ParseError: Si el XML es inválido.
+    """
+    return dict(iter_sitemap_xml(sitemap_url, regex_pattern, session))
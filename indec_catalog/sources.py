@@ -0,0 +1,422 @@
+"""Registro de fuentes del catálogo y orquestación concurrente de sus crawls."""
+
+import asyncio
+import copy
+import queue
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import requests
+from pydantic import BaseModel
+
+from indec_catalog.catalog import (
+    agenerate_catalog_bases_datos,
+    agenerate_catalog_with_errors,
+    generate_catalog_bases_datos,
+    generate_catalog_incremental,
+    generate_catalog_with_errors,
+)
+from indec_catalog.config import (
+    ASYNC_CONCURRENCY,
+    BASES_DATOS_URL,
+    DISCOVERY_MAX_DEPTH,
+    DISCOVERY_MAX_PAGES,
+)
+from indec_catalog.deadline import PageHistory, fits_before, generate_catalog_deadline
+from indec_catalog.discovery import VisitStore, discover, sitemap_seeds
+from indec_catalog.http import create_session
+from indec_catalog.models import Catalog
+from indec_catalog.negative import NegativeCache
+from indec_catalog.redirects import RedirectMap
+from indec_catalog.sitemap import SitemapFilter
+from indec_catalog.timings import PageTimings
+
+
+class SourceContext:
+    """Parámetros de una corrida compartidos por todas las fuentes."""
+
+    def __init__(
+        self,
+        show_progress: bool = True,
+        on_page: Callable[[str, Dict], None] | None = None,
+        on_stats: Callable[[str, Dict], None] | None = None,
+        streaming: bool = False,
+        done: Dict[str, object] | None = None,
+        redirects: RedirectMap | None = None,
+        concurrency: int = ASYNC_CONCURRENCY,
+        incremental_state: str | Path | None = None,
+        bases_datos_cache: str | Path | None = None,
+        deadline: float | None = None,
+        history: PageHistory | None = None,
+        discovery_store: str | Path | None = None,
+        discovery_depth: int = DISCOVERY_MAX_DEPTH,
+        discovery_pages: int = DISCOVERY_MAX_PAGES,
+        negative: NegativeCache | None = None,
+        sitemap_filter: SitemapFilter | None = None,
+        timings: PageTimings | None = None,
+        session: requests.Session | None = None,
+    ):
+        """
+        Args:
+            show_progress: Si mostrar barra de progreso.
+            on_page: Función llamada con (url, datos del tema) por cada página exitosa.
+            on_stats: Función llamada con (url, métricas) por cada página.
+            streaming: Usar fetch_tema_data_streaming en el crawl sincrónico.
+            done: Resultados ya obtenidos por URL (p. ej. de un CrawlJournal).
+            redirects: Mapa de redirecciones entre corridas (ver RedirectMap).
+            concurrency: Páginas simultáneas en el crawl asíncrono.
+            incremental_state: Estado de generate_catalog_incremental; si se
+                indica, MapaSitio descarga solo las páginas modificadas.
+            bases_datos_cache: Caché por tab de Bases de datos.
+            deadline: Instante límite (time.monotonic) del crawl sincrónico de
+                todas las fuentes: las páginas del MapaSitio y Bases de datos
+                que no entran se completan desde `history`, y el
+                descubrimiento sigue solo con sus visitas guardadas.
+            history: Historial de páginas (ver PageHistory).
+            discovery_store: Base SQLite de visitas del crawler de descubrimiento.
+            discovery_depth: Profundidad máxima del descubrimiento.
+            discovery_pages: Páginas máximas del descubrimiento.
+            negative: Caché de páginas sin datos que MapaSitio saltea hasta
+                su re-verificación (ver NegativeCache).
+            sitemap_filter: Procesar solo las páginas del MapaSitio que lo
+                cumplen (crawl completo, sincrónico o asíncrono).
+            timings: Duraciones de corridas anteriores con las que el crawl
+                asíncrono de MapaSitio ordena sus descargas (ver PageTimings).
+            session: Sesión HTTP de los crawls sincrónicos; run_sources crea
+                una compartida por todas las fuentes si no se indica.
+        """
+        self.show_progress = show_progress
+        self.on_page = on_page
+        self.on_stats = on_stats
+        self.streaming = streaming
+        self.done = done or {}
+        self.redirects = redirects
+        self.concurrency = concurrency
+        self.incremental_state = incremental_state
+        self.bases_datos_cache = bases_datos_cache
+        self.deadline = deadline
+        self.history = history
+        self.discovery_store = discovery_store
+        self.discovery_depth = discovery_depth
+        self.discovery_pages = discovery_pages
+        self.negative = negative
+        self.sitemap_filter = sitemap_filter
+        self.timings = timings
+        self.session = session
+
+
+class SourceResult(BaseModel):
+    name: str
+    records: List[Catalog]
+    errors: List[str] = []
+    url: str | None = None  # Página única de la fuente, si la tiene
+    stats: Dict = {}
+    stale: List[str] = []  # URLs completadas con datos de una corrida anterior
+
+
+class Source(ABC):
+    """
+    Fuente de registros del catálogo.
+
+    Cada fuente implementa `crawl` (sincrónico, con requests) y `acrawl`
+    (sobre un httpx.AsyncClient compartido) y devuelve sus registros ya
+    filtrados. Las fuentes de una sola página indican su `url`: el CLI la usa
+    como clave para el diario, SQLite y el perfilado.
+    """
+
+    name: str = ""
+    description: str = ""
+    url: str | None = None
+    default: bool = False  # Habilitada si no se eligen fuentes explícitamente
+
+    @abstractmethod
+    def crawl(self, context: SourceContext) -> SourceResult:
+        """Corre el crawl sincrónico de la fuente."""
+
+    @abstractmethod
+    async def acrawl(self, client, context: SourceContext) -> SourceResult:
+        """Corre el crawl asíncrono de la fuente sobre `client`."""
+
+
+class MapaSitioSource(Source):
+    name = "mapa_sitio"
+    description = "Páginas Nivel4 listadas en el MapaSitio"
+    default = True
+
+    def crawl(self, context: SourceContext) -> SourceResult:
+        if context.deadline is not None:
+            raw, errors, stale = generate_catalog_deadline(
+                context.deadline,
+                context.history if context.history is not None else PageHistory(),
+                show_progress=context.show_progress,
+                on_page=context.on_page,
+                on_stats=context.on_stats,
+                streaming=context.streaming,
+                redirects=context.redirects,
+                negative=context.negative,
+                session=context.session,
+            )
+            return SourceResult(name=self.name, records=_records(raw), errors=errors, stale=stale)
+        if context.incremental_state is not None:
+            raw, errors = generate_catalog_incremental(
+                context.incremental_state,
+                show_progress=context.show_progress,
+                on_page=context.on_page,
+                on_stats=context.on_stats,
+                streaming=context.streaming,
+                redirects=context.redirects,
+                negative=context.negative,
+                session=context.session,
+            )
+        else:
+            raw, errors = generate_catalog_with_errors(
+                show_progress=context.show_progress,
+                on_page=context.on_page,
+                on_stats=context.on_stats,
+                streaming=context.streaming,
+                done=context.done,
+                redirects=context.redirects,
+                negative=context.negative,
+                sitemap_filter=context.sitemap_filter,
+                session=context.session,
+            )
+        return SourceResult(name=self.name, records=_records(raw), errors=errors)
+
+    async def acrawl(self, client, context: SourceContext) -> SourceResult:
+        raw, errors = await agenerate_catalog_with_errors(
+            show_progress=context.show_progress,
+            concurrency=context.concurrency,
+            client=client,
+            on_page=context.on_page,
+            on_stats=context.on_stats,
+            redirects=context.redirects,
+            negative=context.negative,
+            sitemap_filter=context.sitemap_filter,
+            timings=context.timings,
+            done=context.done,
+        )
+        return SourceResult(name=self.name, records=_records(raw), errors=errors)
+
+
+class BasesDatosSource(Source):
+    name = "bases_datos"
+    description = "Página Institucional Bases de datos"
+    url = BASES_DATOS_URL
+
+    def crawl(self, context: SourceContext) -> SourceResult:
+        if self.url in context.done:
+            records = [Catalog.model_validate(x) for x in context.done[self.url]]
+            return SourceResult(name=self.name, records=records, url=self.url)
+        if context.deadline is not None and not fits_before(context.deadline):
+            # Como las páginas del MapaSitio que no entran: se completa con la corrida anterior
+            previous = context.history.entries.get(self.url) if context.history is not None else None
+            if previous is None:
+                return SourceResult(name=self.name, records=[], url=self.url)
+            records = [Catalog.model_validate(x) for x in previous["record"]]
+            return SourceResult(name=self.name, records=records, url=self.url, stale=[self.url])
+        stats: Dict = {}
+        records = generate_catalog_bases_datos(
+            cache_path=context.bases_datos_cache, stats=stats, session=context.session
+        )
+        return SourceResult(name=self.name, records=records, url=self.url, stats=stats)
+
+    async def acrawl(self, client, context: SourceContext) -> SourceResult:
+        if self.url in context.done:
+            records = [Catalog.model_validate(x) for x in context.done[self.url]]
+            return SourceResult(name=self.name, records=records, url=self.url)
+        records = await agenerate_catalog_bases_datos(client=client, cache_path=context.bases_datos_cache)
+        return SourceResult(name=self.name, records=records, url=self.url)
+
+
+class DiscoverySource(Source):
+    name = "descubrimiento"
+    description = "Páginas internas enlazadas desde el MapaSitio (recorrido en anchura)"
+
+    def crawl(self, context: SourceContext) -> SourceResult:
+        seeds, nivel4 = sitemap_seeds(session=context.session)
+        store = VisitStore(context.discovery_store)
+        try:
+            raw, errors, stats = discover(
+                seeds,
+                store,
+                exclude=nivel4,
+                max_depth=context.discovery_depth,
+                max_pages=context.discovery_pages,
+                show_progress=context.show_progress,
+                on_page=context.on_page,
+                on_stats=context.on_stats,
+                session=context.session,
+                stop=(lambda: not fits_before(context.deadline)) if context.deadline is not None else None,
+            )
+        finally:
+            store.close()
+        return SourceResult(name=self.name, records=_records(raw), errors=errors, stats=stats)
+
+    async def acrawl(self, client, context: SourceContext) -> SourceResult:
+        # El recorrido es secuencial por cortesía con el servidor: no aprovecha el cliente compartido
+        return await asyncio.to_thread(self.crawl, context)
+
+
+def _records(raw: List[Dict]) -> List[Catalog]:
+    return [Catalog.model_validate(x) for x in raw if x["archivos"] != []]
+
+
+SOURCES: Dict[str, Source] = {}
+
+
+def register_source(source: Source) -> Source:
+    """
+    Registra una fuente. El orden de registro es el orden de sus registros en el catálogo.
+
+    Raises:
+        ValueError: Si ya hay una fuente con el mismo nombre.
+    """
+    if source.name in SOURCES:
+        raise ValueError(f"Fuente duplicada: {source.name!r}")
+    SOURCES[source.name] = source
+    return source
+
+
+register_source(MapaSitioSource())
+register_source(BasesDatosSource())
+register_source(DiscoverySource())
+
+
+def select_sources(names: Iterable[str] | None = None, exclude: Iterable[str] = ()) -> List[Source]:
+    """
+    Fuentes a procesar, en orden de registro.
+
+    Args:
+        names: Fuentes habilitadas (default: las marcadas como `default`).
+        exclude: Fuentes a deshabilitar.
+
+    Returns:
+        Lista de Source.
+
+    Raises:
+        ValueError: Si algún nombre no corresponde a una fuente registrada.
+    """
+    exclude = set(exclude)
+    wanted = {s.name for s in SOURCES.values() if s.default} if names is None else set(names)
+    unknown = (wanted | exclude) - set(SOURCES)
+    if unknown:
+        raise ValueError(
+            f"Fuente desconocida: {', '.join(sorted(unknown))} (disponibles: {', '.join(SOURCES)})"
+        )
+    return [s for s in SOURCES.values() if s.name in wanted - exclude]
+
+
+def run_sources(
+    sources: List[Source],
+    context: SourceContext,
+    on_source: Callable[[SourceResult], None] | None = None,
+) -> List[SourceResult]:
+    """
+    Ejecuta el crawl sincrónico de varias fuentes en paralelo, una por thread.
+
+    Los callbacks (`on_page`, `on_stats` del contexto y `on_source`) se
+    ejecutan siempre en el thread que llama, en el orden en que ocurren, así
+    pueden escribir en un CrawlJournal o una conexión SQLite sin locks. Todas
+    las fuentes comparten una requests.Session (la del contexto o una creada
+    acá), así reutilizan el mismo pool de conexiones keep-alive.
+
+    Args:
+        sources: Fuentes a procesar (ver select_sources).
+        context: Parámetros de la corrida.
+        on_source: Función llamada con el resultado de cada fuente al terminar.
+
+    Returns:
+        Resultados en el orden de `sources`.
+
+    Raises:
+        Exception: La primera excepción de una fuente (en el orden de `sources`),
+            una vez terminadas todas.
+    """
+    events: queue.Queue = queue.Queue()
+
+    def relay(callback):
+        if callback is None:
+            return None
+        return lambda *args: events.put((callback, args))
+
+    worker_context = copy.copy(context)
+    worker_context.on_page = relay(context.on_page)
+    worker_context.on_stats = relay(context.on_stats)
+    own_session = context.session is None
+    if own_session:
+        worker_context.session = create_session(max(len(sources), 1))
+    notify = relay(on_source)
+    outcomes: List = [None] * len(sources)
+
+    def work(i: int, source: Source) -> None:
+        try:
+            outcomes[i] = source.crawl(worker_context)
+            if notify is not None:
+                notify(outcomes[i])
+        except BaseException as e:
+            outcomes[i] = e
+
+    # Threads daemon: un Ctrl+C en el thread principal no espera a las fuentes en curso
+    threads = [threading.Thread(target=work, args=(i, s), daemon=True) for i, s in enumerate(sources)]
+    for thread in threads:
+        thread.start()
+    try:
+        while any(t.is_alive() for t in threads) or not events.empty():
+            try:
+                callback, args = events.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            callback(*args)
+    finally:
+        if own_session:
+            worker_context.session.close()
+
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+    return outcomes
+
+
+async def arun_sources(
+    sources: List[Source],
+    client,
+    context: SourceContext,
+    on_source: Callable[[SourceResult], None] | None = None,
+) -> List[SourceResult]:
+    """
+    Versión asíncrona de run_sources: todas las fuentes comparten `client`.
+
+    Args:
+        sources: Fuentes a procesar.
+        client: httpx.AsyncClient compartido (ver create_async_client).
+        context: Parámetros de la corrida.
+        on_source: Función llamada con el resultado de cada fuente al terminar.
+
+    Returns:
+        Resultados en el orden de `sources`.
+    """
+
+    async def crawl(source: Source) -> SourceResult:
+        result = await source.acrawl(client, context)
+        if on_source is not None:
+            on_source(result)
+        return result
+
+    return list(await asyncio.gather(*(crawl(source) for source in sources)))
+
+
+def combine_results(results: List[SourceResult]) -> Tuple[List[Catalog], List[str]]:
+    """
+    Une los resultados de las fuentes en un catálogo.
+
+    Returns:
+        Tupla con (catálogo en el orden de las fuentes, URLs con errores).
+    """
+    catalog: List[Catalog] = []
+    errors: List[str] = []
+    for result in results:
+        catalog += result.records
+        errors += result.errors
+    return catalog, errors
@@ -0,0 +1,306 @@
+"""Almacenamiento del catálogo en SQLite con búsqueda FTS5 y upserts incrementales."""
+
+import re
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List
+from urllib.parse import urlsplit, urlunsplit
+
+from indec_catalog.models import Catalog
+
+# Bases creadas antes de guardar la URL original: group_files.url tenía la URL canónica
+MIGRATE_CANONICAL_URL = """
+ALTER TABLE files RENAME COLUMN url TO canonical_url;
+ALTER TABLE group_files RENAME COLUMN url TO canonical_url;
+ALTER TABLE group_files ADD COLUMN url TEXT NOT NULL DEFAULT '';
+UPDATE group_files SET url = canonical_url;
+DROP INDEX IF EXISTS group_files_url;
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    fetched_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS groups (
+    id INTEGER PRIMARY KEY,
+    tema TEXT NOT NULL,
+    subtema TEXT NOT NULL,
+    agrupamiento TEXT NOT NULL,
+    page_url TEXT REFERENCES pages(url),
+    position INTEGER NOT NULL,
+    UNIQUE (tema, subtema, agrupamiento)
+);
+CREATE TABLE IF NOT EXISTS files (
+    canonical_url TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS group_files (
+    group_id INTEGER NOT NULL REFERENCES groups(id),
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    canonical_url TEXT NOT NULL REFERENCES files(canonical_url),
+    nombre_archivo TEXT NOT NULL,
+    PRIMARY KEY (group_id, position)
+);
+CREATE INDEX IF NOT EXISTS group_files_canonical_url ON group_files(canonical_url);
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+    nombre_archivo, jerarquia, tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS group_files_ai AFTER INSERT ON group_files BEGIN
+    INSERT INTO files_fts(rowid, nombre_archivo, jerarquia)
+    SELECT new.rowid, new.nombre_archivo, g.tema || ' > ' || g.subtema || ' > ' || g.agrupamiento
+    FROM groups g WHERE g.id = new.group_id;
+END;
+CREATE TRIGGER IF NOT EXISTS group_files_ad AFTER DELETE ON group_files BEGIN
+    DELETE FROM files_fts WHERE rowid = old.rowid;
+END;
+CREATE TRIGGER IF NOT EXISTS group_files_au AFTER UPDATE ON group_files BEGIN
+    UPDATE files_fts SET nombre_archivo = new.nombre_archivo WHERE rowid = new.rowid;
+END;
+"""
+
+DEFAULT_BATCH_SIZE = 200
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normaliza la URL de un archivo para usarla como clave de deduplicación.
+
+    Pasa esquema y host a minúsculas, quita el puerto por defecto, el fragmento
+    y las barras duplicadas en la ruta.
+
+    Args:
+        url: URL absoluta.
+
+    Returns:
+        URL canónica.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rsplit(":", 1)[-1]) in (("http", "80"), ("https", "443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    path = re.sub(r"/{2,}", "/", parts.path)
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+class CatalogStore:
+    """
+    Catálogo persistido en SQLite (modo WAL).
+
+    Tablas normalizadas: pages (páginas de origen), groups (clave
+    tema/subtema/agrupamiento), files (clave URL canónica) y group_files
+    (archivos de cada grupo, en orden, con la URL tal como figura en el
+    catálogo y su forma canónica). Las escrituras se acumulan y se
+    confirman por lotes; solo se modifican las filas que cambiaron, de modo que
+    otros procesos pueden leer mientras un crawl escribe.
+    """
+
+    def __init__(self, path: str | Path, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self._migrate()
+        self.conn.executescript(SCHEMA)
+        self._pending = 0
+        self._next_position = self._max_position() + 1
+
+    def _migrate(self) -> None:
+        """Agrega la URL original a una base creada con el esquema anterior (ver MIGRATE_CANONICAL_URL)."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(group_files)")}
+        if columns and "canonical_url" not in columns:
+            self.conn.executescript(f"BEGIN; {MIGRATE_CANONICAL_URL} COMMIT;")
+
+    def _max_position(self) -> int:
+        row = self.conn.execute("SELECT MAX(position) FROM groups").fetchone()
+        return row[0] if row[0] is not None else -1
+
+    def _upsert_group(self, record: Catalog, position: int, page_url: str | None) -> int:
+        """Inserta o actualiza un grupo y sincroniza sus archivos. Devuelve el id del grupo."""
+        conn = self.conn
+        key = (record.tema, record.subtema, record.agrupamiento)
+        conn.execute(
+            """
+            INSERT INTO groups (tema, subtema, agrupamiento, page_url, position)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (tema, subtema, agrupamiento) DO UPDATE SET
+                position = excluded.position,
+                page_url = COALESCE(excluded.page_url, groups.page_url)
+            WHERE groups.position IS NOT excluded.position
+                OR (excluded.page_url IS NOT NULL AND groups.page_url IS NOT excluded.page_url)
+            """,
+            (*key, page_url, position),
+        )
+        group_id = conn.execute(
+            "SELECT id FROM groups WHERE tema = ? AND subtema = ? AND agrupamiento = ?", key
+        ).fetchone()[0]
+
+        existing = {
+            pos: (url, nombre)
+            for pos, url, nombre in conn.execute(
+                "SELECT position, url, nombre_archivo FROM group_files WHERE group_id = ?", (group_id,)
+            )
+        }
+        for pos, archivo in enumerate(record.archivos):
+            entry = (archivo.url, archivo.nombre_archivo)
+            if existing.get(pos) == entry:
+                continue
+            key = canonical_url(archivo.url)
+            conn.execute("INSERT OR IGNORE INTO files (canonical_url) VALUES (?)", (key,))
+            if pos in existing:
+                conn.execute(
+                    """
+                    UPDATE group_files SET url = ?, nombre_archivo = ?, canonical_url = ?
+                    WHERE group_id = ? AND position = ?
+                    """,
+                    (*entry, key, group_id, pos),
+                )
+            else:
+                conn.execute(
+                    """
+                    INSERT INTO group_files (group_id, position, url, nombre_archivo, canonical_url)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (group_id, pos, *entry, key),
+                )
+        if len(existing) > len(record.archivos):
+            conn.execute(
+                "DELETE FROM group_files WHERE group_id = ? AND position >= ?",
+                (group_id, len(record.archivos)),
+            )
+        return group_id
+
+    def _written(self, n: int = 1) -> None:
+        self._pending += n
+        if self._pending >= self.batch_size:
+            self.commit()
+
+    def commit(self) -> None:
+        """Confirma las escrituras pendientes."""
+        self.conn.commit()
+        self._pending = 0
+
+    def add_page(self, url: str, record: Dict | Catalog) -> None:
+        """
+        Registra el resultado de una página del crawl (pensado como callback).
+
+        Args:
+            url: URL de la página.
+            record: Datos del tema (dict o Catalog). Se ignoran los que no tienen archivos.
+        """
+        self.add_records([Catalog.model_validate(record)], page_url=url)
+
+    def add_records(self, records: Iterable[Catalog], page_url: str | None = None) -> None:
+        """
+        Inserta o actualiza grupos sin borrar los existentes.
+
+        Args:
+            records: Registros del catálogo.
+            page_url: Página de origen de los registros, si se conoce.
+        """
+        if page_url is not None:
+            self.conn.execute(
+                """
+                INSERT INTO pages (url, fetched_at) VALUES (?, ?)
+                ON CONFLICT (url) DO UPDATE SET fetched_at = excluded.fetched_at
+                """,
+                (page_url, datetime.now(timezone.utc).isoformat()),
+            )
+        for record in records:
+            if not record.archivos:
+                continue
+            row = self.conn.execute(
+                "SELECT position FROM groups WHERE tema = ? AND subtema = ? AND agrupamiento = ?",
+                (record.tema, record.subtema, record.agrupamiento),
+            ).fetchone()
+            if row is None:
+                position = self._next_position
+                self._next_position += 1
+            else:
+                position = row[0]
+            self._upsert_group(record, position, page_url)
+            self._written()
+
+    def sync(self, catalog: List[Catalog]) -> None:
+        """
+        Deja la base igual al catálogo dado: actualiza orden y contenido de los
+        grupos que cambiaron y borra los grupos y archivos que ya no existen.
+
+        Args:
+            catalog: Catálogo completo, en su orden canónico.
+        """
+        keep = set()
+        for position, record in enumerate(catalog):
+            keep.add(self._upsert_group(record, position, None))
+            self._written()
+
+        stale = [
+            group_id for (group_id,) in self.conn.execute("SELECT id FROM groups")
+            if group_id not in keep
+        ]
+        for group_id in stale:
+            self.conn.execute("DELETE FROM group_files WHERE group_id = ?", (group_id,))
+            self.conn.execute("DELETE FROM groups WHERE id = ?", (group_id,))
+        self.conn.execute("DELETE FROM files WHERE canonical_url NOT IN (SELECT canonical_url FROM group_files)")
+        self._next_position = len(catalog)
+        self.commit()
+
+    def catalog(self) -> List[Catalog]:
+        """Reconstruye el catálogo completo en su orden."""
+        groups: Dict[int, Dict] = {}
+        for group_id, tema, subtema, agrupamiento in self.conn.execute(
+            "SELECT id, tema, subtema, agrupamiento FROM groups ORDER BY position, id"
+        ):
+            groups[group_id] = {"tema": tema, "subtema": subtema, "agrupamiento": agrupamiento, "archivos": []}
+        for group_id, url, nombre in self.conn.execute(
+            "SELECT group_id, url, nombre_archivo FROM group_files ORDER BY group_id, position"
+        ):
+            groups[group_id]["archivos"].append({"nombre_archivo": nombre, "url": url})
+        return [Catalog.model_validate(g) for g in groups.values()]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, str]]:
+        """
+        Búsqueda de texto completo (FTS5, sin acentos) sobre nombre de archivo y jerarquía.
+
+        Cada término se busca como prefijo y todos deben aparecer.
+
+        Args:
+            query: Texto a buscar.
+            limit: Máximo de resultados.
+
+        Returns:
+            Archivos ordenados por relevancia (bm25), con su jerarquía.
+        """
+        terms = [t.replace('"', '""') for t in query.split()]
+        if not terms:
+            return []
+        match = " ".join(f'"{t}"*' for t in terms)
+        rows = self.conn.execute(
+            """
+            SELECT g.tema, g.subtema, g.agrupamiento, gf.nombre_archivo, gf.url
+            FROM files_fts
+            JOIN group_files gf ON gf.rowid = files_fts.rowid
+            JOIN groups g ON g.id = gf.group_id
+            WHERE files_fts MATCH ?
+            ORDER BY bm25(files_fts)
+            LIMIT ?
+            """,
+            (match, limit),
+        )
+        keys = ("tema", "subtema", "agrupamiento", "nombre_archivo", "url")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self) -> None:
+        self.commit()
+        self.conn.close()
+
+    def __enter__(self) -> "CatalogStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,132 @@
+"""Duraciones por página entre corridas y planificación de descargas por costo (LPT)."""
+
+import heapq
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from indec_catalog.cache import load_json, save_json
+from indec_catalog.config import TIMINGS_DEFAULT_ESTIMATE, TIMINGS_SMOOTHING
+
+
+def _parents(url: str) -> List[str]:
+    """Prefijos de la ruta de `url`, del más cercano a la raíz ("")."""
+    parts = urlparse(url).path.strip("/").split("/")
+    return ["/".join(parts[:i]) for i in range(len(parts) - 1, -1, -1)]
+
+
+class PageTimings:
+    """
+    Duración (descarga + parseo) y tamaño de cada página en corridas anteriores.
+
+    Cada medición se combina con las previas en un promedio móvil con peso
+    TIMINGS_SMOOTHING, para que una corrida lenta aislada no desordene la
+    planificación. Una página sin mediciones se estima con el promedio de las
+    páginas medidas bajo el prefijo de ruta más cercano (ej: las demás de
+    Nivel4/Tema/4/31), o con TIMINGS_DEFAULT_ESTIMATE si no hay ninguna.
+    Su método record sirve directamente como callback `on_stats` del crawl.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        smoothing: float = TIMINGS_SMOOTHING,
+        default: float = TIMINGS_DEFAULT_ESTIMATE,
+    ):
+        """
+        Args:
+            path: Archivo JSON de las duraciones (default: solo en memoria).
+            smoothing: Peso de la última medición en el promedio (0 a 1].
+            default: Duración supuesta en segundos sin ninguna medición.
+        """
+        self.path = Path(path) if path else None
+        self.smoothing = smoothing
+        self.default = default
+        self.entries: Dict[str, Dict] = (load_json(self.path, {}) if self.path else None) or {}
+        self.report: Dict | None = None  # Makespan previsto y real de la última corrida planificada
+        self._groups: Dict[str, List[float]] | None = None
+
+    def record(self, url: str, stats: Dict) -> None:
+        """
+        Registra la duración de una página.
+
+        Args:
+            url: URL de la página.
+            stats: Métricas del crawl ('elapsed' y, si se descargó, 'bytes').
+                Sin 'elapsed' (p. ej. métricas de otra fuente) no se registra nada.
+        """
+        elapsed = stats.get("elapsed")
+        if elapsed is None:
+            return
+        previous = self.entries.get(url)
+        if previous is None:
+            seconds = elapsed
+        else:
+            seconds = self.smoothing * elapsed + (1 - self.smoothing) * previous["seconds"]
+        self.entries[url] = {
+            "seconds": seconds,
+            "bytes": stats.get("bytes", previous["bytes"] if previous else None),
+            "runs": (previous["runs"] if previous else 0) + 1,
+        }
+        self._groups = None
+
+    def estimate(self, url: str) -> float:
+        """Duración esperada de `url` en segundos."""
+        entry = self.entries.get(url)
+        if entry is not None:
+            return entry["seconds"]
+        if self._groups is None:
+            self._groups = {}
+            for known, entry in self.entries.items():
+                for prefix in _parents(known):
+                    total = self._groups.setdefault(prefix, [0.0, 0])
+                    total[0] += entry["seconds"]
+                    total[1] += 1
+        for prefix in _parents(url):
+            if prefix in self._groups:
+                total, count = self._groups[prefix]
+                return total / count
+        return self.default
+
+    def schedule(self, urls: List[str]) -> List[int]:
+        """
+        Orden de despacho de mayor a menor duración estimada (Longest
+        Processing Time first), así las páginas lentas no quedan para el final.
+
+        Returns:
+            Índices de `urls` en el orden en que conviene iniciarlas; a igual
+            estimación se respeta el orden original.
+        """
+        estimates = [self.estimate(url) for url in urls]
+        return sorted(range(len(urls)), key=lambda i: -estimates[i])
+
+    def makespan(self, urls: List[str], workers: int, order: List[int] | None = None) -> float:
+        """
+        Duración total prevista si `workers` descargas simultáneas toman las
+        páginas en el orden dado, cada una apenas se libera un lugar.
+
+        Args:
+            urls: URLs a procesar.
+            workers: Páginas procesándose a la vez.
+            order: Índices de `urls` en orden de despacho (default: el de `urls`).
+
+        Returns:
+            Segundos hasta que termina la última página.
+
+        Raises:
+            ValueError: Si `workers` es menor que 1.
+        """
+        if workers < 1:
+            raise ValueError(f"workers debe ser al menos 1: {workers}")
+        order = range(len(urls)) if order is None else order
+        finish: List[float] = [0.0] * min(workers, len(urls))
+        for i in order:
+            heapq.heapreplace(finish, finish[0] + self.estimate(urls[i]))
+        return max(finish, default=0.0)
+
+    def save(self) -> None:
+        if self.path is not None:
+            save_json(self.path, self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,239 @@
+"""Modo watch: monitoreo continuo de páginas con refresco adaptativo."""
+
+import heapq
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from pydantic import BaseModel
+
+from indec_catalog.bases_datos import scrape_bases_datos
+from indec_catalog.cache import content_fingerprint, load_json, save_json
+from indec_catalog.catalog import write_catalog
+from indec_catalog.config import (
+    BASE_URL,
+    BASES_DATOS_URL,
+    SITEMAP_URL,
+    WATCH_INITIAL_INTERVAL,
+    WATCH_MAX_INTERVAL,
+    WATCH_MIN_INTERVAL,
+)
+from indec_catalog.models import Catalog
+from indec_catalog.scraper import fetch_tema_data
+from indec_catalog.sitemap import build_url, extract_sitemap_urls
+
+CHANGE_HISTORY = 8  # Cantidad de cambios recordados por página
+BACKOFF = 1.5  # Factor de espaciado cuando una página no cambia
+
+
+class PageState(BaseModel):
+    url: str
+    interval: float = WATCH_INITIAL_INTERVAL
+    next_check: float = 0.0
+    last_checked: float | None = None
+    fingerprint: str | None = None
+    change_times: list[float] = []
+
+
+def next_interval(
+    page: PageState,
+    changed: bool,
+    min_interval: float = WATCH_MIN_INTERVAL,
+    max_interval: float = WATCH_MAX_INTERVAL,
+) -> float:
+    """
+    Calcula el próximo intervalo de chequeo de una página según su historial.
+
+    Si la página cambió, el intervalo se reduce a la mitad; si no, se espacia
+    por BACKOFF. Con al menos dos cambios registrados, nunca se espera más que
+    la mitad de la mediana entre cambios, así las páginas con publicaciones
+    periódicas (p. ej. EPH trimestral) se chequean con la frecuencia que tienen.
+
+    Args:
+        page: Estado de la página, con `change_times` ya actualizado.
+        changed: Si el último chequeo detectó un cambio.
+        min_interval: Intervalo mínimo en segundos.
+        max_interval: Intervalo máximo en segundos.
+
+    Returns:
+        Intervalo en segundos hasta el próximo chequeo.
+    """
+    interval = page.interval / 2 if changed else page.interval * BACKOFF
+    gaps = [b - a for a, b in zip(page.change_times, page.change_times[1:])]
+    if gaps:
+        interval = min(interval, statistics.median(gaps) / 2)
+    return max(min_interval, min(max_interval, interval))
+
+
+class CatalogWatcher:
+    """
+    Mantiene el catálogo actualizado chequeando cada página cuando le toca.
+
+    Usa una cola de prioridad por próxima fecha de chequeo con las páginas
+    Nivel4, la página Bases de datos y el propio MapaSitio (para descubrir
+    páginas nuevas). Cada vez que una página cambia se reescribe el catálogo
+    en disco, y el estado se guarda tras cada chequeo para poder reanudar.
+    """
+
+    def __init__(
+        self,
+        output_path: str | Path,
+        state_path: str | Path,
+        include_bases_datos: bool = True,
+        min_interval: float = WATCH_MIN_INTERVAL,
+        max_interval: float = WATCH_MAX_INTERVAL,
+        bases_datos_cache: str | Path | None = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.output_path = Path(output_path)
+        self.state_path = Path(state_path)
+        self.include_bases_datos = include_bases_datos
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.bases_datos_cache = bases_datos_cache
+        self.clock = clock
+        self.sleep = sleep
+
+        state = load_json(self.state_path, {})
+        self.pages: Dict[str, PageState] = {
+            url: PageState.model_validate(p) for url, p in state.get("pages", {}).items()
+        }
+        self.records: Dict[str, Any] = state.get("records", {})
+        self.order: List[str] = state.get("order", [])
+
+        self._add_page(SITEMAP_URL)
+        if include_bases_datos:
+            self._add_page(BASES_DATOS_URL)
+        else:
+            self.pages.pop(BASES_DATOS_URL, None)
+        self.queue: List[Tuple[float, str]] = [(p.next_check, url) for url, p in self.pages.items()]
+        heapq.heapify(self.queue)
+
+    def _add_page(self, url: str) -> None:
+        if url not in self.pages:
+            self.pages[url] = PageState(url=url, next_check=self.clock())
+
+    def _fetch(self, url: str) -> Any:
+        if url == SITEMAP_URL:
+            return [build_url(link, BASE_URL) for link in extract_sitemap_urls()]
+        if url == BASES_DATOS_URL:
+            return [c.model_dump() for c in scrape_bases_datos(cache_path=self.bases_datos_cache)]
+        return fetch_tema_data(url)
+
+    def _update_frontier(self, urls: List[str]) -> None:
+        """Agrega las páginas nuevas del MapaSitio (a chequear ya) y quita las eliminadas."""
+        self.order = urls
+        current = set(urls) | {SITEMAP_URL, BASES_DATOS_URL}
+        for url in list(self.pages):
+            if url not in current:
+                del self.pages[url]
+                self.records.pop(url, None)
+        for url in urls:
+            if url not in self.pages:
+                self._add_page(url)
+                heapq.heappush(self.queue, (self.pages[url].next_check, url))
+
+    def check(self, url: str) -> bool:
+        """
+        Chequea una página y reprograma su próximo chequeo.
+
+        Returns:
+            True si el contenido cambió respecto del último chequeo.
+        """
+        page = self.pages[url]
+        now = self.clock()
+        try:
+            data = self._fetch(url)
+        except Exception as e:
+            print(f"Error al chequear {url}: {e}", file=sys.stderr)
+            # last_checked queda como estaba: solo cuentan los chequeos exitosos
+            page.next_check = now + page.interval
+            return False
+
+        fingerprint = content_fingerprint(data)
+        changed = fingerprint != page.fingerprint
+        if changed:
+            # El primer chequeo de una página no cuenta como cambio observado
+            if page.fingerprint is not None:
+                page.change_times = (page.change_times + [now])[-CHANGE_HISTORY:]
+            page.fingerprint = fingerprint
+            if url == SITEMAP_URL:
+                self._update_frontier(data)
+            else:
+                self.records[url] = data
+
+        page.interval = next_interval(page, changed, self.min_interval, self.max_interval)
+        page.last_checked = now
+        page.next_check = now + page.interval
+        return changed
+
+    def warmed_up(self) -> bool:
+        """
+        True cuando todas las páginas se descargaron bien al menos una vez.
+        Antes de eso no se escribe el catálogo para no pisarlo con uno parcial.
+        """
+        return all(p.last_checked is not None for p in self.pages.values())
+
+    def catalog(self) -> List[Catalog]:
+        """Arma el catálogo actual: Nivel4 en orden del MapaSitio y luego Bases de datos."""
+        catalog = [
+            Catalog.model_validate(self.records[url])
+            for url in self.order
+            if self.records.get(url) and self.records[url]["archivos"] != []
+        ]
+        if self.include_bases_datos:
+            catalog += [Catalog.model_validate(x) for x in self.records.get(BASES_DATOS_URL, [])]
+        return catalog
+
+    def write(self) -> bool:
+        """
+        Escribe el catálogo actual, salvo que esté vacío y ya exista uno en disco.
+
+        Returns:
+            True si se escribió el archivo.
+        """
+        catalog = self.catalog()
+        if not catalog and self.output_path.exists():
+            print(f"Catálogo vacío: se conserva {self.output_path}", file=sys.stderr)
+            return False
+        write_catalog(self.output_path, catalog)
+        return True
+
+    def save_state(self) -> None:
+        save_json(
+            self.state_path,
+            {
+                "pages": {url: p.model_dump() for url, p in self.pages.items()},
+                "records": self.records,
+                "order": self.order,
+            },
+        )
+
+    def run(self, max_checks: int | None = None) -> None:
+        """
+        Ejecuta el loop de chequeos.
+
+        Args:
+            max_checks: Cantidad de chequeos a realizar (default: sin límite).
+        """
+        checks = 0
+        while self.queue and (max_checks is None or checks < max_checks):
+            due, url = heapq.heappop(self.queue)
+            page = self.pages.get(url)
+            if page is None or page.next_check != due:
+                continue  # Entrada obsoleta: la página fue eliminada o reprogramada
+
+            wait = due - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+
+            was_warm = self.warmed_up()
+            changed = self.check(url)
+            if self.warmed_up() and (changed or not was_warm):
+                self.write()
+            self.save_state()
+            heapq.heappush(self.queue, (page.next_check, url))
+            checks += 1
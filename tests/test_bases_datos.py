@@ -1,9 +1,12 @@
 """Tests para el módulo bases_datos."""
 
+import asyncio
+import threading
 import pytest
 from unittest.mock import patch, Mock
 
-from indec_catalog.bases_datos import scrape_bases_datos
+from indec_catalog import bases_datos
+from indec_catalog.bases_datos import ascrape_bases_datos, scrape_bases_datos
 from indec_catalog.models import Catalog, Archivo
 from indec_catalog.config import BASE_URL, BASES_DATOS_URL
 
@@ -32,6 +35,7 @@ class TestScrapeBasesDatos:
         mock_response = Mock()
         mock_response.content = html.encode("utf-8")
         mock_response.raise_for_status = Mock()
+        mock_response.headers = {}
         mock_response.encoding = "utf-8"
 
         with patch("indec_catalog.bases_datos.requests.get", return_value=mock_response):
@@ -66,6 +70,7 @@ class TestScrapeBasesDatos:
         mock_response = Mock()
         mock_response.content = html.encode("utf-8")
         mock_response.raise_for_status = Mock()
+        mock_response.headers = {}
         mock_response.encoding = "utf-8"
 
         with patch("indec_catalog.bases_datos.requests.get", return_value=mock_response):
@@ -99,6 +104,7 @@ class TestScrapeBasesDatos:
         mock_response = Mock()
         mock_response.content = html.encode("utf-8")
         mock_response.raise_for_status = Mock()
+        mock_response.headers = {}
         mock_response.encoding = "utf-8"
 
         with patch("indec_catalog.bases_datos.requests.get", return_value=mock_response):
@@ -130,6 +136,7 @@ class TestScrapeBasesDatos:
         mock_response = Mock()
         mock_response.content = html.encode("utf-8")
         mock_response.raise_for_status = Mock()
+        mock_response.headers = {}
         mock_response.encoding = "utf-8"
 
         with patch("indec_catalog.bases_datos.requests.get", return_value=mock_response):
@@ -160,6 +167,7 @@ class TestScrapeBasesDatos:
         mock_response = Mock()
         mock_response.content = html.encode("utf-8")
         mock_response.raise_for_status = Mock()
+        mock_response.headers = {}
         mock_response.encoding = "utf-8"
 
         with patch("indec_catalog.bases_datos.requests.get", return_value=mock_response):
@@ -183,6 +191,7 @@ class TestScrapeBasesDatos:
         mock_response = Mock()
         mock_response.content = html.encode("utf-8")
         mock_response.raise_for_status = Mock()
+        mock_response.headers = {}
         mock_response.encoding = "utf-8"
 
         with patch("indec_catalog.bases_datos.requests.get", return_value=mock_response):
@@ -215,6 +224,7 @@ class TestScrapeBasesDatos:
         mock_response = Mock()
         mock_response.content = html.encode("utf-8")
         mock_response.raise_for_status = Mock()
+        mock_response.headers = {}
         mock_response.encoding = "utf-8"
 
         with patch("indec_catalog.bases_datos.requests.get", return_value=mock_response):
@@ -222,3 +232,209 @@ class TestScrapeBasesDatos:
 
         assert len(result) == 1
         assert result[0].archivos[0].url == f"{BASE_URL}/relativo/archivo.zip"
+
+
+class TestTabCache:
+    """Tests para la caché por huella de tab y el procesamiento en paralelo."""
+
+    HTML = """
+    <html>
+        <body>
+            <div class="tabContent" id="tab1">
+                <p class="font-color-violeta">Encuesta Permanente de Hogares (EPH)</p>
+                <div class="sub_enc_salud_tit">Bases de microdatos</div>
+                <strong>Tercer trimestre 2025.</strong>
+                <a href="/ftp/eph/EPH_usu_3_Trim_2025_txt.zip">Formato txt</a>
+            </div>
+            <div class="tabContent" id="tab2">
+                <p class="font-color-violeta">Encuestas de salud</p>
+                <div class="sub_enc_salud_tit">Base de datos</div>
+                <a href="/ftp/encoprac/base.txt">Base txt</a>
+            </div>
+        </body>
+    </html>
+    """
+
+    def _mock_response(self, html):
+        mock_response = Mock()
+        mock_response.content = html.encode("utf-8")
+        mock_response.raise_for_status = Mock()
+        mock_response.headers = {}
+        mock_response.encoding = "utf-8"
+        return mock_response
+
+    def test_parallel_matches_sequential_in_document_order(self):
+        """El procesamiento en procesos devuelve lo mismo y en orden de documento."""
+        with patch("indec_catalog.bases_datos.requests.get", return_value=self._mock_response(self.HTML)):
+            sequential = scrape_bases_datos(max_workers=1)
+            parallel = scrape_bases_datos(max_workers=2)
+
+        assert [c.model_dump() for c in parallel] == [c.model_dump() for c in sequential]
+        assert [c.subtema for c in parallel] == [
+            "Encuesta Permanente de Hogares (EPH)",
+            "Encuestas de salud",
+        ]
+
+    def test_workers_are_spawned_from_crawl_thread(self):
+        """Los procesos no se crean con fork: run_sources corre esta fuente en un thread."""
+        results = []
+        with patch("indec_catalog.bases_datos.requests.get", return_value=self._mock_response(self.HTML)), \
+                patch(
+                    "indec_catalog.bases_datos.ProcessPoolExecutor",
+                    wraps=bases_datos.ProcessPoolExecutor,
+                ) as spy:
+            thread = threading.Thread(target=lambda: results.append(scrape_bases_datos(max_workers=2)))
+            thread.start()
+            thread.join()
+
+        assert spy.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+        assert [c.subtema for c in results[0]] == [
+            "Encuesta Permanente de Hogares (EPH)",
+            "Encuestas de salud",
+        ]
+
+    def test_unchanged_tabs_reuse_cache(self, tmp_path):
+        """Solo se re-procesan los tabs cuyo HTML cambió."""
+        cache_path = tmp_path / "tabs.json"
+        with patch("indec_catalog.bases_datos.requests.get", return_value=self._mock_response(self.HTML)):
+            first = scrape_bases_datos(cache_path=cache_path, max_workers=1)
+        assert cache_path.exists()
+
+        changed = self.HTML.replace("Tercer trimestre 2025.", "Cuarto trimestre 2025.")
+        with patch("indec_catalog.bases_datos.requests.get", return_value=self._mock_response(changed)), \
+                patch(
+                    "indec_catalog.bases_datos._extract_sections_with_links",
+                    wraps=bases_datos._extract_sections_with_links,
+                ) as spy:
+            second = scrape_bases_datos(cache_path=cache_path, max_workers=1)
+
+        assert spy.call_count == 1
+        assert spy.call_args[0][0].get("id") == "tab1"
+        assert second[0].agrupamiento == "Bases de microdatos | Cuarto trimestre 2025."
+        assert second[1].model_dump() == first[1].model_dump()
+
+
+class TestHierarchyRules:
+    """Tests para las reglas declarativas de jerarquía (BASES_DATOS_LEVELS / BASES_DATOS_TAB_RULES)."""
+
+    HTML = """
+    <html>
+        <body>
+            <div class="tabContent" id="tab1">
+                <p class="font-color-violeta">Encuesta Permanente de Hogares (EPH)</p>
+                <ul>
+                    <li class="enlaces_li">
+                        <div class="sub_enc_salud_tit">Bases de microdatos</div>
+                        <strong>Tercer trimestre 2025.</strong>
+                        <a href="/ftp/eph/eph_3_2025.zip">Formato txt</a>
+                    </li>
+                    <li class="enlaces_li">Tabulados</li>
+                    <li class="enlaces_li">Documentos</li>
+                    <li class="enlaces_li">Cuestionarios</li>
+                    <li class="enlaces_li">Informes</li>
+                </ul>
+                <p class="fontsize20 font-color-violeta">Encuesta de Indicadores del Mercado de Trabajo ▾</p>
+                <ul>
+                    <li class="a-color2">Bases del tercer trimestre 2024
+                        <ul>
+                            <li class="enlaces_li">
+                                <div class="enlace_li_tit">Microdatos <a href="/ftp/eimt/base.xls">Base</a></div>
+                            </li>
+                        </ul>
+                    </li>
+                </ul>
+            </div>
+        </body>
+    </html>
+    """
+
+    def test_tab1_principal_and_chain(self):
+        """Los bloques principales toman el primer L1; el resto, la cadena de títulos del contenedor."""
+        result = bases_datos.parse_bases_datos(self.HTML.encode("utf-8"), max_workers=1)
+
+        assert [(c.subtema, c.agrupamiento) for c in result] == [
+            ("Encuesta Permanente de Hogares (EPH)", "Bases de microdatos | Tercer trimestre 2025."),
+            (
+                "Encuesta de Indicadores del Mercado de Trabajo",
+                "Bases del tercer trimestre 2024 | MicrodatosBase",
+            ),
+        ]
+
+    def test_rules_apply_per_tab_id(self):
+        """Las excepciones de tab1 no se aplican a otros tabs."""
+        html = self.HTML.replace('id="tab1"', 'id="tab9"')
+        result = bases_datos.parse_bases_datos(html.encode("utf-8"), max_workers=1)
+
+        assert result[1].agrupamiento == "Bases de microdatos | Tercer trimestre 2025."
+
+    def test_declared_charset_is_respected(self):
+        """El encoding se toma del <meta charset> del documento."""
+        html = """<html><head><meta charset="iso-8859-1"></head><body><div class="tabContent">
+        <p class="font-color-violeta">Encuesta ñandú</p><a href="/ftp/c.zip">C</a></div></body></html>"""
+        result = bases_datos.parse_bases_datos(html.encode("latin-1"), max_workers=1)
+
+        assert result[0].subtema == "Encuesta ñandú"
+
+    def test_content_type_charset_without_meta(self):
+        """Sin <meta charset>, el encoding se toma del header Content-Type."""
+        html = """<html><body><div class="tabContent">
+        <p class="font-color-violeta">Encuesta ñandú</p><a href="/ftp/c.zip">C</a></div></body></html>"""
+        result = bases_datos.parse_bases_datos(
+            html.encode("latin-1"), max_workers=1, content_type="text/html; charset=ISO-8859-1"
+        )
+
+        assert result[0].subtema == "Encuesta ñandú"
+
+    def test_workers_receive_raw_tab_bytes(self):
+        """Cada tab se envía a los procesos con sus bytes crudos; si no se pueden ubicar, serializado."""
+        tab = """<div class="tabContent" id="tab{0}"><p class="font-color-violeta">Tema ñ {0}</p>
+        <a href="/ftp/{0}.zip">A</a></div>"""
+        content = f"<html><body>{tab.format(2)}{tab.format(3)}</body></html>".encode("utf-8")
+        tabs = bases_datos.TABS_XPATH(bases_datos._parse_html(content))
+
+        sources, encoding = bases_datos._tab_sources(content, "utf-8", tabs)
+        assert sources[0] == tab.format(2).encode("utf-8")
+        assert encoding == "utf-8"
+
+        commented = content.replace(b"<body>", b'<body><!-- <div class="tabContent"> -->')
+        sources, encoding = bases_datos._tab_sources(commented, "iso-8859-1", tabs)
+        assert bases_datos._process_tab_html(sources[1], encoding, "https://www.indec.gob.ar")[0][0] == "Tema ñ 3"
+        assert encoding == "utf-8"
+
+    def test_malformed_html_parses_like_html_parser(self):
+        """Un <div> dentro de un <p> queda dentro del título, como con BeautifulSoup/html.parser."""
+        tab = """<div class="tabContent" id="tab{}"><p class="font-color-violeta">EPH<div class="sub_enc_salud_tit">Bases</div></p>
+        <ul><li><a href="/ftp/a.zip">A</a></li></ul></div>"""
+        html = f"<html><body>{tab.format(2)}{tab.format(3)}</body></html>".encode("utf-8")
+
+        for workers in (1, 2):  # En el proceso principal y re-parseado en procesos hijos
+            result = bases_datos.parse_bases_datos(html, max_workers=workers)
+            assert [(c.subtema, c.agrupamiento) for c in result] == [("EPHBases", "Bases")] * 2
+
+    def test_invalid_rule_raises(self):
+        """Una expresión inválida falla al compilar, no al parsear."""
+        from lxml import etree
+
+        with pytest.raises(etree.XPathSyntaxError):
+            bases_datos.compile_rules(levels={"subtema": "descendant::p["})
+
+
+class TestAscrapeBasesDatos:
+    """Tests para ascrape_bases_datos."""
+
+    def test_async_matches_sync(self):
+        """La versión asíncrona produce el mismo catálogo que la sincrónica."""
+        httpx = pytest.importorskip("httpx")
+        html = TestTabCache.HTML.encode("utf-8")
+
+        async def run():
+            transport = httpx.MockTransport(lambda request: httpx.Response(200, content=html))
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await ascrape_bases_datos(client, max_workers=1)
+
+        result = asyncio.run(run())
+
+        assert [c.model_dump() for c in result] == [
+            c.model_dump() for c in bases_datos.parse_bases_datos(html, max_workers=1)
+        ]
+        assert len(result) == 2
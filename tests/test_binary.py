@@ -0,0 +1,85 @@
+"""Tests para el módulo binary."""
+
+import mmap
+from unittest.mock import patch
+
+import pytest
+
+from indec_catalog.binary import CatalogSnapshot, write_snapshot
+from indec_catalog.catalog import write_catalog
+from indec_catalog.config import BASE_URL
+from indec_catalog.models import Archivo, Catalog
+
+CATALOG = [
+    Catalog(
+        tema="Sociedad",
+        subtema="Población",
+        agrupamiento="Censo 2022",
+        archivos=[
+            Archivo(nombre_archivo="Cuadro 1", url=f"{BASE_URL}/ftp/cuadros/poblacion/c1.xlsx"),
+            Archivo(nombre_archivo="Cuadro 2", url=f"{BASE_URL}/ftp/cuadros/poblacion/c2.xlsx"),
+        ],
+    ),
+    Catalog(tema="Sociedad", subtema="Población", agrupamiento="Sin archivos", archivos=[]),
+    Catalog(
+        tema="Economía",
+        subtema="Precios",
+        agrupamiento="IPC – Índice",
+        archivos=[Archivo(nombre_archivo="Serie", url="sin-barra.csv")],
+    ),
+]
+
+
+class TestCatalogSnapshot:
+    """Tests para write_snapshot y CatalogSnapshot."""
+
+    def test_round_trips_exactly_with_json(self, tmp_path):
+        """El catálogo leído del snapshot produce el mismo JSON byte a byte."""
+        write_snapshot(tmp_path / "catalogo.bin", CATALOG)
+        with CatalogSnapshot(tmp_path / "catalogo.bin") as snapshot:
+            restored = snapshot.catalog()
+
+        write_catalog(tmp_path / "original.json", CATALOG)
+        write_catalog(tmp_path / "restored.json", restored)
+        assert (tmp_path / "restored.json").read_bytes() == (tmp_path / "original.json").read_bytes()
+
+    def test_lazy_views_and_string_dedup(self, tmp_path):
+        """Los registros se leen bajo demanda y los strings repetidos se guardan una vez."""
+        path = tmp_path / "catalogo.bin"
+        write_snapshot(path, CATALOG)
+        with CatalogSnapshot(path) as snapshot:
+            assert len(snapshot) == 3
+            view = snapshot[-1]
+            assert (view.tema, view.agrupamiento) == ("Economía", "IPC – Índice")
+            assert snapshot[0].archivos[1].url == f"{BASE_URL}/ftp/cuadros/poblacion/c2.xlsx"
+            assert snapshot[1].archivos == []
+            # 3 de jerarquía + 2 nombres + 1 prefijo compartido + 2 nombres de archivo en la
+            # URL, "Sin archivos", 3 de jerarquía, "Serie", prefijo vacío y "sin-barra.csv"
+            assert snapshot.n_strings == 15
+            with pytest.raises(IndexError):
+                snapshot[3]
+
+    def test_rejects_other_files(self, tmp_path):
+        """Un archivo que no es snapshot se rechaza."""
+        path = tmp_path / "catalogo.json"
+        path.write_bytes(b"[]" + b" " * 64)
+        with pytest.raises(ValueError):
+            CatalogSnapshot(path)
+
+    @pytest.mark.parametrize("size", [0, 10, 60, -1])
+    def test_rejects_truncated_snapshot(self, tmp_path, size):
+        """Un snapshot truncado (o vacío) se rechaza con ValueError y cierra el mmap."""
+        path = tmp_path / "catalogo.bin"
+        write_snapshot(path, CATALOG)
+        path.write_bytes(path.read_bytes()[:size])
+        mapped = []
+        real_mmap = mmap.mmap
+
+        def track(*args, **kwargs):
+            mapped.append(real_mmap(*args, **kwargs))
+            return mapped[-1]
+
+        with patch("indec_catalog.binary.mmap.mmap", side_effect=track):
+            with pytest.raises(ValueError):
+                CatalogSnapshot(path)
+        assert all(m.closed for m in mapped)
@@ -1,11 +1,30 @@
 """Tests para el módulo catalog."""
 
+import asyncio
+import json
+import threading
+import time
 import pytest
+import requests
+from datetime import datetime, timedelta, timezone
 from unittest.mock import patch, Mock
 
-from indec_catalog.catalog import generate_catalog, generate_catalog_with_errors
+from indec_catalog.catalog import (
+    _afetch_pages,
+    _fetch_pages,
+    _prefetched,
+    agenerate_catalog,
+    agenerate_catalog_with_errors,
+    generate_catalog,
+    generate_catalog_with_errors,
+    generate_catalog_incremental,
+    merge_catalogs,
+    retry_failed_pages,
+)
 from indec_catalog.models import Catalog, Archivo
-from indec_catalog.config import BASE_URL
+from indec_catalog.profiling import PageProfiler
+from indec_catalog.redirects import RedirectMap
+from indec_catalog.config import BASE_URL, SITEMAP_URL
 
 
 class TestGenerateCatalog:
@@ -13,7 +32,7 @@ class TestGenerateCatalog:
     
     @patch("indec_catalog.catalog.fetch_tema_data")
     @patch("indec_catalog.catalog.build_url")
-    @patch("indec_catalog.catalog.extract_sitemap_urls")
+    @patch("indec_catalog.catalog.iter_sitemap_urls")
     def test_generate_catalog_success(
         self,
         mock_extract,
@@ -51,7 +70,7 @@ class TestGenerateCatalog:
     
     @patch("indec_catalog.catalog.fetch_tema_data")
     @patch("indec_catalog.catalog.build_url")
-    @patch("indec_catalog.catalog.extract_sitemap_urls")
+    @patch("indec_catalog.catalog.iter_sitemap_urls")
     def test_generate_catalog_skips_none_data(
         self,
         mock_extract,
@@ -71,7 +90,7 @@ class TestGenerateCatalog:
     
     @patch("indec_catalog.catalog.fetch_tema_data")
     @patch("indec_catalog.catalog.build_url")
-    @patch("indec_catalog.catalog.extract_sitemap_urls")
+    @patch("indec_catalog.catalog.iter_sitemap_urls")
     def test_generate_catalog_filters_empty_files(
         self,
         mock_extract,
@@ -113,7 +132,7 @@ class TestGenerateCatalogWithErrors:
     
     @patch("indec_catalog.catalog.fetch_tema_data")
     @patch("indec_catalog.catalog.build_url")
-    @patch("indec_catalog.catalog.extract_sitemap_urls")
+    @patch("indec_catalog.catalog.iter_sitemap_urls")
     def test_generate_catalog_with_errors_tracks_errors(
         self,
         mock_extract,
@@ -136,7 +155,7 @@ class TestGenerateCatalogWithErrors:
     
     @patch("indec_catalog.catalog.fetch_tema_data")
     @patch("indec_catalog.catalog.build_url")
-    @patch("indec_catalog.catalog.extract_sitemap_urls")
+    @patch("indec_catalog.catalog.iter_sitemap_urls")
     def test_generate_catalog_with_errors_handles_exceptions(
         self,
         mock_extract,
@@ -157,3 +176,473 @@ class TestGenerateCatalogWithErrors:
         assert len(errors) == 1
         assert errors[0] == url
 
+
+
+class TestGenerateCatalogIncremental:
+    """Tests para generate_catalog_incremental."""
+
+    RECORD = {
+        "tema": "Tema",
+        "subtema": "Subtema",
+        "agrupamiento": "Agrupamiento",
+        "archivos": [{"nombre_archivo": "archivo.csv", "url": "http://example.com/archivo.csv"}],
+    }
+
+    @patch("indec_catalog.catalog.fetch_tema_data")
+    @patch("indec_catalog.catalog.extract_sitemap_lastmod")
+    def test_fetches_only_modified_pages(self, mock_lastmod, mock_fetch, tmp_path):
+        """En la segunda corrida solo se descargan las páginas con lastmod posterior."""
+        state_path = tmp_path / "state.json"
+        old = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        mock_lastmod.return_value = {"Nivel4/Tema/1": old, "Nivel4/Tema/2": old}
+        mock_fetch.return_value = self.RECORD
+
+        first, errors = generate_catalog_incremental(state_path, show_progress=False)
+        assert len(first) == 2 and errors == []
+        assert mock_fetch.call_count == 2
+
+        mock_fetch.reset_mock()
+        mock_lastmod.return_value = {
+            "Nivel4/Tema/1": old,
+            "Nivel4/Tema/2": datetime.now(timezone.utc) + timedelta(days=1),
+        }
+        second, _ = generate_catalog_incremental(state_path, show_progress=False)
+
+        assert len(second) == 2
+        mock_fetch.assert_called_once()
+        assert mock_fetch.call_args[0][0] == f"{BASE_URL}/Nivel4/Tema/2"
+
+    @patch("indec_catalog.catalog.fetch_tema_data")
+    @patch("indec_catalog.catalog.extract_sitemap_lastmod")
+    def test_last_run_advances_only_without_errors(self, mock_lastmod, mock_fetch, tmp_path):
+        """Con páginas fallidas se conserva la fecha anterior; sin errores se avanza."""
+        state_path = tmp_path / "state.json"
+        old = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        mock_lastmod.return_value = {"Nivel4/Tema/1": old, "Nivel4/Tema/2": old}
+        mock_fetch.return_value = self.RECORD
+        generate_catalog_incremental(state_path, show_progress=False)
+        first_run = json.loads(state_path.read_text())["last_run"]
+
+        mock_fetch.side_effect = requests.ConnectionError("caída")
+        mock_lastmod.return_value = {
+            "Nivel4/Tema/1": old,
+            "Nivel4/Tema/2": datetime.now(timezone.utc) + timedelta(days=1),
+        }
+        _, errors = generate_catalog_incremental(state_path, show_progress=False)
+        assert errors == [f"{BASE_URL}/Nivel4/Tema/2"]
+        assert json.loads(state_path.read_text())["last_run"] == first_run
+
+        mock_fetch.reset_mock(side_effect=True)
+        mock_fetch.return_value = self.RECORD
+        _, errors = generate_catalog_incremental(state_path, show_progress=False)
+        assert errors == []
+        assert mock_fetch.call_args[0][0] == f"{BASE_URL}/Nivel4/Tema/2"  # Se reintenta la fallida
+        assert json.loads(state_path.read_text())["last_run"] > first_run
+
+    @patch("indec_catalog.catalog.fetch_tema_data")
+    @patch("indec_catalog.catalog.extract_sitemap_lastmod")
+    def test_failed_page_keeps_previous_record(self, mock_lastmod, mock_fetch, tmp_path):
+        """Una página conocida que falla sigue en el catálogo y en el estado con sus datos previos."""
+        state_path = tmp_path / "state.json"
+        old = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        mock_lastmod.return_value = {"Nivel4/Tema/1": old}
+        mock_fetch.return_value = self.RECORD
+        generate_catalog_incremental(state_path, show_progress=False)
+
+        mock_lastmod.return_value = {"Nivel4/Tema/1": datetime.now(timezone.utc) + timedelta(days=1)}
+        mock_fetch.side_effect = requests.ConnectionError("caída")
+        result, errors = generate_catalog_incremental(state_path, show_progress=False)
+
+        assert errors == [f"{BASE_URL}/Nivel4/Tema/1"]
+        assert result == [self.RECORD]
+        assert json.loads(state_path.read_text())["pages"] == {f"{BASE_URL}/Nivel4/Tema/1": self.RECORD}
+
+    @patch("indec_catalog.catalog.fetch_tema_data")
+    @patch("indec_catalog.catalog.extract_sitemap_urls")
+    @patch("indec_catalog.catalog.extract_sitemap_lastmod")
+    def test_falls_back_to_mapasitio(self, mock_lastmod, mock_extract, mock_fetch, tmp_path):
+        """Si sitemap.xml falla usa el MapaSitio HTML y descarga todo."""
+        mock_lastmod.side_effect = requests.RequestException()
+        mock_extract.return_value = ["Nivel4/Tema/1"]
+        mock_fetch.return_value = self.RECORD
+
+        result, _ = generate_catalog_incremental(tmp_path / "state.json", show_progress=False)
+
+        assert len(result) == 1
+        mock_fetch.assert_called_once()
+        assert mock_fetch.call_args[0][0] == f"{BASE_URL}/Nivel4/Tema/1"
+
+
+class TestAsyncCatalog:
+    """Tests para agenerate_catalog y agenerate_catalog_with_errors."""
+
+    SITEMAP = b"""
+    <ul>
+        <li data-view="Nivel4/Tema/1/1/1">Uno</li>
+        <li data-view="Nivel4/Tema/2/2/2">Dos</li>
+        <li data-view="Nivel4/Tema/3/3/3">Tres</li>
+    </ul>
+    """
+
+    @staticmethod
+    def _page(n):
+        return f"""
+        <div class="ruta-texto mb-3">Inicio> Tema {n}> Subtema> Agrupamiento</div>
+        <a href="/ftp/datos{n}.csv">Datos {n}</a>
+        """.encode()
+
+    def _client(self, httpx, in_flight):
+        async def handler(request):
+            path = request.url.path
+            if path == "/Institucional/Indec/MapaSitio":
+                return httpx.Response(200, content=self.SITEMAP)
+            if path.endswith("/3/3/3"):
+                return httpx.Response(500)
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return httpx.Response(200, content=self._page(path.rsplit("/", 1)[-1]))
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def test_generates_in_sitemap_order_with_errors(self):
+        """Procesa concurrentemente, respeta el orden del sitemap y registra errores."""
+        httpx = pytest.importorskip("httpx")
+        in_flight = {"now": 0, "max": 0}
+
+        async def run():
+            async with self._client(httpx, in_flight) as client:
+                return await agenerate_catalog_with_errors(show_progress=False, concurrency=2, client=client)
+
+        result, errors = asyncio.run(run())
+
+        assert [r["tema"] for r in result] == ["Tema 1", "Tema 2"]
+        assert result[0]["archivos"][0]["url"] == f"{BASE_URL}/ftp/datos1.csv"
+        assert errors == [f"{BASE_URL}/Nivel4/Tema/3/3/3"]
+        assert in_flight["max"] == 2
+
+    def test_callbacks_fire_as_pages_complete(self):
+        """on_page/on_stats se llaman al terminar cada página; el resultado sigue el orden de las URLs."""
+        httpx = pytest.importorskip("httpx")
+        urls = [f"{BASE_URL}/Nivel4/Tema/{n}" for n in (1, 2)]
+        events = []
+
+        async def handler(request):
+            n = request.url.path.rsplit("/", 1)[-1]
+            if n == "1":
+                await asyncio.sleep(0.05)
+            else:
+                events.append("2 respondida")
+            return httpx.Response(200, content=self._page(n))
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await _afetch_pages(
+                    urls,
+                    client,
+                    show_progress=False,
+                    on_page=lambda url, record: events.append(f"page {record['tema']}"),
+                    on_stats=lambda url, stats: events.append(f"stats {url.rsplit('/', 1)[-1]}"),
+                )
+
+        result, errors = asyncio.run(run())
+
+        assert events == ["2 respondida", "stats 2", "page Tema 2", "stats 1", "page Tema 1"]
+        assert [r["tema"] for r in result] == ["Tema 1", "Tema 2"]
+        assert errors == []
+
+    def test_agenerate_catalog_returns_models(self):
+        """agenerate_catalog devuelve objetos Catalog."""
+        httpx = pytest.importorskip("httpx")
+
+        async def run():
+            async with self._client(httpx, {"now": 0, "max": 0}) as client:
+                return await agenerate_catalog(show_progress=False, client=client)
+
+        catalog = asyncio.run(run())
+
+        assert all(isinstance(c, Catalog) for c in catalog)
+        assert len(catalog) == 2
+
+
+class TestPipelinedSitemap:
+    """Tests para el solapamiento entre la descarga del MapaSitio y el crawl."""
+
+    RECORD = {
+        "tema": "Tema",
+        "subtema": "Subtema",
+        "agrupamiento": "Agrupamiento",
+        "archivos": [{"nombre_archivo": "Datos", "url": f"{BASE_URL}/datos.csv"}],
+    }
+
+    def test_first_page_is_processed_before_sitemap_ends(self):
+        """La primera página se procesa mientras el sitemap sigue descargándose."""
+        first_done = threading.Event()
+
+        def sitemap():
+            yield "Nivel4/Tema/1"
+            # El sitemap no termina hasta que se haya procesado la primera página
+            assert first_done.wait(timeout=5)
+            yield "Nivel4/Tema/2"
+
+        with patch("indec_catalog.catalog.iter_sitemap_urls", return_value=sitemap()), \
+                patch("indec_catalog.catalog.fetch_tema_data", return_value=self.RECORD) as mock_fetch:
+            result, errors = generate_catalog_with_errors(
+                show_progress=False, on_page=lambda url, record: first_done.set()
+            )
+
+        assert len(result) == 2 and errors == []
+        assert mock_fetch.call_count == 2
+
+    def test_sitemap_error_keeps_pages_already_listed(self):
+        """Un corte del sitemap a mitad de la descarga devuelve lo procesado y lo marca como error."""
+        def sitemap():
+            yield "Nivel4/Tema/1"
+            raise requests.ConnectionError("corte")
+
+        fetched = []
+        with patch("indec_catalog.catalog.iter_sitemap_urls", return_value=sitemap()), \
+                patch("indec_catalog.catalog.fetch_tema_data", return_value=self.RECORD):
+            result, errors = generate_catalog_with_errors(
+                show_progress=False, on_page=lambda url, record: fetched.append(url)
+            )
+
+        assert fetched == [f"{BASE_URL}/Nivel4/Tema/1"]
+        assert result == [self.RECORD]
+        assert errors == [SITEMAP_URL]
+
+    def test_sitemap_error_before_any_page_is_raised(self):
+        """Si el sitemap falla sin listar ninguna página no hay catálogo parcial que devolver."""
+        with patch("indec_catalog.catalog.iter_sitemap_urls", side_effect=requests.ConnectionError("caído")):
+            with pytest.raises(requests.ConnectionError):
+                generate_catalog_with_errors(show_progress=False)
+
+    def test_async_sitemap_error_keeps_pages_already_listed(self):
+        async def sitemap(client):
+            yield "Nivel4/Tema/1"
+            raise ConnectionError("corte")
+
+        async def fetch(url, client, stats):
+            return self.RECORD
+
+        with patch("indec_catalog.catalog.aiter_sitemap_urls", side_effect=sitemap), \
+                patch("indec_catalog.catalog.afetch_tema_data", side_effect=fetch):
+            result, errors = asyncio.run(agenerate_catalog_with_errors(show_progress=False, client=Mock()))
+
+        assert result == [self.RECORD]
+        assert errors == [SITEMAP_URL]
+
+    def test_prefetch_is_bounded_and_stops_with_consumer(self):
+        """El productor se adelanta como mucho maxsize elementos y se detiene si se deja de consumir."""
+        produced = []
+        closed = threading.Event()
+
+        def items():
+            try:
+                for i in range(100):
+                    produced.append(i)
+                    yield i
+            finally:
+                closed.set()
+
+        prefetched = _prefetched(items(), maxsize=2)
+        assert next(prefetched) == 0
+        time.sleep(0.3)
+        assert len(produced) <= 4  # El entregado, los 2 en cola y el que espera lugar
+        prefetched.close()
+        assert closed.wait(timeout=5)
+
+    def test_async_pages_start_while_sitemap_streams(self):
+        """En la versión asíncrona cada página empieza apenas aparece en el sitemap."""
+        started = []
+
+        async def sitemap(client):
+            yield "Nivel4/Tema/1"
+            await asyncio.sleep(0.01)
+            assert started == [f"{BASE_URL}/Nivel4/Tema/1"]
+            yield "Nivel4/Tema/2"
+
+        async def fetch(url, client, stats):
+            started.append(url)
+            return dict(self.RECORD, agrupamiento=url[-1])
+
+        with patch("indec_catalog.catalog.aiter_sitemap_urls", side_effect=sitemap), \
+                patch("indec_catalog.catalog.afetch_tema_data", side_effect=fetch):
+            result, errors = asyncio.run(
+                agenerate_catalog_with_errors(show_progress=True, client=Mock())
+            )
+
+        assert [r["agrupamiento"] for r in result] == ["1", "2"]
+        assert errors == []
+
+
+class TestPageStats:
+    """Tests para las métricas por página del crawl."""
+
+    @patch("indec_catalog.catalog.fetch_tema_data")
+    @patch("indec_catalog.catalog.iter_sitemap_urls")
+    def test_on_stats_receives_metrics_and_errors(self, mock_extract, mock_fetch):
+        """on_stats recibe las métricas de cada página, incluidas las fallidas."""
+        mock_extract.return_value = ["Nivel4/Tema/1", "Nivel4/Tema/2"]
+
+        def fake_fetch(url, stats):
+            if url.endswith("/2"):
+                raise requests.ConnectionError("caída")
+            stats.update(fetch_time=0.5, parse_time=0.1, links=1, outcome="ok")
+            return TestGenerateCatalogIncremental.RECORD
+
+        mock_fetch.side_effect = fake_fetch
+        profiler = PageProfiler()
+
+        generate_catalog_with_errors(show_progress=False, on_stats=profiler.record)
+
+        assert profiler.pages[f"{BASE_URL}/Nivel4/Tema/1"]["fetch_time"] == 0.5
+        assert "caída" in profiler.pages[f"{BASE_URL}/Nivel4/Tema/2"]["error"]
+        report = profiler.report(1)
+        assert f"{BASE_URL}/Nivel4/Tema/1" in report
+        assert f"{BASE_URL}/Nivel4/Tema/2" not in report.splitlines()[2]
+
+
+class TestRetryFailedPages:
+    """Tests para retry_failed_pages y merge_catalogs."""
+
+    RECORD = {
+        "tema": "Sociedad",
+        "subtema": "Salud",
+        "agrupamiento": "Nutrición",
+        "archivos": [{"nombre_archivo": "Datos", "url": f"{BASE_URL}/datos.csv"}],
+    }
+
+    @patch("indec_catalog.catalog.fetch_tema_data")
+    def test_retries_only_transient_errors_with_backoff(self, mock_fetch):
+        """Reintenta timeouts con espera creciente; una página sin ruta no se reintenta."""
+        urls = [f"{BASE_URL}/Nivel4/Tema/{i}" for i in range(3)]
+        calls = {url: 0 for url in urls}
+
+        def fake_fetch(url, stats):
+            calls[url] += 1
+            if url == urls[0] and calls[url] < 3:
+                raise requests.Timeout("lento")
+            if url == urls[1]:
+                stats["outcome"] = "no_breadcrumb"
+                return None
+            stats["outcome"] = "ok"
+            return self.RECORD
+
+        mock_fetch.side_effect = fake_fetch
+        sleeps = []
+        outcomes = []
+
+        pages, errors = retry_failed_pages(
+            urls,
+            max_attempts=3,
+            backoff=1.0,
+            show_progress=False,
+            on_stats=lambda url, stats: outcomes.append((url, stats["outcome"])),
+            sleep=sleeps.append,
+        )
+
+        assert [url for url, _ in pages] == [urls[0], urls[2]]
+        assert errors == [urls[1]]
+        assert calls == {urls[0]: 3, urls[1]: 1, urls[2]: 1}
+        assert sleeps == [1.0, 2.0]
+        assert (urls[0], "timeout") in outcomes
+
+    def test_merge_replaces_in_place_and_inserts_by_hierarchy(self):
+        """Reemplaza por clave y ubica los registros nuevos junto a su tema/subtema."""
+        def record(tema, subtema, agrupamiento, nombre="x"):
+            return Catalog(
+                tema=tema, subtema=subtema, agrupamiento=agrupamiento,
+                archivos=[Archivo(nombre_archivo=nombre, url=f"{BASE_URL}/{nombre}.csv")],
+            )
+
+        base = [
+            record("Economía", "Precios", "IPC"),
+            record("Sociedad", "Salud", "Nutrición"),
+            record("Sociedad", "Trabajo", "EPH"),
+            record("Bases de datos", "EPH", "Microdatos"),
+        ]
+        merged = merge_catalogs(base, [
+            record("Sociedad", "Salud", "Nutrición", nombre="nuevo"),
+            record("Sociedad", "Salud", "Discapacidad"),
+            record("Sociedad", "Vivienda", "Censo"),
+        ])
+
+        assert [(r.subtema, r.agrupamiento) for r in merged] == [
+            ("Precios", "IPC"),
+            ("Salud", "Nutrición"),
+            ("Salud", "Discapacidad"),
+            ("Trabajo", "EPH"),
+            ("Vivienda", "Censo"),
+            ("EPH", "Microdatos"),
+        ]
+        assert merged[1].archivos[0].nombre_archivo == "nuevo"
+
+
+class TestRedirectCoalescing:
+    """Tests para la deduplicación por URL final y el mapa de redirecciones."""
+
+    URLS = [f"{BASE_URL}/Nivel4/Tema/{i}" for i in range(4)]
+    # 1 y 3 redirigen a la misma página final que 0
+    FINAL = {URLS[0]: URLS[0], URLS[1]: URLS[0], URLS[2]: URLS[2], URLS[3]: URLS[0]}
+
+    def _fake_fetch(self, calls):
+        def fetch(url, stats):
+            calls.append(url)
+            stats["final_url"] = self.FINAL[url]
+            stats["outcome"] = "ok"
+            return {"tema": "T", "subtema": "S", "agrupamiento": self.FINAL[url], "archivos": []}
+        return fetch
+
+    def test_collapses_duplicates_and_skips_known_redirects(self, tmp_path):
+        """Una página final aparece una vez; con el mapa guardado ni se descarga de nuevo."""
+        redirects = RedirectMap(tmp_path / "redirects.json")
+        calls = []
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=self._fake_fetch(calls)):
+            pages, errors = _fetch_pages(self.URLS, show_progress=False, redirects=redirects)
+        redirects.save()
+
+        assert [url for url, _ in pages] == [self.URLS[0], self.URLS[2]]
+        assert errors == []
+        assert len(calls) == 4
+
+        calls.clear()
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=self._fake_fetch(calls)):
+            pages, _ = _fetch_pages(
+                self.URLS, show_progress=False, redirects=RedirectMap(tmp_path / "redirects.json")
+            )
+        assert calls == [self.URLS[0], self.URLS[2]]
+        assert [url for url, _ in pages] == [self.URLS[0], self.URLS[2]]
+
+    def test_expired_redirects_are_checked_again(self, tmp_path):
+        """Una redirección vencida ya no se usa para evitar la descarga."""
+        redirects = RedirectMap(ttl=-1)
+        redirects.record(self.URLS[1], self.URLS[0])
+        assert redirects.resolve(self.URLS[1]) == self.URLS[1]
+
+    def test_async_requests_share_in_flight_fetch(self):
+        """Las URLs que redirigen a la misma página comparten una sola descarga en vuelo."""
+        httpx = pytest.importorskip("httpx")
+        requested = []
+
+        async def handler(request):
+            requested.append(str(request.url))
+            await asyncio.sleep(0.01)
+            return httpx.Response(
+                200, content=TestAsyncCatalog._page(request.url.path.rsplit("/", 1)[-1])
+            )
+
+        redirects = RedirectMap()
+        for url in self.URLS:
+            redirects.record(url, self.FINAL[url])
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await _afetch_pages(self.URLS, client, concurrency=4, show_progress=False, redirects=redirects)
+
+        result, errors = asyncio.run(run())
+
+        assert sorted(requested) == [self.URLS[0], self.URLS[2]]
+        assert [r["tema"] for r in result] == ["Tema 0", "Tema 2"]
+        assert errors == []
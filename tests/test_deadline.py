@@ -0,0 +1,144 @@
+"""Tests para el módulo deadline."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from indec_catalog import cli
+from indec_catalog.config import BASE_URL
+from indec_catalog.deadline import PageHistory, generate_catalog_deadline, prioritize
+
+LINKS = [f"Nivel4/Tema/1/{i}" for i in range(4)]
+URLS = [f"{BASE_URL}/{link}" for link in LINKS]
+
+
+def record(url, files=1):
+    n = url.rsplit("/", 1)[-1]
+    return {
+        "tema": "Tema",
+        "subtema": "Subtema",
+        "agrupamiento": f"Grupo {n}",
+        "archivos": [
+            {"nombre_archivo": f"Cuadro {n}.{i}", "url": f"{BASE_URL}/c{n}_{i}.csv"} for i in range(files)
+        ],
+    }
+
+
+class TestPageHistory:
+    """Tests para PageHistory y prioritize."""
+
+    def test_records_changes_and_persists(self, tmp_path):
+        history = PageHistory(tmp_path / "history.json")
+        history.record("u", record("u/1"))
+        assert history.entries["u"]["changed"] is None
+
+        history.record("u", record("u/1"))
+        assert history.entries["u"]["changed"] is None
+        history.record("u", record("u/1", files=3))
+        assert history.entries["u"]["changed"] is not None
+        history.save()
+
+        assert PageHistory(tmp_path / "history.json").entries["u"]["files"] == 3
+
+    def test_unknown_then_recent_then_data_rich(self):
+        now = datetime.now(timezone.utc)
+        history = PageHistory()
+        history.entries = {
+            "old_rich": {"files": 50, "changed": (now - timedelta(days=400)).isoformat()},
+            "recent_poor": {"files": 1, "changed": (now - timedelta(days=2)).isoformat()},
+            "never_changed": {"files": 5, "changed": None},
+            "recent_rich": {"files": 9, "changed": (now - timedelta(days=10)).isoformat()},
+        }
+        urls = ["old_rich", "recent_poor", "new_a", "never_changed", "recent_rich", "new_b"]
+
+        assert prioritize(urls, history, now) == [
+            "new_a", "new_b", "recent_rich", "recent_poor", "old_rich", "never_changed",
+        ]
+
+
+class TestGenerateCatalogDeadline:
+    """Tests para generate_catalog_deadline y --deadline."""
+
+    @patch("indec_catalog.deadline.extract_sitemap_urls", return_value=LINKS)
+    def test_stops_at_deadline_and_fills_stale(self, mock_extract):
+        history = PageHistory()
+        for url in URLS[:3]:
+            history.record(url, record(url, files=int(url[-1]) + 1))
+        now = [0.0]
+
+        def fetch(url, stats):
+            now[0] += 1
+            stats["outcome"] = "ok"
+            return record(url)
+
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=fetch) as mock_fetch:
+            result, errors, stale = generate_catalog_deadline(
+                2.5, history, show_progress=False, clock=lambda: now[0]
+            )
+
+        # Orden: página nueva (3), luego por cantidad de archivos (2, 1); no entra la 0
+        assert [c.args[0] for c in mock_fetch.call_args_list] == [URLS[3], URLS[2], URLS[1]]
+        assert stale == [URLS[0]]
+        assert errors == []
+        assert [r["agrupamiento"] for r in result] == ["Grupo 0", "Grupo 1", "Grupo 2", "Grupo 3"]
+        assert len(result[0]["archivos"]) == 1
+
+    @patch("indec_catalog.catalog.iter_sitemap_urls", return_value=LINKS)
+    @patch("indec_catalog.deadline.extract_sitemap_urls", return_value=LINKS)
+    def test_cli_zero_deadline_serves_previous_run(self, mock_deadline_extract, mock_extract, tmp_path):
+        output = tmp_path / "catalogo.json"
+        args = ["-o", str(output), "--no-progress", "--cache-dir", str(tmp_path / "cache")]
+
+        def fetch(url, stats, session=None):
+            stats["outcome"] = "ok"
+            return record(url)
+
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=fetch):
+            cli.main(args)
+        full = output.read_text(encoding="utf-8")
+
+        with patch("indec_catalog.catalog.fetch_tema_data") as mock_fetch:
+            cli.main(args + ["--deadline", "0"])
+        mock_fetch.assert_not_called()
+        assert output.read_text(encoding="utf-8") == full
+        stale = json.loads(output.with_suffix(".stale.json").read_text(encoding="utf-8"))
+        assert [s["url"] for s in stale["stale"]] == URLS
+
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=fetch):
+            cli.main(args)
+        assert not output.with_suffix(".stale.json").exists()
+
+    @patch("indec_catalog.catalog.iter_sitemap_urls", return_value=LINKS)
+    @patch("indec_catalog.deadline.extract_sitemap_urls", return_value=LINKS)
+    def test_cli_deadline_applies_to_bases_datos(self, mock_deadline_extract, mock_extract, tmp_path):
+        """Con el tiempo agotado, Bases de datos tampoco se descarga: se completa con la corrida anterior."""
+        from indec_catalog.models import Catalog
+
+        output = tmp_path / "catalogo.json"
+        args = ["-o", str(output), "--no-progress", "--cache-dir", str(tmp_path / "cache"), "--incluir-bases-datos"]
+        bases = [Catalog.model_validate({**record(f"{BASE_URL}/bd/9"), "tema": "Bases de datos"})]
+
+        def fetch(url, stats, session=None):
+            stats["outcome"] = "ok"
+            return record(url)
+
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=fetch), \
+                patch("indec_catalog.sources.generate_catalog_bases_datos", return_value=bases):
+            cli.main(args)
+        full = output.read_text(encoding="utf-8")
+
+        with patch("indec_catalog.catalog.fetch_tema_data") as mock_fetch, \
+                patch("indec_catalog.sources.generate_catalog_bases_datos") as mock_bases:
+            cli.main(args + ["--deadline", "0"])
+        mock_fetch.assert_not_called()
+        mock_bases.assert_not_called()
+        assert output.read_text(encoding="utf-8") == full
+        stale = json.loads(output.with_suffix(".stale.json").read_text(encoding="utf-8"))
+        assert stale["stale"][-1]["tema"] == "Bases de datos"
+
+    def test_cli_rejects_negative_deadline(self, tmp_path, capsys):
+        with pytest.raises(SystemExit):
+            cli.main(["-o", str(tmp_path / "catalogo.json"), "--deadline", "-5"])
+        assert "--deadline no puede ser negativo" in capsys.readouterr().err
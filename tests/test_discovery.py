@@ -0,0 +1,194 @@
+"""Tests para el módulo discovery."""
+
+from unittest.mock import Mock, PropertyMock, patch
+
+import requests
+
+from indec_catalog.config import BASE_URL, DISCOVERY_TEMA
+from indec_catalog.discovery import BloomFilter, Politeness, VisitStore, discover
+
+RUTA = '<div class="ruta-texto mb-3">Inicio> Economía >Precios >IPC</div>'
+
+SITE = {
+    "/robots.txt": "User-agent: *\nDisallow: /Privado",
+    "/Inicio": (
+        '<a href="/Nivel4/Tema/1">n4</a><a href="Institucional/A">a</a><a href="/doc.pdf">pdf</a>'
+        '<a href="https://otro.org/x">ext</a><a href="mailto:x@indec.gob.ar">m</a>'
+        '<a href="/Privado/X">p</a>'
+    ),
+    "/Nivel4/Tema/1": f'{RUTA}<a href="/ftp/a.csv">A</a><a href="/Institucional/B">b</a>',
+    "/Institucional/A": (
+        '<a href="/ftp/a.csv">A otra vez</a><a href="/ftp/b.xls">B</a>'
+        '<a href="/Institucional/A#arriba">self</a><a href="/Institucional/C">c</a>'
+    ),
+    "/Institucional/B": '<a href="../../ftp/c.csv">C</a><a href="/Institucional/A">a</a>',
+    "/Institucional/C": '<a href="/ftp/d.csv">D</a><a href="/Institucional/D">d</a>',
+    "/Institucional/D": '<a href="/ftp/e.csv">E</a>',
+}
+
+
+def fake_get(url, **kwargs):
+    path = url[len(BASE_URL):]
+    response = Mock(url=url, headers={"Content-Type": "text/html; charset=utf-8"})
+    if path not in SITE:
+        response.status_code = 404
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+        return response
+    response.status_code = 200
+    response.text = SITE[path]
+    response.content = SITE[path].encode("utf-8")
+    return response
+
+
+class TestBloomFilter:
+    """Tests para BloomFilter."""
+
+    def test_no_false_negatives_and_low_false_positive_rate(self):
+        bloom = BloomFilter(capacity=5000, error_rate=0.01)
+        for i in range(5000):
+            bloom.add(f"https://x/{i}")
+
+        assert all(f"https://x/{i}" in bloom for i in range(5000))
+        false_positives = sum(f"https://y/{i}" in bloom for i in range(5000))
+        assert false_positives < 150
+
+
+class TestPoliteness:
+    """Tests para Politeness."""
+
+    def test_waits_between_requests_to_same_host(self):
+        now = [0.0]
+        slept = []
+
+        def sleep(seconds):
+            slept.append(seconds)
+            now[0] += seconds
+
+        politeness = Politeness(delay=1.0, clock=lambda: now[0], sleep=sleep)
+        politeness.wait("https://a/1")
+        now[0] += 0.25
+        politeness.wait("https://a/2")
+        politeness.wait("https://b/1")
+
+        assert slept == [0.75]
+
+
+class TestDiscover:
+    """Tests para discover."""
+
+    @patch("indec_catalog.discovery.requests.get", side_effect=fake_get)
+    def test_bfs_with_limits_robots_and_dedup(self, mock_get, tmp_path):
+        store = VisitStore(tmp_path / "visits.db")
+        politeness = Politeness(delay=0, sleep=lambda s: None)
+
+        records, errors, stats = discover(
+            [f"{BASE_URL}/Inicio"],
+            store,
+            exclude=[f"{BASE_URL}/Nivel4/Tema/1"],
+            max_depth=2,
+            politeness=politeness,
+            show_progress=False,
+        )
+
+        # La Nivel4 no genera registro y su a.csv no se repite en /Institucional/A
+        assert [r["agrupamiento"] for r in records] == ["A", "C", "B"]
+        assert records[0]["tema"] == DISCOVERY_TEMA
+        assert [a["url"] for a in records[0]["archivos"]] == [f"{BASE_URL}/ftp/b.xls"]
+        assert records[2]["archivos"] == [{"nombre_archivo": "C", "url": f"{BASE_URL}/ftp/c.csv"}]
+        assert errors == []
+        assert stats["skipped_robots"] == 1
+        fetched = [c.args[0] for c in mock_get.call_args_list]
+        assert f"{BASE_URL}/Institucional/D" not in fetched  # Profundidad 3
+        assert len(fetched) == len(set(fetched))
+        assert not any("otro.org" in url or url.endswith(".pdf") for url in fetched)
+
+        mock_get.reset_mock()
+        again, _, stats = discover(
+            [f"{BASE_URL}/Inicio"],
+            store,
+            exclude=[f"{BASE_URL}/Nivel4/Tema/1"],
+            max_depth=2,
+            politeness=politeness,
+            show_progress=False,
+        )
+        assert again == records
+        assert stats["fetched"] == 0 and stats["cached"] == 5
+        mock_get.assert_not_called()
+
+    @patch("indec_catalog.discovery.requests.get", side_effect=fake_get)
+    def test_max_pages_and_errors(self, mock_get):
+        politeness = Politeness(delay=0, respect_robots=False, sleep=lambda s: None)
+
+        records, errors, stats = discover(
+            [f"{BASE_URL}/Falta", f"{BASE_URL}/Institucional/C", f"{BASE_URL}/Institucional/B"],
+            max_pages=1,
+            politeness=politeness,
+            show_progress=False,
+        )
+
+        assert errors == [f"{BASE_URL}/Falta"]
+        assert stats["errors"] == {"http_status": 1}
+        assert [r["archivos"][0]["url"] for r in records] == [f"{BASE_URL}/ftp/d.csv"]
+        assert stats["visited"] == 1
+
+    def test_callbacks_and_shared_session(self):
+        """Las páginas pasan por on_stats y los registros por on_page, con la sesión dada."""
+        session = Mock(get=Mock(side_effect=fake_get))
+        politeness = Politeness(delay=0, respect_robots=False, sleep=lambda s: None)
+        pages, stats = [], {}
+
+        records, errors, _ = discover(
+            [f"{BASE_URL}/Falta", f"{BASE_URL}/Institucional/D"],
+            politeness=politeness,
+            show_progress=False,
+            on_page=lambda url, record: pages.append((url, record)),
+            on_stats=stats.__setitem__,
+            session=session,
+        )
+
+        assert pages == [(f"{BASE_URL}/Institucional/D", records[0])]
+        assert stats[f"{BASE_URL}/Falta"]["outcome"] == "http_status"
+        assert stats[f"{BASE_URL}/Institucional/D"]["outcome"] == "ok"
+        assert stats[f"{BASE_URL}/Institucional/D"]["links"] == 1
+        assert errors == [f"{BASE_URL}/Falta"]
+        assert session.get.call_count == 2
+
+    @patch("indec_catalog.discovery.requests.get", side_effect=fake_get)
+    def test_stop_uses_stored_visits_of_any_age(self, mock_get, tmp_path):
+        """Con `stop` activo no se descarga más: solo se siguen las visitas guardadas, aunque estén vencidas."""
+        store = VisitStore(tmp_path / "visits.db")
+        politeness = Politeness(delay=0, respect_robots=False, sleep=lambda s: None)
+        seeds = [f"{BASE_URL}/Institucional/C"]
+        first, _, _ = discover(seeds, store, max_depth=0, politeness=politeness, show_progress=False)
+
+        mock_get.reset_mock()
+        records, errors, stats = discover(
+            seeds, store, max_depth=1, politeness=politeness, revisit=-1, show_progress=False, stop=lambda: True
+        )
+
+        mock_get.assert_not_called()
+        assert records == first
+        assert stats["cached"] == 1
+        assert stats["skipped_deadline"] == 1  # /Institucional/D nunca se visitó
+        assert errors == []
+
+    def test_non_html_body_is_not_downloaded(self):
+        """Las respuestas que no son HTML se piden con stream=True y se cierran sin leer el cuerpo."""
+        response = Mock(url=f"{BASE_URL}/Institucional/Informe", headers={"Content-Type": "application/pdf"})
+        type(response).content = PropertyMock(side_effect=AssertionError("cuerpo leído"))
+        session = Mock(get=Mock(return_value=response))
+        politeness = Politeness(delay=0, respect_robots=False, sleep=lambda s: None)
+        stats = {}
+
+        records, errors, _ = discover(
+            [f"{BASE_URL}/Institucional/Informe"],
+            politeness=politeness,
+            show_progress=False,
+            on_stats=stats.__setitem__,
+            session=session,
+        )
+
+        assert records == [] and errors == []
+        assert session.get.call_args.kwargs["stream"] is True
+        response.close.assert_called_once()
+        assert stats[f"{BASE_URL}/Institucional/Informe"]["bytes"] == 0
@@ -0,0 +1,52 @@
+"""Tests para el módulo failures."""
+
+import requests
+from unittest.mock import Mock
+
+from indec_catalog.failures import FailureQueue, classify_exception, is_retryable
+
+
+class TestClassifyException:
+    """Tests para classify_exception e is_retryable."""
+
+    def test_classifies_requests_errors(self):
+        """Distingue timeout, conexión y status HTTP."""
+        response = Mock(status_code=503)
+        http_error = requests.HTTPError("503", response=response)
+
+        assert classify_exception(requests.ConnectTimeout())["outcome"] == "timeout"
+        assert classify_exception(requests.ConnectionError())["outcome"] == "connection"
+        assert classify_exception(http_error) == {"error": repr(http_error), "outcome": "http_status", "status": 503}
+        assert classify_exception(ValueError("x"))["outcome"] == "other"
+
+    def test_retryable(self):
+        """Solo los errores transitorios se reintentan dentro de una corrida."""
+        assert is_retryable("timeout")
+        assert is_retryable("http_status", 502)
+        assert is_retryable("http_status", 429)
+        assert not is_retryable("http_status", 404)
+        assert not is_retryable("no_breadcrumb")
+
+
+class TestFailureQueue:
+    """Tests para FailureQueue."""
+
+    def test_record_and_persist(self, tmp_path):
+        """Las fallas se acumulan con sus intentos y las páginas exitosas salen de la cola."""
+        path = tmp_path / "failures.json"
+        queue = FailureQueue(path)
+        queue.record("u1", {"outcome": "timeout", "error": "Timeout()", "elapsed": 30.0})
+        queue.record("u1", {"outcome": "http_status", "status": 502, "fetch_time": 0.4})
+        queue.record("u2", {"outcome": "error_default", "fetch_time": 0.2})
+        queue.record("u3", {"outcome": "ok"})
+        queue.save()
+
+        loaded = FailureQueue(path)
+        assert loaded.urls() == ["u1", "u2"]
+        assert loaded.failures["u1"].attempts == 2
+        assert loaded.failures["u1"].status == 502
+        assert loaded.failures["u1"].latency == 0.4
+        assert loaded.summary() == {"http_status": 1, "error_default": 1}
+
+        loaded.record("u1", {"outcome": "ok"})
+        assert loaded.urls() == ["u2"]
@@ -0,0 +1,90 @@
+"""Tests para el módulo history."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from indec_catalog.history import CatalogHistory, apply_delta, diff_rows
+from indec_catalog.models import Archivo, Catalog
+
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def catalog(*groups):
+    """Catálogo a partir de (agrupamiento, [(nombre, url), ...])."""
+    return [
+        Catalog(
+            tema="Tema",
+            subtema="Subtema",
+            agrupamiento=agrupamiento,
+            archivos=[Archivo(nombre_archivo=n, url=f"https://x/{u}") for n, u in files],
+        )
+        for agrupamiento, files in groups
+    ]
+
+
+class TestDelta:
+    """Tests para diff_rows y apply_delta."""
+
+    def test_roundtrip_with_adds_removes_renames_and_moves(self):
+        old = [["T", "S", "A", f"n{i}", f"u{i}"] for i in range(8)]
+        new = [list(r) for r in old]
+        new[2][3] = "renombrado"
+        del new[5]
+        new.insert(0, ["T", "S", "B", "nuevo", "u9"])
+        new.append(new.pop(1))  # Se mueve al final
+
+        delta = diff_rows(old, new)
+
+        assert apply_delta(old, delta) == new
+        assert [2, "renombrado"] in delta["changed"]
+        assert old[2][3] == "n2"
+
+
+class TestCatalogHistory:
+    """Tests para CatalogHistory."""
+
+    def test_as_of_reconstructs_every_run_across_keyframes(self, tmp_path):
+        versions = [catalog(("A", [("a", "a.csv")]))]
+        for i in range(1, 7):
+            previous = versions[-1]
+            groups = [(c.agrupamiento, [(a.nombre_archivo, a.url.rsplit("/", 1)[1]) for a in c.archivos])
+                      for c in previous]
+            groups[0][1].append((f"nuevo {i}", f"n{i}.csv"))
+            if i % 2 == 0:
+                groups[0][1].pop(0)
+            if i == 3:
+                groups.append(("B", [("b", "b.csv")]))
+            versions.append(catalog(*groups))
+
+        history = CatalogHistory(tmp_path, keyframe_interval=3)
+        for day, version in enumerate(versions):
+            history.append(version, T0 + timedelta(days=day))
+
+        reopened = CatalogHistory(tmp_path, keyframe_interval=3)
+        assert [s["kind"] for s in reopened.snapshots] == ["keyframe", "delta", "delta"] * 2 + ["keyframe"]
+        for day, version in enumerate(versions):
+            assert reopened.as_of(T0 + timedelta(days=day, hours=12)) == version
+        assert reopened.as_of("2030-01-01") == versions[-1]
+        with pytest.raises(LookupError):
+            reopened.as_of(T0 - timedelta(days=1))
+
+    def test_file_dates_and_counts(self, tmp_path):
+        history = CatalogHistory(tmp_path)
+        history.append(catalog(("A", [("a", "a.csv"), ("b", "b.csv")])), T0)
+        entry = history.append(catalog(("A", [("a v2", "a.csv"), ("c", "c.csv")])), T0 + timedelta(days=1))
+        history.append(catalog(("A", [("a v2", "a.csv")])), T0 + timedelta(days=2))
+
+        assert (entry["added"], entry["removed"], entry["changed"]) == (1, 1, 1)
+        dates = CatalogHistory(tmp_path).file_dates("https://x/b.csv")
+        assert dates == {"first_seen": T0.isoformat(), "last_seen": T0.isoformat()}
+        assert history.file_dates("https://x/a.csv")["last_seen"] == (T0 + timedelta(days=2)).isoformat()
+        assert history.file_dates("https://x/c.csv")["first_seen"] == (T0 + timedelta(days=1)).isoformat()
+        assert history.file_dates("https://x/otro.csv") is None
+
+    def test_rejects_runs_out_of_order(self, tmp_path):
+        history = CatalogHistory(tmp_path)
+        history.append(catalog(("A", [("a", "a.csv")])), T0)
+
+        with pytest.raises(ValueError):
+            history.append(catalog(("A", [("a", "a.csv")])), T0 - timedelta(hours=1))
@@ -0,0 +1,61 @@
+"""Tests para el módulo http."""
+
+import pytest
+from unittest.mock import patch
+
+from indec_catalog import http
+
+
+class TestCreateAsyncClient:
+    """Tests para create_async_client."""
+
+    def _kwargs(self, **options):
+        pytest.importorskip("httpx")
+        with patch.object(http.httpx, "AsyncClient") as client_cls:
+            http.create_async_client(8, **options)
+        return client_cls.call_args.kwargs
+
+    def test_http2_enabled_when_available(self):
+        """Con h2 instalado se habilita HTTP/2, negociado con fallback a HTTP/1.1."""
+        with patch.object(http, "HTTP2_AVAILABLE", True):
+            kwargs = self._kwargs()
+        assert kwargs["http2"] is True
+        assert kwargs["http1"] is True
+        assert kwargs["limits"].max_connections == 8
+
+    def test_http1_without_h2(self):
+        """Sin h2 se usa HTTP/1.1; pedir HTTP/2 explícitamente falla."""
+        with patch.object(http, "HTTP2_AVAILABLE", False):
+            assert self._kwargs()["http2"] is False
+            with pytest.raises(ImportError, match="h2"):
+                self._kwargs(http2=True)
+
+    def test_prior_knowledge_disables_http1(self):
+        """Con prior_knowledge se habla HTTP/2 directamente (h2c)."""
+        with patch.object(http, "HTTP2_AVAILABLE", True):
+            kwargs = self._kwargs(prior_knowledge=True)
+        assert kwargs["http2"] is True
+        assert kwargs["http1"] is False
+
+
+class TestCreateSession:
+    """Tests para create_session."""
+
+    def test_pool_size(self):
+        with http.create_session(4) as session:
+            adapter = session.get_adapter("https://www.indec.gob.ar")
+            assert adapter._pool_maxsize == 4
+            assert session.get_adapter("http://www.indec.gob.ar") is adapter
+
+
+class TestResponseCharset:
+    """Tests para response_charset."""
+
+    @pytest.mark.parametrize("content_type, expected", [
+        ("text/html; charset=ISO-8859-1", "ISO-8859-1"),
+        ("text/html;Charset=utf-8", "utf-8"),
+        ("text/html", "utf-8"),
+        (None, "utf-8"),
+    ])
+    def test_declared_or_default(self, content_type, expected):
+        assert http.response_charset(content_type) == expected
@@ -0,0 +1,130 @@
+"""Tests para el módulo journal."""
+
+import json
+import pytest
+from unittest.mock import patch
+
+from indec_catalog import cli
+from indec_catalog.config import BASE_URL
+from indec_catalog.journal import CrawlJournal
+
+LINKS = [f"Nivel4/Tema/1/{i}" for i in range(5)]
+
+
+def record(url):
+    n = url.rsplit("/", 1)[-1]
+    return {
+        "tema": "Tema",
+        "subtema": "Subtema",
+        "agrupamiento": f"Grupo {n}",
+        "archivos": [{"nombre_archivo": f"Cuadro {n}", "url": f"{BASE_URL}/c{n}.csv"}],
+    }
+
+
+class TestCrawlJournal:
+    """Tests para CrawlJournal y --resume."""
+
+    def test_resume_ignores_torn_last_line(self, tmp_path):
+        """Una línea cortada por la interrupción se descarta antes de seguir escribiendo."""
+        path = tmp_path / "journal.ndjson"
+        journal = CrawlJournal(path)
+        journal.append("u1", {"a": 1})
+        journal.close()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"url": "u2", "da')
+
+        resumed = CrawlJournal(path, resume=True)
+        assert resumed.entries == {"u1": {"a": 1}}
+        resumed.append("u3", {"a": 3})
+        resumed.close()
+
+        assert CrawlJournal(path, resume=True).entries == {"u1": {"a": 1}, "u3": {"a": 3}}
+
+    @patch("indec_catalog.catalog.iter_sitemap_urls", return_value=LINKS)
+    def test_resume_fetches_only_remaining_pages(self, mock_extract, tmp_path):
+        """Tras una interrupción, --resume completa el catálogo sin repetir páginas."""
+        output = tmp_path / "catalogo.json"
+        args = ["-o", str(output), "--no-progress", "--cache-dir", str(tmp_path / "cache")]
+        fetched = []
+
+        def interrupted(url, stats, session=None):
+            if url.endswith("/3"):
+                raise KeyboardInterrupt
+            fetched.append(url)
+            stats["outcome"] = "ok"
+            return record(url)
+
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=interrupted):
+            with pytest.raises(SystemExit):
+                cli.main(args)
+        journal_path = output.with_suffix(".journal.ndjson")
+        assert not output.exists()
+        assert len(journal_path.read_text(encoding="utf-8").splitlines()) == 3
+
+        fetched.clear()
+
+        def complete(url, stats, session=None):
+            fetched.append(url)
+            stats["outcome"] = "ok"
+            return record(url)
+
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=complete):
+            cli.main(args + ["--resume"])
+
+        assert [url.rsplit("/", 1)[-1] for url in fetched] == ["3", "4"]
+        catalog = json.loads(output.read_text(encoding="utf-8"))
+        assert [r["agrupamiento"] for r in catalog] == [f"Grupo {i}" for i in range(5)]
+        assert not journal_path.exists()
+
+    def test_async_resume_fetches_only_remaining_pages(self, tmp_path):
+        """--async también usa el diario: --resume descarga solo las páginas que faltan."""
+        pytest.importorskip("httpx")
+        output = tmp_path / "catalogo.json"
+        journal = CrawlJournal(output.with_suffix(".journal.ndjson"))
+        for link in LINKS[:3]:
+            url = f"{BASE_URL}/{link}"
+            journal.append(url, record(url))
+        journal.close()
+        fetched = []
+
+        async def links(client):
+            for link in LINKS:
+                yield link
+
+        async def fetch(url, client, stats):
+            fetched.append(url)
+            stats["outcome"] = "ok"
+            return record(url)
+
+        with patch("indec_catalog.catalog.aiter_sitemap_urls", side_effect=links), \
+                patch("indec_catalog.catalog.afetch_tema_data", side_effect=fetch):
+            cli.main(["-o", str(output), "--no-progress", "--cache-dir", str(tmp_path / "cache"),
+                      "--async", "--resume"])
+
+        assert [url.rsplit("/", 1)[-1] for url in fetched] == ["3", "4"]
+        catalog = json.loads(output.read_text(encoding="utf-8"))
+        assert [r["agrupamiento"] for r in catalog] == [f"Grupo {i}" for i in range(5)]
+        assert not output.with_suffix(".journal.ndjson").exists()
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            ["--incremental"],
+            ["--deadline", "60"],
+            ["--fuentes", "mapa_sitio,descubrimiento"],
+        ],
+    )
+    def test_resume_rejects_modes_without_journal(self, extra, tmp_path, capsys):
+        """--resume no se ignora en silencio: los modos que no usan el diario lo rechazan."""
+        output = tmp_path / "catalogo.json"
+        CrawlJournal(output.with_suffix(".journal.ndjson")).close()
+
+        with pytest.raises(SystemExit):
+            cli.main(["-o", str(output), "--resume"] + extra)
+        assert "--resume" in capsys.readouterr().err
+
+    def test_resume_without_journal_fails(self, tmp_path, capsys):
+        """Sin una corrida interrumpida, --resume falla en lugar de empezar de cero."""
+        with pytest.raises(SystemExit):
+            cli.main(["-o", str(tmp_path / "catalogo.json"), "--resume"])
+        assert "no hay una corrida interrumpida" in capsys.readouterr().err
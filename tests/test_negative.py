@@ -0,0 +1,108 @@
+"""Tests para el módulo negative."""
+
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+from indec_catalog import cli
+from indec_catalog.catalog import _afetch_pages, generate_catalog_with_errors
+from indec_catalog.config import BASE_URL, NEGATIVE_CACHE_FILE
+from indec_catalog.negative import EMPTY, NegativeCache
+
+LINKS = [f"Nivel4/Tema/1/{i}" for i in range(3)]
+URLS = [f"{BASE_URL}/{link}" for link in LINKS]
+
+
+def fetch(url, stats, session=None):
+    """Página 0 con datos, 1 sin archivos, 2 redirige a la página de error."""
+    n = url[-1]
+    if n == "2":
+        stats["outcome"] = "error_default"
+        return None
+    stats["outcome"] = "ok"
+    stats["links"] = 1 if n == "0" else 0
+    archivos = [{"nombre_archivo": "Cuadro", "url": f"{BASE_URL}/c{n}.csv"}] if n == "0" else []
+    return {"tema": "Tema", "subtema": "Subtema", "agrupamiento": f"Grupo {n}", "archivos": archivos}
+
+
+class TestNegativeCache:
+    """Tests para NegativeCache."""
+
+    def test_records_reasons_and_jittered_recheck(self, tmp_path):
+        cache = NegativeCache(tmp_path / "negative.json", ttl=1000, jitter=0.5, rng=random.Random(1))
+        cache.record("vacia", {"outcome": "ok", "links": 0})
+        cache.record("error", {"outcome": "error_default"})
+        cache.record("datos", {"outcome": "ok", "links": 4})
+        cache.record("timeout", {"outcome": "timeout"})
+
+        assert cache.summary() == {EMPTY: 1, "error_default": 1}
+        for entry in cache.entries.values():
+            delay = datetime.fromisoformat(entry["recheck"]) - datetime.fromisoformat(entry["checked"])
+            assert timedelta(seconds=500) <= delay <= timedelta(seconds=1500)
+        assert cache.skip("vacia") and not cache.skip("datos")
+
+        cache.record("vacia", {"outcome": "ok", "links": 2})  # Ahora tiene datos
+        assert "vacia" not in cache.entries
+        cache.save()
+        assert list(NegativeCache(tmp_path / "negative.json").entries) == ["error"]
+
+    def test_expired_entries_and_refresh_are_rechecked(self):
+        cache = NegativeCache()
+        cache.record("a", {"outcome": "no_breadcrumb"})
+        assert cache.skip("a")
+        cache.refresh = True
+        assert not cache.skip("a")
+        cache.refresh = False
+
+        cache.entries["a"]["recheck"] = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+        assert not cache.skip("a")
+        assert cache.skipped == 1
+
+
+class TestNegativeCrawl:
+    """Tests para la caché negativa en el crawl."""
+
+    @patch("indec_catalog.catalog.iter_sitemap_urls", return_value=LINKS)
+    def test_skips_pages_without_data(self, mock_extract):
+        cache = NegativeCache()
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=fetch):
+            first, errors = generate_catalog_with_errors(show_progress=False, negative=cache)
+        assert set(cache.entries) == set(URLS[1:])
+
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=fetch) as mock_fetch:
+            second, errors = generate_catalog_with_errors(show_progress=False, negative=cache)
+        assert [c.args[0] for c in mock_fetch.call_args_list] == [URLS[0]]
+        assert [r["agrupamiento"] for r in second] == ["Grupo 0"]
+        assert errors == []
+        assert cache.skipped == 2
+
+    def test_async_crawl_skips_cached_pages(self):
+        cache = NegativeCache()
+        cache.record(URLS[1], {"outcome": "ok", "links": 0})
+
+        async def afetch(url, client, stats):
+            return fetch(url, stats)
+
+        with patch("indec_catalog.catalog.afetch_tema_data", side_effect=afetch) as mock_fetch:
+            result, errors = asyncio.run(_afetch_pages(URLS, Mock(), show_progress=False, negative=cache))
+
+        assert [c.args[0] for c in mock_fetch.call_args_list] == [URLS[0], URLS[2]]
+        assert [r["agrupamiento"] for r in result] == ["Grupo 0"]
+        assert errors == [URLS[2]]
+        assert cache.skipped == 1
+
+    @patch("indec_catalog.catalog.iter_sitemap_urls", return_value=LINKS)
+    def test_cli_flag_rechecks_everything(self, mock_extract, tmp_path):
+        args = ["-o", str(tmp_path / "catalogo.json"), "--no-progress", "--cache-dir", str(tmp_path)]
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=fetch):
+            cli.main(args)
+        assert (tmp_path / NEGATIVE_CACHE_FILE).exists()
+
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=fetch) as mock_fetch:
+            cli.main(args)
+        assert mock_fetch.call_count == 1
+
+        with patch("indec_catalog.catalog.fetch_tema_data", side_effect=fetch) as mock_fetch:
+            cli.main(args + ["--sin-cache-negativo"])
+        assert mock_fetch.call_count == 3
@@ -0,0 +1,33 @@
+"""Tests para el módulo profiling."""
+
+import pstats
+from unittest.mock import Mock, patch
+
+from indec_catalog import cli
+from indec_catalog.config import BASE_URL
+
+PAGE = b"""<div class="ruta-texto mb-3">Inicio> Sociedad> Salud> Nutricion</div>
+<a href="/ftp/datos.csv">Datos</a>"""
+
+
+def fake_get(url, **kwargs):
+    return Mock(url=url, content=PAGE, raise_for_status=Mock())
+
+
+class TestProfileRun:
+    """Tests para profile_run."""
+
+    @patch("indec_catalog.scraper.requests.Session.get", side_effect=fake_get)
+    @patch("indec_catalog.catalog.iter_sitemap_urls", return_value=["Nivel4/Tema/1", "Nivel4/Tema/2"])
+    def test_profile_includes_crawl_threads(self, mock_sitemap, mock_get, tmp_path):
+        """El .pstats incluye la descarga y el parseo, que corren fuera del thread principal."""
+        pstats_path = tmp_path / "crawl.pstats"
+        cli.main([
+            "-o", str(tmp_path / "catalogo.json"), "--no-progress", "--cache-dir", str(tmp_path / "cache"),
+            "--profile", str(pstats_path),
+        ])
+
+        functions = {name for _, _, name in pstats.Stats(str(pstats_path)).stats}
+        assert "fetch_tema_data" in functions
+        assert "parse_tema_info" in functions
+        assert mock_get.call_args_list[0].args[0] == f"{BASE_URL}/Nivel4/Tema/1"
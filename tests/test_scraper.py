@@ -1,11 +1,17 @@
 """Tests para el módulo scraper."""
 
+import asyncio
 import pytest
 from unittest.mock import patch, Mock
 from bs4 import BeautifulSoup
 import requests
 
-from indec_catalog.scraper import fetch_tema_data
+from indec_catalog.scraper import (
+    afetch_tema_data,
+    fetch_tema_data,
+    fetch_tema_data_streaming,
+    parse_tema_page,
+)
 from indec_catalog.config import BASE_URL
 
 
@@ -83,3 +89,148 @@ class TestFetchTemaData:
             with pytest.raises(requests.RequestException):
                 fetch_tema_data(f"{BASE_URL}/Nivel4/Tema/123")
 
+
+
+class TestAfetchTemaData:
+    """Tests para afetch_tema_data."""
+
+    def test_afetch_matches_sync_parsing(self):
+        """La versión asíncrona produce el mismo resultado y detecta Error-Default."""
+        httpx = pytest.importorskip("httpx")
+        html = b"""
+        <div class="ruta-texto mb-3">Inicio> Tema> Subtema> Agrupamiento</div>
+        <a href="/datos.csv">Datos CSV</a>
+        """
+
+        def handler(request):
+            if request.url.path == "/Nivel4/Tema/0":
+                return httpx.Response(302, headers={"Location": f"{BASE_URL}/Error-Default"})
+            if request.url.path == "/Error-Default":
+                return httpx.Response(200, content=b"<html>Error</html>")
+            return httpx.Response(200, content=html)
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                ok = await afetch_tema_data(f"{BASE_URL}/Nivel4/Tema/123", client)
+                error = await afetch_tema_data(f"{BASE_URL}/Nivel4/Tema/0", client)
+                return ok, error
+
+        data, error = asyncio.run(run())
+
+        assert data == parse_tema_page(html)
+        assert data["archivos"][0]["url"] == f"{BASE_URL}/datos.csv"
+        assert error is None
+
+
+class TestFetchTemaDataStats:
+    """Tests para las métricas de fetch_tema_data."""
+
+    def test_records_timings_and_outcome(self):
+        """Registra tiempos, bytes, enlaces y resultado de la página."""
+        html = b"""
+        <div class="ruta-texto mb-3">Inicio> Tema> Subtema> Agrupamiento</div>
+        <a href="/datos.csv">Datos CSV</a>
+        <a href="/datos.xlsx">Datos XLSX</a>
+        """
+        mock_response = Mock()
+        mock_response.content = html
+        mock_response.url = f"{BASE_URL}/Nivel4/Tema/123"
+        mock_response.raise_for_status = Mock()
+        stats = {}
+
+        with patch("indec_catalog.scraper.requests.get", return_value=mock_response):
+            fetch_tema_data(f"{BASE_URL}/Nivel4/Tema/123", stats=stats)
+
+        assert stats["outcome"] == "ok"
+        assert stats["links"] == 2
+        assert stats["bytes"] == len(html)
+        assert all(stats[k] >= 0 for k in ("fetch_time", "parse_time", "extract_time"))
+
+    def test_records_error_outcomes(self):
+        """Distingue página de error y página sin ruta."""
+        mock_response = Mock()
+        mock_response.content = b"<html><body>Sin ruta</body></html>"
+        mock_response.raise_for_status = Mock()
+
+        mock_response.url = f"{BASE_URL}/Error-Default"
+        error_stats = {}
+        with patch("indec_catalog.scraper.requests.get", return_value=mock_response):
+            fetch_tema_data(f"{BASE_URL}/Nivel4/Tema/1", stats=error_stats)
+
+        mock_response.url = f"{BASE_URL}/Nivel4/Tema/1"
+        no_ruta_stats = {}
+        with patch("indec_catalog.scraper.requests.get", return_value=mock_response):
+            fetch_tema_data(f"{BASE_URL}/Nivel4/Tema/1", stats=no_ruta_stats)
+
+        assert error_stats["outcome"] == "error_default"
+        assert no_ruta_stats["outcome"] == "no_breadcrumb"
+
+
+class TestFetchTemaDataStreaming:
+    """Tests para fetch_tema_data_streaming."""
+
+    HTML = """<html><head><title>Tema</title></head><body>
+        <div class="ruta-texto mb-3"><a href="/">Inicio</a>> <a href="/t">Población</a> ><!-- x -->
+        <span>Censos</span> >Censo 2022</div>
+        <a href="/ftp/cuadros/c1.xlsx"><span>Cuadro</span> 1</a>
+        <a href="../../ftp/cuadros/c2.csv">Cuadro 2</a>
+        <a href="/Nivel4/Tema/2">Otra página</a>
+        <footer><a href="/ftp/pie.csv">Pie</a></footer>
+        <script>var x = 1;</script>
+        </body></html>""".encode("utf-8")
+
+    def _response(self, content, chunk_size, url=f"{BASE_URL}/Nivel4/Tema/1"):
+        chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+        consumed = []
+
+        def iter_content(size):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        response = Mock()
+        response.url = url
+        response.headers = {"Content-Type": "text/html"}
+        response.raise_for_status = Mock()
+        response.iter_content = iter_content
+        return response, chunks, consumed
+
+    def test_matches_full_parse_within_content(self):
+        """Extrae la misma ruta y enlaces que el parseo completo, sin el pie de página."""
+        response, _, _ = self._response(self.HTML, 16)
+        with patch("indec_catalog.scraper.requests.get", return_value=response):
+            result = fetch_tema_data_streaming(f"{BASE_URL}/Nivel4/Tema/1", chunk_size=16)
+
+        expected = parse_tema_page(self.HTML)
+        expected["archivos"] = [a for a in expected["archivos"] if not a["url"].endswith("pie.csv")]
+        assert result == expected
+        assert result["subtema"] == "Población"
+
+    def test_stops_reading_at_content_end(self):
+        """Deja de leer el cuerpo al abrirse el footer y cierra la respuesta."""
+        response, chunks, consumed = self._response(self.HTML, 16)
+        stats = {}
+        with patch("indec_catalog.scraper.requests.get", return_value=response):
+            fetch_tema_data_streaming(f"{BASE_URL}/Nivel4/Tema/1", stats=stats, chunk_size=16)
+
+        assert len(consumed) < len(chunks)
+        assert stats["bytes"] == sum(len(c) for c in consumed)
+        assert stats["outcome"] == "ok"
+        assert stats["links"] == 2
+        response.close.assert_called_once()
+
+    def test_error_outcomes(self):
+        """Distingue página de error y página sin ruta, como fetch_tema_data."""
+        response, _, consumed = self._response(self.HTML, 16, url=f"{BASE_URL}/Error-Default")
+        error_stats = {}
+        with patch("indec_catalog.scraper.requests.get", return_value=response):
+            assert fetch_tema_data_streaming(f"{BASE_URL}/Nivel4/Tema/1", stats=error_stats) is None
+        assert consumed == []
+
+        response, _, _ = self._response(b"<html><body>Sin ruta</body></html>", 8)
+        no_ruta_stats = {}
+        with patch("indec_catalog.scraper.requests.get", return_value=response):
+            assert fetch_tema_data_streaming(f"{BASE_URL}/Nivel4/Tema/1", stats=no_ruta_stats) is None
+
+        assert error_stats["outcome"] == "error_default"
+        assert no_ruta_stats["outcome"] == "no_breadcrumb"
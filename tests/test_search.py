@@ -0,0 +1,79 @@
+"""Tests para el módulo search."""
+
+import json
+
+from indec_catalog.models import Catalog
+from indec_catalog.search import SearchIndex, fold, load_or_build_index, trigrams, index_path_for
+from indec_catalog.config import BASE_URL
+
+CATALOG = [
+    Catalog(
+        tema="Sociedad",
+        subtema="Trabajo e ingresos",
+        agrupamiento="Encuesta Permanente de Hogares",
+        archivos=[
+            {"nombre_archivo": "Bases de microdatos. Tercer trimestre 2025", "url": f"{BASE_URL}/ftp/eph_3t25.zip"},
+            {"nombre_archivo": "Población ocupada", "url": f"{BASE_URL}/ftp/eph_ocupados.xls"},
+        ],
+    ),
+    Catalog(
+        tema="Población",
+        subtema="Censos",
+        agrupamiento="Censo 1970",
+        archivos=[{"nombre_archivo": "Total del país", "url": f"{BASE_URL}/ftp/c_70_totalpais.zip"}],
+    ),
+]
+
+
+class TestFold:
+    """Tests para fold y trigrams."""
+
+    def test_fold_accents_case_and_spaces(self):
+        """Quita acentos, pasa a minúsculas y colapsa espacios."""
+        assert fold("  Población   TOTAL ") == "poblacion total"
+
+    def test_trigrams_padded(self):
+        """Genera trigramas con relleno por palabra."""
+        assert trigrams("Año") == {"  a", " an", "ano", "no "}
+
+
+class TestSearchIndex:
+    """Tests para SearchIndex."""
+
+    def test_ranks_name_matches_first(self):
+        """Un término en el nombre del archivo rankea por encima de uno en la jerarquía."""
+        index = SearchIndex.build(CATALOG)
+        results = index.search("poblacion")
+
+        assert results[0][1]["nombre_archivo"] == "Población ocupada"
+        assert results[0][0] > results[1][0]
+        assert results[1][1]["tema"] == "Población"
+
+    def test_tolerates_typos(self):
+        """Encuentra resultados con errores de tipeo y sin acentos."""
+        index = SearchIndex.build(CATALOG)
+        results = index.search("tercer trimetre")
+
+        assert results[0][1]["url"] == f"{BASE_URL}/ftp/eph_3t25.zip"
+
+    def test_empty_and_unrelated_queries(self):
+        """Consultas vacías o sin coincidencias devuelven lista vacía."""
+        index = SearchIndex.build(CATALOG)
+        assert index.search("") == []
+        assert index.search("xyzqwv") == []
+
+    def test_persisted_next_to_catalog(self, tmp_path):
+        """El índice se guarda junto al catálogo y se reconstruye si el catálogo cambia."""
+        catalog_path = tmp_path / "catalogo.json"
+        catalog_path.write_text(json.dumps([c.model_dump() for c in CATALOG], ensure_ascii=False), encoding="utf-8")
+
+        first = load_or_build_index(catalog_path)
+        assert index_path_for(catalog_path).exists()
+        reloaded = load_or_build_index(catalog_path)
+        assert reloaded.fingerprint == first.fingerprint
+        assert reloaded.search("censo")[0][1]["nombre_archivo"] == "Total del país"
+
+        catalog_path.write_text(json.dumps([CATALOG[1].model_dump()], ensure_ascii=False), encoding="utf-8")
+        rebuilt = load_or_build_index(catalog_path)
+        assert rebuilt.fingerprint != first.fingerprint
+        assert len(rebuilt.docs) == 1
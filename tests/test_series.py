@@ -0,0 +1,177 @@
+"""Tests para el módulo series."""
+
+import pytest
+
+from indec_catalog import cli
+from indec_catalog.catalog import write_catalog
+from indec_catalog.models import Archivo, Catalog
+from indec_catalog.series import SeriesIndex, load_or_build_series, parse_period, period_label, series_path_for
+
+TRIMESTRES = ["Primer", "Segundo", "Tercer", "Cuarto"]
+
+
+def eph_catalog():
+    catalog = [
+        Catalog(
+            tema="Bases de datos",
+            subtema="Encuesta Permanente de Hogares (EPH)",
+            agrupamiento=f"Bases de microdatos | {TRIMESTRES[q]} trimestre {year}.",
+            archivos=[
+                Archivo(nombre_archivo="Formato txt", url=f"https://x/eph_{year}_{q + 1}.zip"),
+                Archivo(nombre_archivo="Formato xls", url=f"https://x/eph_{year}_{q + 1}.xls"),
+            ],
+        )
+        for year in (2025, 2024, 2023) for q in range(4) if (year, q) != (2025, 3)
+    ]
+    catalog.append(Catalog(
+        tema="Economía",
+        subtema="Precios",
+        agrupamiento="Índice de precios al consumidor",
+        archivos=[
+            Archivo(nombre_archivo="Serie marzo de 2025", url="https://x/ipc_2025_03.xls"),
+            Archivo(nombre_archivo="Serie febrero 2025", url="https://x/ipc_2025_02.xls"),
+            Archivo(nombre_archivo="Metodología", url="https://x/metodologia.pdf"),
+        ],
+    ))
+    return catalog
+
+
+class TestParsePeriod:
+    """Tests para parse_period."""
+
+    @pytest.mark.parametrize("text, label", [
+        ("Tercer trimestre 2025.", "2025-T3"),
+        ("3er trim. de 2025", "2025-T3"),
+        ("EPH_usu_3_Trim_2025_txt.zip", "2025-T3"),
+        ("2025-T4", "2025-T4"),
+        ("Segundo semestre de 2024", "2024-S2"),
+        ("Serie marzo de 2025", "2025-03"),
+        ("Base 2025-03", "2025-03"),
+        ("Encuesta Nacional de Gastos de los Hogares 2017 / 2018", "2017-2018"),
+        ("Censo 2010", "2010"),
+        ("Primer trimestre 2017 a primer trimestre de 2026", "2017-T1/2026-T1"),
+        ("Índices y variaciones, noviembre de 2015 a junio de 2026", "2015-11/2026-06"),
+        ("Hogares con NBI, para los años 1980 a 2022", "1980-2022"),
+        ("Segundo semestre de 2016 a segundo semestre de 2025", "2016-S2/2025-S2"),
+    ])
+    def test_recognizes_periods(self, text, label):
+        period, _ = parse_period(text)
+        assert period_label(period) == label
+
+    def test_no_period(self):
+        assert parse_period("Cuadro 1.2") is None
+        assert parse_period("Metodología") is None
+
+    @pytest.mark.parametrize("text", [
+        "Formato txt (actualizado al 23 de mayo de 2022)",
+        "Formato txt (actualizado al 23/05/2022)",
+        "Formato xls (fecha de actualización 17/05/2021)",
+        "Descargar capa SIG de radios censales. Actualización: 22/10/2025",
+    ])
+    def test_update_stamps_are_not_periods(self, text):
+        assert parse_period(text) is None
+
+
+class TestSeriesIndex:
+    """Tests para SeriesIndex."""
+
+    def test_groups_releases_by_series(self):
+        index = SeriesIndex.build(eph_catalog())
+
+        labels = sorted(s.label for s in index.series)
+        assert labels == [
+            "Bases de datos > Encuesta Permanente de Hogares (EPH) > Bases de microdatos > Formato txt",
+            "Bases de datos > Encuesta Permanente de Hogares (EPH) > Bases de microdatos > Formato xls",
+            "Economía > Precios > Índice de precios al consumidor > Serie",
+        ]
+        (txt,) = index.find("eph TXT")
+        assert [r.period for r in txt.releases][:3] == ["2023-T1", "2023-T2", "2023-T3"]
+        assert index.latest(txt.key).period == "2025-T3"
+        assert index.latest(txt.key).archivos[0].url == "https://x/eph_2025_3.zip"
+
+        (ipc,) = index.find("precios consumidor")
+        assert [r.period for r in ipc.releases] == ["2025-02", "2025-03"]
+
+    def test_update_stamps_keep_releases_in_their_series(self):
+        base = "Base individual y hogar. Total aglomerados EPH y por aglomerado."
+        catalog = [
+            Catalog(
+                tema="Bases de datos",
+                subtema="Encuesta Permanente de Hogares (EPH)",
+                agrupamiento=f"{base}{trimestre}",
+                archivos=[Archivo(nombre_archivo=nombre, url=f"https://x/{i}.zip")],
+            )
+            for i, (trimestre, nombre) in enumerate([
+                ("Tercer trimestre 2020.", "Formato txt"),
+                ("Cuarto trimestre 2020.", "Formato txt (fecha de actualización 17/05/2021)"),
+                ("Primer trimestre 2021.", "Formato txt"),
+                ("Cuarto trimestre 2021.", "Formato txt (actualizado al 23 de mayo de 2022)"),
+                ("Primer trimestre 2022.", "Formato txt"),
+            ])
+        ]
+
+        (txt,) = SeriesIndex.build(catalog).series
+        assert txt.nombre == "Formato txt"
+        assert [r.period for r in txt.releases] == ["2020-T3", "2020-T4", "2021-T1", "2021-T4", "2022-T1"]
+        index = SeriesIndex.build(catalog)
+        assert [r.period for r in index.between(txt.key, "2021", "2021")] == ["2021-T1", "2021-T4"]
+
+    def test_hierarchy_period_wins_over_other_dates_in_name(self):
+        catalog = [
+            Catalog(
+                tema="Sociedad",
+                subtema="Trabajo e ingresos",
+                agrupamiento=f"Mercado de trabajo {year}",
+                archivos=[
+                    Archivo(nombre_archivo=f"Informe publicado en marzo de {year + 1}", url=f"https://x/{year}.pdf"),
+                    Archivo(nombre_archivo=f"Serie enero de {year}", url=f"https://x/{year}_01.xls"),
+                ],
+            )
+            for year in (2023, 2024)
+        ]
+
+        index = SeriesIndex.build(catalog)
+        (informe,) = index.find("informe publicado")
+        assert [r.period for r in informe.releases] == ["2023", "2024"]
+        (serie,) = index.find("serie")  # Un mes dentro del año del agrupamiento
+        assert [r.period for r in serie.releases] == ["2023-01", "2024-01"]
+
+    def test_between_is_inclusive(self):
+        index = SeriesIndex.build(eph_catalog())
+        key = index.find("eph txt")[0].key
+
+        assert [r.period for r in index.between(key, "2024", "primer semestre 2025")] == [
+            "2024-T1", "2024-T2", "2024-T3", "2024-T4", "2025-T1", "2025-T2",
+        ]
+        assert [r.period for r in index.between(key, "T4 2023", "2024-01")] == ["2023-T4", "2024-T1"]
+        assert index.between(key, "2030", "2031") == []
+        with pytest.raises(ValueError):
+            index.between(key, "pronto", "2025")
+        with pytest.raises(KeyError):
+            index.latest("no existe")
+
+    def test_persisted_index_is_reused_until_catalog_changes(self, tmp_path):
+        catalog_path = tmp_path / "catalogo.json"
+        write_catalog(catalog_path, eph_catalog())
+
+        first = load_or_build_series(catalog_path)
+        assert series_path_for(catalog_path).exists()
+        again = load_or_build_series(catalog_path)
+        assert [s.model_dump() for s in again.series] == [s.model_dump() for s in first.series]
+
+        write_catalog(catalog_path, eph_catalog()[:2])
+        assert len(load_or_build_series(catalog_path).find("eph txt")[0].releases) == 2
+
+    def test_cli_latest(self, tmp_path, capsys):
+        catalog_path = tmp_path / "catalogo.json"
+        write_catalog(catalog_path, eph_catalog())
+
+        cli.main(["series", "eph txt", "--catalog", str(catalog_path), "--ultima"])
+        out = capsys.readouterr().out
+        assert "11 publicaciones, última: 2025-T3" in out
+        assert "2025-T3  https://x/eph_2025_3.zip" in out
+
+    def test_cli_missing_catalog(self, tmp_path, capsys):
+        with pytest.raises(SystemExit):
+            cli.main(["series", "eph", "--catalog", str(tmp_path / "no_existe.json")])
+        assert "no existe el catálogo" in capsys.readouterr().err
@@ -0,0 +1,159 @@
+"""Tests para el módulo server."""
+
+import gzip
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from indec_catalog import cli
+from indec_catalog import server as server_module
+from indec_catalog.server import make_server
+
+CATALOG = [
+    {
+        "tema": "Sociedad",
+        "subtema": "Trabajo e ingresos",
+        "agrupamiento": "Encuesta Permanente de Hogares",
+        "archivos": [
+            {"nombre_archivo": "Población ocupada", "url": "https://www.indec.gob.ar/ftp/eph_ocupados.xls"},
+            {"nombre_archivo": "Microdatos", "url": "https://www.indec.gob.ar/ftp/eph_usu.zip"},
+        ],
+    },
+    {
+        "tema": "Población",
+        "subtema": "Censos",
+        "agrupamiento": "Censo 1970",
+        "archivos": [
+            {"nombre_archivo": "Total del país", "url": "https://www.indec.gob.ar/ftp/c_70_totalpais.zip"},
+        ],
+    },
+]
+
+
+@pytest.fixture
+def catalog_server(tmp_path):
+    path = tmp_path / "catalogo.json"
+    path.write_text(json.dumps(CATALOG, ensure_ascii=False, indent=2), encoding="utf-8")
+    server = make_server(path, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, path
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, path, headers=None):
+    request = urllib.request.Request(f"http://127.0.0.1:{server.server_port}{path}", headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+class TestCatalogServer:
+    """Tests para el servidor HTTP del catálogo."""
+
+    def test_full_catalog_gzip_and_etag(self, catalog_server):
+        """Sirve el catálogo completo comprimido y responde 304 con el mismo ETag."""
+        server, path = catalog_server
+        status, headers, body = _get(server, "/catalogo", {"Accept-Encoding": "gzip"})
+
+        assert status == 200
+        assert headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(body) == path.read_bytes()
+
+        status, not_modified, body = _get(
+            server, "/catalogo", {"Accept-Encoding": "gzip", "If-None-Match": headers["ETag"]},
+        )
+        assert status == 304
+        assert not_modified["ETag"] == headers["ETag"]
+        assert body == b""
+
+    def test_etag_differs_per_encoding(self, catalog_server):
+        """Cada codificación tiene su ETag: un ETag de gzip no valida la variante sin comprimir."""
+        server, path = catalog_server
+        _, gzipped, _ = _get(server, "/catalogo", {"Accept-Encoding": "gzip"})
+        _, identity, _ = _get(server, "/catalogo")
+        assert gzipped["ETag"] != identity["ETag"]
+
+        status, _, body = _get(server, "/catalogo", {"If-None-Match": gzipped["ETag"]})
+        assert status == 200
+        assert body == path.read_bytes()
+
+    @pytest.mark.parametrize("accept_encoding", ["gzip;q=0.0", "gzip; q=0", "gzip;q=0.000, br;Q=0", "gzip;q=x"])
+    def test_rejected_encodings_are_not_used(self, catalog_server, accept_encoding):
+        """Respeta q=0 en cualquiera de sus formas y trata un q inválido como rechazo."""
+        server, path = catalog_server
+        status, headers, body = _get(server, "/catalogo", {"Accept-Encoding": accept_encoding})
+
+        assert status == 200
+        assert "Content-Encoding" not in headers
+        assert body == path.read_bytes()
+
+    def test_weighted_encoding_is_accepted(self, catalog_server):
+        server, _ = catalog_server
+        _, headers, _ = _get(server, "/catalogo", {"Accept-Encoding": "identity;q=1, gzip;q=0.5"})
+        assert headers["Content-Encoding"] == "gzip"
+
+    def test_brotli_when_available(self, catalog_server):
+        """Prefiere brotli si el cliente lo acepta y está instalado."""
+        brotli = pytest.importorskip("brotli")
+        server, path = catalog_server
+        status, headers, body = _get(server, "/catalogo", {"Accept-Encoding": "gzip, br"})
+
+        assert headers["Content-Encoding"] == "br"
+        assert brotli.decompress(body) == path.read_bytes()
+
+    def test_filters_are_accent_and_case_insensitive(self, catalog_server):
+        """Filtra por tema, extensión y texto ignorando acentos y mayúsculas."""
+        server, _ = catalog_server
+        _, _, body = _get(server, "/archivos?tema=sociedad&extension=xls")
+        data = json.loads(body)
+        assert data["total"] == 1
+        assert data["resultados"][0]["nombre_archivo"] == "Población ocupada"
+
+        _, _, body = _get(server, "/archivos?q=POBLACION")
+        data = json.loads(body)
+        assert {r["nombre_archivo"] for r in data["resultados"]} == {"Población ocupada", "Total del país"}
+
+    def test_pagination(self, catalog_server):
+        """Pagina los resultados con page y per_page."""
+        server, _ = catalog_server
+        _, _, body = _get(server, "/archivos?per_page=2&page=2")
+        data = json.loads(body)
+        assert data["total"] == 3
+        assert [r["nombre_archivo"] for r in data["resultados"]] == ["Total del país"]
+
+        status, _, _ = _get(server, "/archivos?page=0")
+        assert status == 400
+
+    def test_hot_reload(self, catalog_server, monkeypatch):
+        """Recarga el índice cuando cambia el archivo del catálogo."""
+        server, path = catalog_server
+        monkeypatch.setattr(server_module, "RELOAD_CHECK_INTERVAL", 0)
+        path.write_text(json.dumps(CATALOG[:1], ensure_ascii=False), encoding="utf-8")
+        os.utime(path, ns=(0, 1))
+
+        _, _, body = _get(server, "/archivos")
+        assert json.loads(body)["total"] == 2
+
+    def test_unknown_path(self, catalog_server):
+        """Responde 404 para rutas desconocidas."""
+        server, _ = catalog_server
+        status, _, _ = _get(server, "/otra")
+        assert status == 404
+
+
+class TestServeCommand:
+    """Tests para el subcomando serve."""
+
+    def test_missing_catalog(self, tmp_path, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main(["serve", "--catalog", str(tmp_path / "no_existe.json"), "--port", "0"])
+        assert exc_info.value.code == 1
+        assert "no existe el catálogo" in capsys.readouterr().err
@@ -0,0 +1,103 @@
+"""Tests para el módulo shard."""
+
+import pytest
+from unittest.mock import patch
+
+from indec_catalog import cli
+from indec_catalog.config import BASE_URL
+from indec_catalog.models import Archivo, Catalog
+from indec_catalog.shard import merge_shards, parse_shard, shard_of
+
+LINKS = [f"Nivel4/Tema/1/{i}/{i * 7}" for i in range(20)]
+BASES_DATOS = [
+    Catalog(
+        tema="Bases de datos",
+        subtema="EPH",
+        agrupamiento="Microdatos",
+        archivos=[Archivo(nombre_archivo="EPH 2024", url=f"{BASE_URL}/ftp/eph.zip")],
+    )
+]
+
+
+def fake_fetch(url, stats, session=None):
+    """Página sintética: una de cada cinco falla y una de cada siete no tiene archivos."""
+    n = int(url.rsplit("/", 2)[-2])
+    if n % 5 == 3:
+        stats["outcome"] = "no_breadcrumb"
+        return None
+    stats["outcome"] = "ok"
+    archivos = [] if n % 7 == 6 else [{"nombre_archivo": f"Cuadro {n}", "url": f"{BASE_URL}/c{n}.xls"}]
+    return {"tema": "Economía", "subtema": f"Sub {n % 3}", "agrupamiento": f"Grupo {n}", "archivos": archivos}
+
+
+class TestShard:
+    """Tests para la partición y el merge de shards."""
+
+    def test_parse_shard_and_stable_partition(self):
+        """La especificación i/N se valida y la partición cubre todo sin solaparse."""
+        assert parse_shard("2/4") == (2, 4)
+        for value in ("4/4", "x/2", "1"):
+            with pytest.raises(ValueError):
+                parse_shard(value)
+
+        assignments = [shard_of(link, 3) for link in LINKS]
+        assert assignments == [shard_of(link, 3) for link in LINKS]
+        assert set(assignments) == {0, 1, 2}
+
+    @patch("indec_catalog.catalog.fetch_tema_data", side_effect=fake_fetch)
+    @patch("indec_catalog.shard.scrape_bases_datos", return_value=BASES_DATOS)
+    @patch("indec_catalog.sources.generate_catalog_bases_datos", return_value=BASES_DATOS)
+    @patch("indec_catalog.shard.extract_sitemap_urls", return_value=LINKS)
+    @patch("indec_catalog.catalog.iter_sitemap_urls", return_value=LINKS)
+    def test_merge_is_byte_identical_to_single_run(
+        self, mock_extract, mock_shard_extract, mock_bases, mock_shard_bases, mock_fetch, tmp_path
+    ):
+        """Los shards combinados producen el mismo archivo que una corrida completa."""
+        common = ["--no-progress", "--incluir-bases-datos", "--cache-dir", str(tmp_path / "cache")]
+        single = tmp_path / "single.json"
+        cli.main(["-o", str(single), *common])
+
+        partials = [str(tmp_path / f"shard-{i}.json") for i in range(3)]
+        for i, path in enumerate(partials):
+            cli.main(["-o", path, "--shard", f"{i}/3", *common])
+        merged = tmp_path / "merged.json"
+        # Un shard repetido no duplica registros
+        cli.main(["merge", *partials, partials[0], "-o", str(merged)])
+
+        assert merged.read_bytes() == single.read_bytes()
+
+    @patch("indec_catalog.catalog.fetch_tema_data", side_effect=fake_fetch)
+    @patch("indec_catalog.shard.extract_sitemap_urls", return_value=LINKS)
+    def test_merge_requires_all_shards(self, mock_extract, mock_fetch, tmp_path):
+        """Falla si falta un shard o si los parciales son de sitemaps distintos."""
+        paths = []
+        for i in range(2):
+            paths.append(tmp_path / f"shard-{i}.json")
+            cli.main(["-o", str(paths[-1]), "--shard", f"{i}/2", "--no-progress", "--cache-dir", str(tmp_path)])
+
+        with pytest.raises(ValueError, match="Faltan shards: 1"):
+            merge_shards(paths[:1])
+
+        mock_extract.return_value = LINKS[:-1]
+        cli.main(["-o", str(paths[1]), "--shard", "1/2", "--no-progress", "--cache-dir", str(tmp_path)])
+        with pytest.raises(ValueError, match="sitemap"):
+            merge_shards(paths)
+
+    @patch("indec_catalog.catalog.fetch_tema_data", side_effect=fake_fetch)
+    @patch("indec_catalog.shard.extract_sitemap_urls", return_value=LINKS)
+    def test_shard_uses_negative_cache(self, mock_extract, mock_fetch, tmp_path):
+        """Los shards consultan y actualizan la caché negativa como una corrida completa."""
+        args = ["-o", str(tmp_path / "shard-0.json"), "--shard", "0/1", "--no-progress", "--cache-dir", str(tmp_path)]
+        cli.main(args)
+        first = mock_fetch.call_count
+
+        mock_fetch.reset_mock()
+        cli.main(args)
+        # Las páginas sin breadcrumb no se vuelven a descargar
+        assert mock_fetch.call_count == first - sum(1 for i in range(20) if i % 5 == 3)
+
+    def test_shard_rejects_other_sources(self, tmp_path, capsys):
+        """--shard solo reparte MapaSitio y Bases de datos: el descubrimiento se rechaza."""
+        with pytest.raises(SystemExit):
+            cli.main(["-o", str(tmp_path / "s.json"), "--shard", "0/2", "--fuentes", "mapa_sitio,descubrimiento"])
+        assert "--shard solo admite" in capsys.readouterr().err
@@ -1,10 +1,25 @@
 """Tests para el módulo sitemap."""
 
+import io
 import pytest
+from datetime import datetime, timezone
 from unittest.mock import patch, Mock
 import requests
 
-from indec_catalog.sitemap import extract_sitemap_urls, build_url
+from indec_catalog import cli
+from indec_catalog.catalog import read_catalog, write_catalog
+from indec_catalog.models import Catalog
+from indec_catalog.sitemap import (
+    SitemapFilter,
+    extract_sitemap_urls,
+    extract_sitemap_lastmod,
+    build_url,
+    iter_sitemap_urls,
+    loc_to_data_view,
+    parse_lastmod,
+    parse_sitemap_html,
+    parse_sitemap_tree,
+)
 from indec_catalog.config import BASE_URL
 
 
@@ -86,6 +101,133 @@ class TestExtractSitemapUrls:
                 extract_sitemap_urls()
 
 
+MAPA_SITIO = """
+<html>
+    <body>
+        <h2>Mapa del sitio</h2>
+        <ul>
+            <li><span>Economía</span>
+                <ul>
+                    <li>Precios
+                        <ul><li data-view="Nivel4/Tema/3/5/31">Índice de precios al consumidor</li></ul>
+                    </li>
+                </ul>
+            </li>
+            <li><span>Sociedad</span>
+                <ul>
+                    <li>Trabajo e ingresos
+                        <ul>
+                            <li data-view="Nivel4/Tema/4/31/58">Mercado de trabajo</li>
+                            <li data-view="Nivel4/Tema/4/31/59">Salarios</li>
+                        </ul>
+                    </li>
+                    <li>Salud
+                        <ul><li data-view="Nivel4/Tema/4/32/70">Encuestas de salud</li></ul>
+                    </li>
+                </ul>
+            </li>
+        </ul>
+    </body>
+</html>
+"""
+
+
+class TestSitemapTree:
+    """Tests para parse_sitemap_tree, SitemapFilter y el crawl parcial."""
+
+    def test_captures_ancestor_labels(self):
+        entries = parse_sitemap_tree(MAPA_SITIO.encode("utf-8"))
+
+        assert entries[0] == ("Nivel4/Tema/3/5/31", ["Mapa del sitio", "Economía", "Precios",
+                                                     "Índice de precios al consumidor"])
+        assert [path[2:4] for _, path in entries[1:]] == [
+            ["Trabajo e ingresos", "Mercado de trabajo"],
+            ["Trabajo e ingresos", "Salarios"],
+            ["Salud", "Encuestas de salud"],
+        ]
+
+    def test_filter_by_tema_subtema_and_regex(self):
+        entries = parse_sitemap_tree(MAPA_SITIO.encode("utf-8"))
+        paths = [path for _, path in entries]
+
+        def select(**kwargs):
+            sitemap_filter = SitemapFilter(**kwargs)
+            return [p[-1] for p in paths if sitemap_filter.matches(p)]
+
+        assert select(tema="sociedad", subtema="TRABAJO E INGRESOS") == ["Mercado de trabajo", "Salarios"]
+        assert select(tema="Economia") == ["Índice de precios al consumidor"]
+        assert select(path_regex=r"salud$") == ["Encuestas de salud"]
+        assert select(path_regex=r"^Sociedad") == []  # La ruta empieza en el título del MapaSitio
+        assert select(tema="Sociedad", path_regex="salario") == ["Salarios"]
+        assert select(subtema="Precios") == ["Índice de precios al consumidor"]
+
+    def test_cli_partial_crawl_merges_into_existing_catalog(self, tmp_path):
+        content = MAPA_SITIO.encode("utf-8")
+        output = tmp_path / "catalogo.json"
+        archivo = {"nombre_archivo": "Cuadro", "url": f"{BASE_URL}/viejo.xls"}
+        write_catalog(output, [
+            Catalog(tema="Economía", subtema="Precios", agrupamiento="IPC", archivos=[archivo]),
+            Catalog(tema="Sociedad", subtema="Trabajo e ingresos", agrupamiento="Salarios", archivos=[archivo]),
+        ])
+
+        def fetch(url, stats, session=None):
+            stats["outcome"] = "ok"
+            agrupamiento = {"58": "Mercado de trabajo", "59": "Salarios"}[url.rsplit("/", 1)[-1]]
+            return {
+                "tema": "Sociedad",
+                "subtema": "Trabajo e ingresos",
+                "agrupamiento": agrupamiento,
+                "archivos": [{"nombre_archivo": "Cuadro", "url": f"{url}.xls"}],
+            }
+
+        response = Mock(content=content, raise_for_status=Mock())
+        with patch("indec_catalog.sitemap.requests.Session.get", return_value=response), \
+                patch("indec_catalog.catalog.fetch_tema_data", side_effect=fetch) as mock_fetch:
+            cli.main([
+                "-o", str(output), "--no-progress", "--cache-dir", str(tmp_path / "cache"),
+                "--tema", "Sociedad", "--subtema", "Trabajo e ingresos",
+            ])
+
+        assert [c.args[0] for c in mock_fetch.call_args_list] == [
+            f"{BASE_URL}/Nivel4/Tema/4/31/58",
+            f"{BASE_URL}/Nivel4/Tema/4/31/59",
+        ]
+        catalog = read_catalog(output)
+        assert [c.agrupamiento for c in catalog] == ["IPC", "Salarios", "Mercado de trabajo"]
+        assert catalog[0].archivos[0].url == f"{BASE_URL}/viejo.xls"
+        assert catalog[1].archivos[0].url == f"{BASE_URL}/Nivel4/Tema/4/31/59.xls"
+
+    def test_cli_rejects_invalid_regex(self, capsys):
+        with pytest.raises(SystemExit):
+            cli.main(["--path-regex", "("])
+        assert "--path-regex inválida" in capsys.readouterr().err
+
+
+class TestIterSitemapUrls:
+    """Tests para iter_sitemap_urls."""
+
+    def test_yields_data_views_while_downloading(self):
+        content = MAPA_SITIO.encode("utf-8")
+        chunks = [content[i:i + 40] for i in range(0, len(content), 40)]
+        read = []
+
+        def iter_content(chunk_size):
+            for chunk in chunks:
+                read.append(chunk)
+                yield chunk
+
+        response = Mock(headers={"Content-Type": "text/html; charset=utf-8"}, iter_content=iter_content)
+        with patch("indec_catalog.sitemap.requests.get", return_value=response) as mock_get:
+            urls = iter_sitemap_urls()
+            assert next(urls) == "Nivel4/Tema/3/5/31"
+            assert len(read) < len(chunks)  # El resto del sitemap todavía no se leyó
+            rest = list(urls)
+
+        assert ["Nivel4/Tema/3/5/31", *rest] == parse_sitemap_html(content)
+        assert mock_get.call_args.kwargs["stream"] is True
+        response.close.assert_called_once()
+
+
 class TestBuildUrl:
     """Tests para build_url."""
     
@@ -105,3 +247,67 @@ class TestBuildUrl:
         result = build_url(data_view, BASE_URL)
         assert result == expected
 
+
+
+class TestSitemapXml:
+    """Tests para la lectura de sitemap.xml con <lastmod>."""
+
+    XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+    <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+        <url>
+            <loc>https://www.indec.gob.ar/Nivel4-Tema-2-41-170</loc>
+            <lastmod>2025-03-14</lastmod>
+        </url>
+        <url>
+            <loc>https://www.indec.gob.ar/Nivel4-Tema-4-31-58</loc>
+            <lastmod>2025-06-01T10:30:00Z</lastmod>
+        </url>
+        <url>
+            <loc>https://www.indec.gob.ar/Nivel4-Tema-1-2-3</loc>
+        </url>
+        <url>
+            <loc>https://www.indec.gob.ar/Institucional-Indec-MapaSitio</loc>
+            <lastmod>2025-01-01</lastmod>
+        </url>
+    </urlset>
+    """
+
+    def test_extract_lastmod_by_data_view(self):
+        """Devuelve data-view -> lastmod en orden, filtrando por patrón."""
+        mock_response = Mock()
+        mock_response.raw = io.BytesIO(self.XML)
+        mock_response.raise_for_status = Mock()
+
+        with patch("indec_catalog.sitemap.requests.get", return_value=mock_response):
+            lastmods = extract_sitemap_lastmod(regex_pattern="Nivel4")
+
+        assert list(lastmods) == [
+            "Nivel4/Tema/2/41/170",
+            "Nivel4/Tema/4/31/58",
+            "Nivel4/Tema/1/2/3",
+        ]
+        assert lastmods["Nivel4/Tema/2/41/170"] == datetime(2025, 3, 14, tzinfo=timezone.utc)
+        assert lastmods["Nivel4/Tema/4/31/58"] == datetime(2025, 6, 1, 10, 30, tzinfo=timezone.utc)
+        assert lastmods["Nivel4/Tema/1/2/3"] is None
+        mock_response.close.assert_called_once()
+
+    def test_http_error_closes_response(self):
+        """Un error HTTP cierra la respuesta en streaming antes de propagarse."""
+        mock_response = Mock()
+        mock_response.raise_for_status = Mock(side_effect=requests.HTTPError("503"))
+
+        with patch("indec_catalog.sitemap.requests.get", return_value=mock_response):
+            with pytest.raises(requests.HTTPError):
+                extract_sitemap_lastmod()
+
+        mock_response.close.assert_called_once()
+
+    def test_loc_to_data_view(self):
+        """Convierte el formato con guiones de sitemap.xml al de data-view."""
+        assert loc_to_data_view(f"{BASE_URL}/Nivel4-Tema-2-41-170") == "Nivel4/Tema/2/41/170"
+        assert loc_to_data_view(f"{BASE_URL}/Nivel4/Tema/2/41/170") == "Nivel4/Tema/2/41/170"
+
+    def test_parse_lastmod_invalid(self):
+        """Fechas vacías o inválidas se interpretan como desconocidas."""
+        assert parse_lastmod(None) is None
+        assert parse_lastmod("ayer") is None
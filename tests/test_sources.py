@@ -0,0 +1,144 @@
+"""Tests para el módulo sources."""
+
+import asyncio
+import threading
+
+import pytest
+import requests
+from unittest.mock import patch
+
+from indec_catalog.config import BASES_DATOS_URL
+from indec_catalog.models import Archivo, Catalog
+from indec_catalog.sources import (
+    SOURCES,
+    BasesDatosSource,
+    Source,
+    SourceContext,
+    SourceResult,
+    arun_sources,
+    combine_results,
+    run_sources,
+    select_sources,
+)
+
+
+def _record(tema: str) -> Catalog:
+    return Catalog(
+        tema=tema,
+        subtema="S",
+        agrupamiento="A",
+        archivos=[Archivo(nombre_archivo="a.csv", url=f"https://x/{tema}.csv")],
+    )
+
+
+class FakeSource(Source):
+    """Fuente que espera a las demás en una barrera: solo termina si corren a la vez."""
+
+    def __init__(self, name: str, barrier=None, fail: bool = False):
+        self.name = name
+        self.barrier = barrier
+        self.fail = fail
+
+    def crawl(self, context: SourceContext) -> SourceResult:
+        self.barrier.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError(self.name)
+        url = f"https://x/{self.name}"
+        context.on_page(url, {"tema": self.name})
+        context.on_stats(url, {"outcome": "ok"})
+        return SourceResult(name=self.name, records=[_record(self.name)], errors=[url + "/err"])
+
+    async def acrawl(self, client, context: SourceContext) -> SourceResult:
+        await asyncio.sleep(0)
+        return SourceResult(name=self.name, records=[_record(self.name)], errors=[str(id(client))])
+
+
+class TestSelectSources:
+    """Tests para select_sources."""
+
+    def test_defaults_registry_order_and_exclusions(self):
+        assert list(SOURCES) == ["mapa_sitio", "bases_datos", "descubrimiento"]
+        assert [s.name for s in select_sources()] == ["mapa_sitio"]
+        assert [s.name for s in select_sources(["bases_datos", "mapa_sitio"])] == ["mapa_sitio", "bases_datos"]
+        assert [s.name for s in select_sources(["mapa_sitio", "bases_datos"], exclude=["mapa_sitio"])] == [
+            "bases_datos"
+        ]
+
+    def test_source_must_implement_both_crawls(self):
+        class SyncOnly(Source):
+            name = "solo_sync"
+
+            def crawl(self, context: SourceContext) -> SourceResult:
+                return SourceResult(name=self.name, records=[])
+
+        with pytest.raises(TypeError, match="acrawl"):
+            SyncOnly()
+
+    def test_unknown_source_raises(self):
+        with pytest.raises(ValueError, match="desconocida: otra"):
+            select_sources(["mapa_sitio", "otra"])
+
+
+class TestRunSources:
+    """Tests para run_sources y arun_sources."""
+
+    def test_runs_concurrently_with_callbacks_in_caller_thread(self):
+        barrier = threading.Barrier(2)
+        sources = [FakeSource("b", barrier), FakeSource("a", barrier)]
+        calls = []
+
+        def on_page(url, record):
+            calls.append(("page", url, threading.current_thread() is threading.main_thread()))
+
+        def on_source(result):
+            calls.append(("source", result.name, threading.current_thread() is threading.main_thread()))
+
+        context = SourceContext(on_page=on_page, on_stats=lambda url, stats: None)
+        results = run_sources(sources, context, on_source)
+
+        catalog, errors = combine_results(results)
+        assert [r.tema for r in catalog] == ["b", "a"]
+        assert errors == ["https://x/b/err", "https://x/a/err"]
+        assert len(calls) == 4
+        assert all(in_main for _, _, in_main in calls)
+
+    def test_sources_share_one_session(self):
+        barrier = threading.Barrier(2)
+        sources = [FakeSource("b", barrier), FakeSource("a", barrier)]
+        sessions = []
+        for source in sources:
+            crawl = source.crawl
+            source.crawl = lambda context, crawl=crawl: sessions.append(context.session) or crawl(context)
+
+        run_sources(sources, SourceContext(on_page=lambda *a: None, on_stats=lambda *a: None))
+
+        assert len(sessions) == 2 and sessions[0] is sessions[1]
+        assert isinstance(sessions[0], requests.Session)
+
+    def test_reraises_source_exception(self):
+        barrier = threading.Barrier(2)
+        sources = [FakeSource("ok", barrier), FakeSource("mal", barrier, fail=True)]
+
+        with pytest.raises(RuntimeError, match="mal"):
+            run_sources(sources, SourceContext(on_page=lambda *a: None, on_stats=lambda *a: None))
+
+    def test_async_sources_share_client(self):
+        client = object()
+        results = asyncio.run(arun_sources([FakeSource("a"), FakeSource("b")], client, SourceContext()))
+
+        assert [r.name for r in results] == ["a", "b"]
+        assert {r.errors[0] for r in results} == {str(id(client))}
+
+
+class TestBasesDatosSource:
+    """Tests para BasesDatosSource."""
+
+    @patch("indec_catalog.sources.generate_catalog_bases_datos")
+    def test_reuses_journaled_result(self, mock_scrape):
+        done = {BASES_DATOS_URL: [_record("Bases de datos").model_dump()]}
+
+        result = BasesDatosSource().crawl(SourceContext(done=done))
+
+        mock_scrape.assert_not_called()
+        assert result.url == BASES_DATOS_URL
+        assert result.records[0].tema == "Bases de datos"
@@ -0,0 +1,140 @@
+"""Tests para el módulo sqlite_store."""
+
+import sqlite3
+
+from indec_catalog.models import Catalog
+from indec_catalog.sqlite_store import CatalogStore, canonical_url
+from indec_catalog.config import BASE_URL
+
+
+def _catalog():
+    return [
+        Catalog(
+            tema="Sociedad",
+            subtema="Trabajo e ingresos",
+            agrupamiento="Encuesta Permanente de Hogares",
+            archivos=[
+                {"nombre_archivo": "Población ocupada", "url": f"{BASE_URL}/ftp/eph_ocupados.xls"},
+                {"nombre_archivo": "Microdatos", "url": f"{BASE_URL}/ftp/eph_usu.zip"},
+            ],
+        ),
+        Catalog(
+            tema="Población",
+            subtema="Censos",
+            agrupamiento="Censo 1970",
+            archivos=[{"nombre_archivo": "Total del país", "url": f"{BASE_URL}/ftp/c_70_totalpais.zip"}],
+        ),
+    ]
+
+
+class TestCatalogStore:
+    """Tests para CatalogStore."""
+
+    def test_sync_round_trip(self, tmp_path):
+        """El catálogo sincronizado se reconstruye igual y en orden."""
+        catalog = _catalog()
+        with CatalogStore(tmp_path / "catalogo.db") as store:
+            store.sync(catalog)
+            assert [c.model_dump() for c in store.catalog()] == [c.model_dump() for c in catalog]
+
+    def test_keeps_original_urls(self, tmp_path):
+        """Las URLs se guardan tal como figuran; la forma canónica solo deduplica la tabla files."""
+        catalog = _catalog()
+        catalog[0].archivos[1].url = "HTTPS://WWW.INDEC.gob.ar:443/ftp//eph_ocupados.xls#x"
+        with CatalogStore(tmp_path / "catalogo.db") as store:
+            store.sync(catalog)
+            assert [c.model_dump() for c in store.catalog()] == [c.model_dump() for c in catalog]
+            assert store.search("microdatos")[0]["url"] == catalog[0].archivos[1].url
+            assert store.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 2
+
+    def test_migrates_canonical_only_schema(self, tmp_path):
+        """Una base del esquema anterior (solo URL canónica) se adapta conservando sus filas."""
+        path = tmp_path / "catalogo.db"
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            """
+            CREATE TABLE groups (id INTEGER PRIMARY KEY, tema TEXT NOT NULL, subtema TEXT NOT NULL,
+                agrupamiento TEXT NOT NULL, page_url TEXT, position INTEGER NOT NULL,
+                UNIQUE (tema, subtema, agrupamiento));
+            CREATE TABLE files (url TEXT PRIMARY KEY);
+            CREATE TABLE group_files (group_id INTEGER NOT NULL REFERENCES groups(id),
+                position INTEGER NOT NULL, url TEXT NOT NULL REFERENCES files(url),
+                nombre_archivo TEXT NOT NULL, PRIMARY KEY (group_id, position));
+            CREATE INDEX group_files_url ON group_files(url);
+            INSERT INTO groups VALUES (1, 'Población', 'Censos', 'Censo 1970', NULL, 0);
+            """
+        )
+        conn.execute("INSERT INTO files VALUES (?)", (f"{BASE_URL}/ftp/c_70_totalpais.zip",))
+        conn.execute(
+            "INSERT INTO group_files VALUES (1, 0, ?, 'Total del país')", (f"{BASE_URL}/ftp/c_70_totalpais.zip",)
+        )
+        conn.commit()
+        conn.close()
+
+        with CatalogStore(path) as store:
+            assert [c.model_dump() for c in store.catalog()] == [_catalog()[1].model_dump()]
+            store.sync(_catalog())
+            assert [c.model_dump() for c in store.catalog()] == [c.model_dump() for c in _catalog()]
+
+    def test_wal_mode(self, tmp_path):
+        """La base queda en modo WAL para permitir lecturas concurrentes."""
+        with CatalogStore(tmp_path / "catalogo.db") as store:
+            mode = store.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_sync_touches_only_changed_rows(self, tmp_path):
+        """Un re-sync solo modifica las filas cuyo contenido cambió."""
+        catalog = _catalog()
+        with CatalogStore(tmp_path / "catalogo.db") as store:
+            store.sync(catalog)
+            before = store.conn.total_changes
+            store.sync(catalog)
+            assert store.conn.total_changes == before  # Sin cambios no se escribe nada
+
+            rows = "SELECT rowid, nombre_archivo FROM group_files ORDER BY rowid"
+            original = store.conn.execute(rows).fetchall()
+            catalog[1].archivos[0].nombre_archivo = "Total del país (actualizado)"
+            store.sync(catalog)
+            updated = store.conn.execute(rows).fetchall()
+            assert updated[:2] == original[:2]
+            assert updated[2] == (original[2][0], "Total del país (actualizado)")
+
+            store.sync(catalog[:1])
+            assert [c.agrupamiento for c in store.catalog()] == ["Encuesta Permanente de Hogares"]
+            assert store.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 2
+
+    def test_add_page_batches_and_records_page(self, tmp_path):
+        """Los resultados del crawl se escriben por lotes y quedan asociados a su página."""
+        path = tmp_path / "catalogo.db"
+        store = CatalogStore(path, batch_size=2)
+        page_url = f"{BASE_URL}/Nivel4/Tema/4/31/58"
+        store.add_page(page_url, _catalog()[0].model_dump())
+
+        reader = sqlite3.connect(path)
+        assert reader.execute("SELECT COUNT(*) FROM groups").fetchone()[0] == 0  # Lote sin confirmar
+
+        store.add_page(f"{BASE_URL}/Nivel4/Tema/2/41/170", _catalog()[1])
+        assert reader.execute("SELECT COUNT(*) FROM groups").fetchone()[0] == 2
+        assert reader.execute(
+            "SELECT page_url FROM groups WHERE agrupamiento = 'Encuesta Permanente de Hogares'"
+        ).fetchone()[0] == page_url
+        reader.close()
+        store.close()
+
+    def test_fts_search_accent_insensitive(self, tmp_path):
+        """La búsqueda FTS5 ignora acentos y usa prefijos sobre nombre y jerarquía."""
+        with CatalogStore(tmp_path / "catalogo.db") as store:
+            store.sync(_catalog())
+            by_name = store.search("poblacion ocup")
+            by_hierarchy = store.search("censo")
+
+        assert [r["nombre_archivo"] for r in by_name] == ["Población ocupada"]
+        assert [r["nombre_archivo"] for r in by_hierarchy] == ["Total del país"]
+
+
+class TestCanonicalUrl:
+    """Tests para canonical_url."""
+
+    def test_normalizes_host_port_and_fragment(self):
+        """Normaliza host, puerto por defecto, barras duplicadas y fragmento."""
+        assert canonical_url("HTTPS://WWW.INDEC.gob.ar:443/ftp//datos.xls#x") == f"{BASE_URL}/ftp/datos.xls"
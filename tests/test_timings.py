@@ -0,0 +1,95 @@
+"""Tests para el módulo timings."""
+
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+
+from indec_catalog import cli
+from indec_catalog.catalog import agenerate_catalog_with_errors
+from indec_catalog.config import BASE_URL
+from indec_catalog.timings import PageTimings
+
+LINKS = [f"Nivel4/Tema/1/{i}" for i in range(5)]
+URLS = [f"{BASE_URL}/{link}" for link in LINKS]
+
+
+class TestPageTimings:
+    """Tests para PageTimings."""
+
+    def test_smoothed_durations_persist(self, tmp_path):
+        timings = PageTimings(tmp_path / "timings.json", smoothing=0.5)
+        timings.record("a", {"elapsed": 4.0, "bytes": 1000})
+        timings.record("a", {"elapsed": 2.0})
+        timings.record("b", {"outcome": "ok"})  # Sin duración: se ignora
+        timings.save()
+
+        loaded = PageTimings(tmp_path / "timings.json")
+        assert loaded.entries == {"a": {"seconds": 3.0, "bytes": 1000, "runs": 2}}
+
+    def test_unknown_pages_are_estimated_from_nearest_path(self):
+        timings = PageTimings(default=7.0)
+        assert timings.estimate(f"{BASE_URL}/Nivel4/Tema/4/31/58") == 7.0
+
+        timings.record(f"{BASE_URL}/Nivel4/Tema/4/31/58", {"elapsed": 10.0})
+        timings.record(f"{BASE_URL}/Nivel4/Tema/4/31/59", {"elapsed": 6.0})
+        timings.record(f"{BASE_URL}/Nivel4/Tema/3/5/31", {"elapsed": 2.0})
+
+        assert timings.estimate(f"{BASE_URL}/Nivel4/Tema/4/31/60") == 8.0
+        assert timings.estimate(f"{BASE_URL}/Nivel4/Tema/4/40/1") == 8.0
+        assert timings.estimate(f"{BASE_URL}/Nivel4/Tema/3/9/1") == 2.0
+        assert timings.estimate(f"{BASE_URL}/Institucional/X") == 6.0
+
+    def test_longest_first_shortens_makespan(self):
+        timings = PageTimings()
+        for url, seconds in zip(URLS, [1, 1, 1, 1, 4]):
+            timings.record(url, {"elapsed": float(seconds)})
+
+        order = timings.schedule(URLS)
+
+        assert order == [4, 0, 1, 2, 3]
+        assert timings.makespan(URLS, workers=2) == 6.0  # La lenta arranca última
+        assert timings.makespan(URLS, workers=2, order=order) == 4.0
+        assert timings.makespan([], workers=2) == 0.0
+
+    @pytest.mark.parametrize("workers", [0, -1])
+    def test_makespan_requires_a_worker(self, workers):
+        with pytest.raises(ValueError, match="workers"):
+            PageTimings().makespan(URLS, workers=workers)
+
+
+class TestConcurrencyOption:
+    """Tests para la validación de --concurrency."""
+
+    @pytest.mark.parametrize("value", ["0", "-2"])
+    def test_rejects_less_than_one(self, value, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main(["--async", "--concurrency", value])
+        assert exc_info.value.code == 2
+        assert "--concurrency debe ser al menos 1" in capsys.readouterr().err
+
+
+class TestScheduledCrawl:
+    """Tests para el crawl asíncrono ordenado por costo."""
+
+    def test_starts_slow_pages_first_and_keeps_sitemap_order(self):
+        timings = PageTimings()
+        timings.record(URLS[3], {"elapsed": 5.0})
+        timings.record(URLS[0], {"elapsed": 0.1})
+        started = []
+
+        async def fetch(url, client, stats):
+            started.append(url)
+            return {"tema": "Tema", "subtema": "Subtema", "agrupamiento": url[-1], "archivos": []}
+
+        with patch("indec_catalog.catalog.aextract_sitemap_urls", return_value=LINKS), \
+                patch("indec_catalog.catalog.afetch_tema_data", side_effect=fetch):
+            result, errors = asyncio.run(agenerate_catalog_with_errors(
+                show_progress=False, concurrency=1, client=Mock(), timings=timings,
+            ))
+
+        assert started[0] == URLS[3] and started[-1] == URLS[0]
+        assert [r["agrupamiento"] for r in result] == ["0", "1", "2", "3", "4"]
+        assert errors == []
+        assert timings.report["pages"] == 5 and timings.report["workers"] == 1
+        assert timings.report["predicted"] == pytest.approx(timings.report["sitemap_order"])  # Un solo worker
+        assert timings.report["actual"] >= 0
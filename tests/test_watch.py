@@ -0,0 +1,150 @@
+"""Tests para el módulo watch."""
+
+import json
+from unittest.mock import patch
+
+from indec_catalog.watch import CatalogWatcher, PageState, next_interval
+from indec_catalog.config import BASE_URL, SITEMAP_URL
+
+
+class FakeClock:
+    """Reloj controlable: sleep avanza el tiempo sin esperar."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _record(nombre):
+    return {
+        "tema": "Tema",
+        "subtema": "Subtema",
+        "agrupamiento": nombre,
+        "archivos": [{"nombre_archivo": nombre, "url": f"{BASE_URL}/ftp/{nombre}.xls"}],
+    }
+
+
+class TestNextInterval:
+    """Tests para next_interval."""
+
+    def test_shrinks_on_change_and_grows_without(self):
+        """Reduce el intervalo si hubo cambio y lo espacia si no."""
+        page = PageState(url="u", interval=1000)
+        assert next_interval(page, True, 10, 10_000) == 500
+        assert next_interval(page, False, 10, 10_000) == 1500
+
+    def test_bounded_by_change_history(self):
+        """No espera más que la mitad de la mediana entre cambios observados."""
+        page = PageState(url="u", interval=5000, change_times=[0, 400, 800])
+        assert next_interval(page, False, 10, 10_000) == 200
+
+    def test_clamped(self):
+        """Respeta los intervalos mínimo y máximo."""
+        assert next_interval(PageState(url="u", interval=15), True, 10, 100) == 10
+        assert next_interval(PageState(url="u", interval=90), False, 10, 100) == 100
+
+
+class TestCatalogWatcher:
+    """Tests para CatalogWatcher."""
+
+    @patch("indec_catalog.watch.fetch_tema_data")
+    @patch("indec_catalog.watch.extract_sitemap_urls")
+    def test_writes_catalog_after_warm_up_and_on_change(self, mock_extract, mock_fetch, tmp_path):
+        """Escribe el catálogo al completar la primera pasada y cuando una página cambia."""
+        clock = FakeClock()
+        output = tmp_path / "catalogo.json"
+        mock_extract.return_value = ["Nivel4/Tema/1", "Nivel4/Tema/2"]
+        versions = {"Nivel4/Tema/1": "a1", "Nivel4/Tema/2": "b1"}
+        mock_fetch.side_effect = lambda url: _record(versions[url.removeprefix(f"{BASE_URL}/")])
+
+        watcher = CatalogWatcher(
+            output, tmp_path / "state.json", include_bases_datos=False,
+            min_interval=60, max_interval=3600, clock=clock.time, sleep=clock.sleep,
+        )
+        watcher.run(max_checks=2)
+        assert not output.exists()  # Falta chequear una página: no se escribe un catálogo parcial
+
+        watcher.run(max_checks=1)
+        written = json.loads(output.read_text(encoding="utf-8"))
+        assert [c["agrupamiento"] for c in written] == ["a1", "b1"]
+
+        versions["Nivel4/Tema/2"] = "b2"
+        hot_url = f"{BASE_URL}/Nivel4/Tema/2"
+        watcher.run(max_checks=3)  # Segunda pasada: MapaSitio y ambas páginas
+
+        written = json.loads(output.read_text(encoding="utf-8"))
+        assert [c["agrupamiento"] for c in written] == ["a1", "b2"]
+        assert watcher.pages[hot_url].interval < watcher.pages[f"{BASE_URL}/Nivel4/Tema/1"].interval
+
+    @patch("indec_catalog.watch.fetch_tema_data")
+    @patch("indec_catalog.watch.extract_sitemap_urls")
+    def test_state_survives_restart(self, mock_extract, mock_fetch, tmp_path):
+        """El estado persistido permite reanudar sin volver a chequear todo."""
+        clock = FakeClock()
+        mock_extract.return_value = ["Nivel4/Tema/1"]
+        mock_fetch.return_value = _record("a")
+        state_path = tmp_path / "state.json"
+
+        watcher = CatalogWatcher(
+            tmp_path / "out.json", state_path, include_bases_datos=False,
+            clock=clock.time, sleep=clock.sleep,
+        )
+        watcher.run(max_checks=2)
+
+        restarted = CatalogWatcher(
+            tmp_path / "out.json", state_path, include_bases_datos=False,
+            clock=clock.time, sleep=clock.sleep,
+        )
+        assert restarted.warmed_up()
+        assert restarted.pages[SITEMAP_URL].next_check > clock.now
+        assert [c.agrupamiento for c in restarted.catalog()] == ["a"]
+
+    @patch("indec_catalog.watch.scrape_bases_datos", side_effect=OSError("sin red"))
+    @patch("indec_catalog.watch.extract_sitemap_urls", side_effect=OSError("sin red"))
+    def test_startup_outage_keeps_existing_catalog(self, mock_extract, mock_scrape, tmp_path):
+        """Si todo falla al arrancar no se considera completa la pasada ni se pisa el catálogo."""
+        clock = FakeClock()
+        output = tmp_path / "catalogo.json"
+        output.write_text(json.dumps([_record("previo")]), encoding="utf-8")
+        before = output.read_bytes()
+
+        watcher = CatalogWatcher(output, tmp_path / "state.json", clock=clock.time, sleep=clock.sleep)
+        watcher.run(max_checks=2)
+
+        assert not watcher.warmed_up()
+        assert output.read_bytes() == before
+
+    @patch("indec_catalog.watch.fetch_tema_data")
+    @patch("indec_catalog.watch.extract_sitemap_urls")
+    def test_failed_page_delays_warm_up(self, mock_extract, mock_fetch, tmp_path):
+        """Una página Nivel4 fallida no cuenta como chequeada hasta descargarse bien."""
+        clock = FakeClock()
+        output = tmp_path / "catalogo.json"
+        mock_extract.return_value = ["Nivel4/Tema/1"]
+        mock_fetch.side_effect = OSError("timeout")
+
+        watcher = CatalogWatcher(
+            output, tmp_path / "state.json", include_bases_datos=False, clock=clock.time, sleep=clock.sleep,
+        )
+        watcher.run(max_checks=2)
+        assert not watcher.warmed_up() and not output.exists()
+
+        mock_fetch.side_effect = None
+        mock_fetch.return_value = _record("a")
+        watcher.run(max_checks=2)  # El MapaSitio vuelve a tocar antes que el reintento de la página
+        assert [c["agrupamiento"] for c in json.loads(output.read_text(encoding="utf-8"))] == ["a"]
+
+    def test_empty_catalog_does_not_replace_existing(self, tmp_path):
+        output = tmp_path / "catalogo.json"
+        output.write_text("[]", encoding="utf-8")
+        watcher = CatalogWatcher(output, tmp_path / "state.json", include_bases_datos=False)
+        assert watcher.write() is False
+
+        output.unlink()
+        assert watcher.write() is True
+        assert json.loads(output.read_text(encoding="utf-8")) == []